@@ -1,26 +1,40 @@
-import json
+# İlk import: süreç başlangıç zamanını olabildiğince erken yakalar
+from startup import StartupTimer, lazy_import
+
+import multiprocessing
 import os
+import threading
 import time
 import traceback
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from config_service import ConfigService
+from frame_pacer import FramePacer
+from history import HistoryStore
+from io_metrics import IoThroughputSource
+from metric_sources import MetricField, discover_sources
 from metrics import SystemMetricsCollector
+from sampler import SamplingEngine
+from tracing import Tracer
 from ui_overlay import ModernOverlayWindow
 
 try:
-	from fps_presentmon import PresentMonReader
+	from process_metrics import ProcessTracker
 except Exception:
-	PresentMonReader = None  # type: ignore
+	ProcessTracker = None  # type: ignore
 
 try:
-	from tray_manager import TrayManager
+	from fps_presentmon import PresentMonReader
 except Exception:
-	TrayManager = None  # type: ignore
+	PresentMonReader = None  # type: ignore
 
 try:
-	from auto_updater import AutoUpdater
+	from recorder import SessionRecorder, SessionReader, ReplayCollector, ReplayPresentMonReader
 except Exception:
-	AutoUpdater = None  # type: ignore
+	SessionRecorder = None  # type: ignore
+	SessionReader = None  # type: ignore
+	ReplayCollector = None  # type: ignore
+	ReplayPresentMonReader = None  # type: ignore
 
 try:
 	from performance_optimizer import PerformanceOptimizer, SmartMetricsCollector, BackgroundTaskManager
@@ -30,40 +44,66 @@ except Exception:
 	BackgroundTaskManager = None  # type: ignore
 
 
-def load_config() -> dict:
-	config_path = os.path.join(os.path.dirname(__file__), "config.json")
-	default_cfg = {
-		"refreshMs": 500,
-		"presentMon": {
-			"enabled": False,
-			"processName": "",
-		},
-		"update": {
-			"check": True,
-			"url": "",
-		},
-	}
-	if not os.path.exists(config_path):
-		return default_cfg
-	try:
-		with open(config_path, "r", encoding="utf-8") as f:
-			user_cfg = json.load(f)
-		return {**default_cfg, **user_cfg}
-	except Exception:
-		return default_cfg
+DEFAULT_CONFIG: Dict[str, Any] = {
+	"refreshMs": 500,
+	"sampleMs": 500,
+	"selfCpuBudgetPercent": 0.5,
+	"metricsBackend": "auto",
+	"perCoreCpu": True,
+	"presentMon": {
+		"enabled": False,
+		"processName": "",
+		"windowSec": 1.0,
+		# Pencere medyanının bu katından uzun frame takılma sayılır
+		"stutterFactor": 2.0,
+	},
+	"process": {
+		"enabled": True,
+		"topN": 0,
+	},
+	"io": {
+		"enabled": True,
+		"intervalMs": 1000,
+		"disks": [],
+		"nics": [],
+	},
+	"update": {
+		"check": True,
+		"url": "",
+	},
+	"trace": {
+		"enabled": False,
+		"path": "logs/trace.json",
+	},
+	"exporter": {
+		"enabled": False,
+		"host": "127.0.0.1",
+		"port": 9105,
+		"unixSocket": "",
+		"maxConnections": 8,
+	},
+	"sharedMemory": {
+		"enabled": False,
+		"name": "osd_metrics",
+	},
+	"sources": {
+		"entryPoints": True,
+		"plugins": [],
+		"disabled": [],
+	},
+	"theme": {
+		"name": "dark",
+		"colors": {},
+	},
+}
 
 
-def check_update(url: str) -> Optional[str]:
-	if not url:
-		return None
-	try:
-		import requests
-		resp = requests.get(url, timeout=3)
-		if resp.status_code == 200 and "download" in resp.url:
-			return "Guncelleme var"
-	except Exception:
-		return None
-	return None
+def config_path() -> str:
+	return os.path.join(os.path.dirname(__file__), "config.json")
+
+
+def load_config() -> dict:
+	return ConfigService(config_path(), DEFAULT_CONFIG).current
 
 
 def ensure_logs_dir() -> str:
@@ -72,18 +112,77 @@ def ensure_logs_dir() -> str:
 	return os.path.join(logs_dir, "error.log")
 
 
+def startup_log_path() -> str:
+	return os.path.join(os.path.dirname(__file__), "logs", "startup.log")
+
+
+def trace_path(path: str) -> str:
+	if not os.path.isabs(path):
+		path = os.path.join(os.path.dirname(__file__), path)
+	return path
+
+
+def session_path(directory: str) -> str:
+	if not os.path.isabs(directory):
+		directory = os.path.join(os.path.dirname(__file__), directory)
+	os.makedirs(directory, exist_ok=True)
+	return os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.osdrec"))
+
+
+def schedule_update_check(task_manager: Any, updater: Any, update_cfg: Dict[str, Any]) -> None:
+	"""Güncelleme kontrolünü `update.check`'e göre arka plan görevi olarak kaydet veya kaldır.
+
+	İlki hemen, sonra her 10 dakikada bir; UI thread'ine hiç girmez."""
+	if not bool(update_cfg.get("check", True)):
+		if task_manager is not None:
+			task_manager.remove_task("update_check")
+		return
+	if task_manager is None:
+		updater.check_async()
+	elif "update_check" not in task_manager.tasks:
+		task_manager.add_task("update_check", updater.check_and_update, 600.0, timeout=60.0)
+
+
 def main() -> None:
-	config = load_config()
+	# tray_manager (pystray/PIL), auto_updater (requests) ve pynvml ilk kullanımda
+	# yüklenir; overlay önce CPU/RAM ile açılır, GPU/FPS hazır olunca dolar.
+	startup = StartupTimer(startup_log_path(), expected=("first_frame",))
+	# config.json değişiklikleri çalışırken uygulanır (stat kontrolü arka plan zamanlayıcısında)
+	config_service = ConfigService(config_path(), DEFAULT_CONFIG)
+	config = config_service.current
 	refresh_ms: int = int(config.get("refreshMs", 500))
+	sample_ms: int = int(config.get("sampleMs", refresh_ms))
 
 	pm_cfg = config.get("presentMon", {}) or {}
 	pm_enabled: bool = bool(pm_cfg.get("enabled", False))
 	pm_process: str = str(pm_cfg.get("processName", ""))
+	pm_window_s: float = float(pm_cfg.get("windowSec", 1.0))
+	pm_stutter_factor: float = float(pm_cfg.get("stutterFactor", 2.0))
 
 	update_cfg = config.get("update", {}) or {}
 	update_banner: Optional[str] = None
-	if bool(update_cfg.get("check", True)):
-		update_banner = check_update(str(update_cfg.get("url", "")))
+	updates_started = False
+	# Bildirilen ve kurulabilecek sürüm; kurulum başlayınca overlay kapanır
+	pending_update: Optional[Dict[str, Any]] = None
+	update_installing = False
+	update_launched = False
+
+	# Tüm bileşenlerin paylaştığı metrik geçmişi
+	history = HistoryStore()
+
+	# Span ölçümü (kapalıyken maliyeti tek bayrak kontrolü)
+	trace_cfg = config.get("trace", {}) or {}
+	tracer = Tracer(enabled=bool(trace_cfg.get("enabled", False)), history=history)
+	trace_file = trace_path(str(trace_cfg.get("path", "logs/trace.json")))
+
+	def dump_trace(_event: Any = None) -> None:
+		if not tracer.enabled:
+			return
+		try:
+			count = tracer.export_chrome_trace(trace_file)
+			print(f"Trace yazıldı: {trace_file} ({count} olay)")
+		except Exception as e:
+			print(f"Trace yazılamadı: {e}")
 
 	# Performans optimizatörü
 	optimizer = None
@@ -91,75 +190,345 @@ def main() -> None:
 	task_manager = None
 	
 	if PerformanceOptimizer is not None:
-		optimizer = PerformanceOptimizer(target_fps=2)
-		task_manager = BackgroundTaskManager()
+		optimizer = PerformanceOptimizer(
+			target_fps=max(1, round(1000 / max(10, refresh_ms))),
+			history=history,
+			base_refresh_ms=max(10, refresh_ms),
+			cpu_budget_percent=float(config.get("selfCpuBudgetPercent", 0.5)),
+			tracer=tracer,
+		)
+		task_manager = BackgroundTaskManager(tracer=tracer)
 		task_manager.start()
 
-	# Otomatik güncelleme
-	updater = None
-	if AutoUpdater is not None and bool(update_cfg.get("check", True)):
-		updater = AutoUpdater(current_version="2.0.0")
-		# İlk güncelleme kontrolü
+	# Oturum kaydı / oynatma
+	session_cfg = config.get("session", {}) or {}
+	replay_reader = None
+	if session_cfg.get("replay") and SessionReader is not None:
 		try:
-			updater.check_and_update()
-		except Exception:
-			pass
+			replay_reader = SessionReader(str(session_cfg["replay"]))
+		except Exception as e:
+			print(f"Kayıt açılamadı: {e}")
+	replay_speed = float(session_cfg.get("replaySpeed", 1.0))
 
 	present_mon: Optional[PresentMonReader] = None
-	if pm_enabled and PresentMonReader is not None and pm_process:
-		present_mon = PresentMonReader(pm_process)
-		present_mon.start()
+	if replay_reader is not None and replay_reader.frame_count:
+		present_mon = ReplayPresentMonReader(
+			replay_reader, speed=replay_speed, window_s=pm_window_s,
+			history=history, stutter_factor=pm_stutter_factor,
+		)
+	elif PresentMonReader is not None:
+		# Her zaman oluşturulur (alt süreç başlatılmadan); ayar değişince yeniden hedeflenebilir
+		present_mon = PresentMonReader(pm_process, window_s=pm_window_s, history=history, stutter_factor=pm_stutter_factor)
 
 	# Metrik toplayıcı
-	base_collector = SystemMetricsCollector()
+	process_tracker = None
+	if replay_reader is not None:
+		base_collector = ReplayCollector(replay_reader, speed=replay_speed)
+	else:
+		gpu_cfg = config.get("gpu", {}) or {}
+		gpu_intervals = {k: float(v) / 1000.0 for k, v in (gpu_cfg.get("intervalsMs", {}) or {}).items()}
+		# Oyun süreci: presentMon.processName ile aynı isim
+		proc_cfg = config.get("process", {}) or {}
+		if ProcessTracker is not None and bool(proc_cfg.get("enabled", True)):
+			process_tracker = ProcessTracker(pm_process, top_n=int(proc_cfg.get("topN", 0)))
+		# Disk/ağ hızları: boş liste = otomatik cihaz seçimi
+		io_cfg = config.get("io", {}) or {}
+		io_source: Any = False
+		if bool(io_cfg.get("enabled", True)):
+			io_source = IoThroughputSource(
+				interval_s=int(io_cfg.get("intervalMs", 1000)) / 1000.0,
+				disks=list(io_cfg.get("disks", [])),
+				nics=list(io_cfg.get("nics", [])),
+				backend=str(config.get("metricsBackend", "auto")),
+			)
+		base_collector = SystemMetricsCollector(
+			gpu_intervals=gpu_intervals, open_gpu=False, process_tracker=process_tracker,
+			backend=str(config.get("metricsBackend", "auto")),
+			per_core=bool(config.get("perCoreCpu", True)),
+			io=io_source,
+		)
 	if SmartMetricsCollector is not None and optimizer is not None:
 		collector = SmartMetricsCollector(base_collector, optimizer)
 	else:
 		collector = base_collector
 
-	overlay = ModernOverlayWindow(on_close=None)
-	
-	# Tray manager
-	tray_manager = None
-	if TrayManager is not None:
-		try:
-			tray_manager = TrayManager(
-				on_show=lambda: overlay.root.deiconify(),
-				on_hide=lambda: overlay.root.withdraw(),
-				on_quit=lambda: overlay.close()
+	# Örnekleyici: sensör I/O'su UI döngüsünden ayrı thread'de
+	sampler = SamplingEngine(collector, interval_s=sample_ms / 1000.0, tracer=tracer)
+
+	# Kayıt/paylaşımlı bellek şeması bildirilen alanlarla başlar; sonradan gelen anahtarlar eklenir
+	declared_fields: Optional[List[str]] = (
+		base_collector.field_keys() if isinstance(base_collector, SystemMetricsCollector) else None
+	)
+
+	session_recorder = None
+	if bool(session_cfg.get("record", False)) and replay_reader is None and SessionRecorder is not None:
+		session_recorder = SessionRecorder(session_path(str(session_cfg.get("dir", "sessions"))), fields=declared_fields)
+		sampler.subscribe(session_recorder.record_snapshot)
+		if present_mon is not None:
+			present_mon.listeners.append(session_recorder.record_frame)
+
+	# Overlay çizim ve frame pacer istatistikleri: Tk thread'inde raporla güncellenir
+	ui_report: Optional[Dict[str, Dict[str, Any]]] = None
+
+	# Yerel metrik uç noktası (Prometheus / JSON): sadece örnekleyicinin hazırladığı kopyayı sunar
+	exporter_cfg = config.get("exporter", {}) or {}
+	metrics_server = None
+	if bool(exporter_cfg.get("enabled", False)):
+		(MetricsServer,) = lazy_import("metrics_server", "MetricsServer")
+		if MetricsServer is not None:
+			metrics_server = MetricsServer(
+				host=str(exporter_cfg.get("host", "127.0.0.1")),
+				port=int(exporter_cfg.get("port", 9105)),
+				unix_path=str(exporter_cfg.get("unixSocket", "")) or None,
+				max_connections=int(exporter_cfg.get("maxConnections", 8)),
+				fps_stats=present_mon.get_stats if present_mon is not None else None,
+				top_processes=process_tracker.top_processes if process_tracker is not None and process_tracker.top_n else None,
+				ui_stats=lambda: ui_report,
 			)
-			tray_manager.start()
-		except Exception:
-			tray_manager = None
+			sampler.subscribe(metrics_server.publish)
+
+	# Yerel süreçler için paylaşımlı bellek yayını (seqlock'lu sabit yerleşim)
+	shm_cfg = config.get("sharedMemory", {}) or {}
+	shm_publisher = None
+	if bool(shm_cfg.get("enabled", False)):
+		(SnapshotPublisher,) = lazy_import("shm_publisher", "SnapshotPublisher")
+		if SnapshotPublisher is not None:
+			try:
+				shm_publisher = SnapshotPublisher(
+					str(shm_cfg.get("name", "osd_metrics")),
+					fields=declared_fields,
+					fps_source=present_mon.read_fps if present_mon is not None else None,
+				)
+				sampler.subscribe(shm_publisher.publish)
+			except Exception as e:
+				print(f"Paylaşımlı bellek açılamadı: {e}")
+
+	sampler.start()
+	startup.mark("sampler_started")
+
+	overlay = ModernOverlayWindow(on_close=None, history=history)
+	overlay.tracer = tracer
+	if present_mon is not None:
+		present_mon.listeners.append(overlay.add_frame_time)
+	overlay.root.bind("<KeyPress-t>", dump_trace)
+	startup.mark("overlay_created")
+
+	# Bağımsız alt sistemler eşzamanlı başlar
+	subsystems: Dict[str, Any] = {}
+
+	# Eklenti metrik kaynakları: overlay'de genel alanlar olarak gösterilir
+	source_fields: List[MetricField] = []
+
+	if isinstance(base_collector, SystemMetricsCollector):
+		startup.run_async("gpu_ready", base_collector.gpu.open)
+
+		def load_sources() -> None:
+			nonlocal source_fields
+			sources_cfg = config.get("sources", {}) or {}
+			sources = discover_sources(
+				plugins=list(sources_cfg.get("plugins", [])),
+				disabled=list(sources_cfg.get("disabled", [])),
+				entry_points=bool(sources_cfg.get("entryPoints", True)),
+			)
+			base_collector.add_sources(sources)
+			source_fields = base_collector.plugin_fields()
+			for source in sources:
+				print(f"Metrik kaynağı yüklendi: {source.name}{' (ayrı süreç)' if source.isolated else ''}")
+
+		startup.run_async("sources_ready", load_sources)
+
+	if present_mon is not None and (replay_reader is not None or (pm_enabled and pm_process)):
+		startup.run_async("presentmon_started", present_mon.start)
+
+	if metrics_server is not None:
+		startup.run_async("exporter_started", metrics_server.start)
+
+	def start_tray() -> None:
+		(TrayManager,) = lazy_import("tray_manager", "TrayManager")
+		if TrayManager is None:
+			return
+		tray = TrayManager(
+			on_show=lambda: overlay.root.deiconify(),
+			on_hide=lambda: overlay.root.withdraw(),
+			on_quit=lambda: overlay.close(),
+			on_update=install_pending_update,
+		)
+		tray.start()
+		subsystems["tray"] = tray
+		if pending_update is not None:
+			tray.set_update_available(pending_update["version"])
+
+	def install_pending_update(_event: Any = None) -> None:
+		"""Bildirilen sürümü arka planda indir ve kur (tray "Güncelle" veya `U` tuşu)."""
+		nonlocal update_installing
+		updater = subsystems.get("updater")
+		info = pending_update
+		if updater is None or info is None or update_installing:
+			return
+		update_installing = True
+
+		def progress(percent: float) -> None:
+			nonlocal update_banner
+			update_banner = f"⬇ v{info['version']} indiriliyor… {percent:.0f}%"
+
+		def run() -> None:
+			nonlocal update_banner, update_installing, update_launched
+			try:
+				launched = updater.download_and_install(info, progress)
+			except Exception as e:
+				print(f"Güncelleme hatası: {e}")
+				launched = False
+			if launched:
+				# Kurulum dosyaları değiştirebilsin diye overlay bir sonraki frame'de kapanır
+				update_launched = True
+			else:
+				update_banner = f"⚠ v{info['version']} kurulamadı (tekrar denemek için U)"
+				update_installing = False
+
+		if task_manager is not None:
+			task_manager.add_task("update_install", run, once=True)
+		else:
+			threading.Thread(target=run, name="update-install", daemon=True).start()
+
+	overlay.root.bind("<KeyPress-u>", install_pending_update)
+
+	startup.run_async("tray_ready", start_tray)
+
+	def start_updates() -> None:
+		(AutoUpdater,) = lazy_import("auto_updater", "AutoUpdater")
+		if AutoUpdater is None:
+			return
+
+		def notify(info: Dict[str, Any]) -> None:
+			# Bloklamayan bildirim: banner bir sonraki frame'de görünür, kurulum kullanıcı onayıyla
+			nonlocal update_banner, pending_update
+			pending_update = info
+			update_banner = f"⬆ Güncelleme var: v{info['version']} (kurmak için U)"
+			tray = subsystems.get("tray")
+			if tray is not None:
+				tray.set_update_available(info["version"])
+				tray.notify(f"⬆ Güncelleme var: v{info['version']}")
+
+		updater = AutoUpdater(
+			current_version="2.0.0",
+			api_url=update_cfg.get("apiUrl") or None,
+			on_update_available=notify,
+		)
+		subsystems["updater"] = updater
+		schedule_update_check(task_manager, updater, update_cfg)
+
+	if bool(update_cfg.get("check", True)):
+		updates_started = True
+		startup.run_async("update_ready", start_updates)
 
 	# Arka plan görevleri
 	if task_manager is not None:
 		# Performans optimizasyonu
-		task_manager.add_task("optimize", lambda: optimizer.optimize_performance() if optimizer else None, 5.0)
-		# Güncelleme kontrolü (her 10 dakikada bir)
-		if updater is not None:
-			task_manager.add_task("update_check", lambda: updater.check_and_update(), 600.0)
+		task_manager.add_task("optimize", lambda: optimizer.optimize_performance() if optimizer else None, 5.0, timeout=2.0)
+		# Konfigürasyon değişikliği kontrolü (tek stat çağrısı)
+		task_manager.add_task("config_watch", config_service.check, 1.0, timeout=1.0)
 
-	try:
-		frame_count = 0
-		while True:
-			# Frame süresini güncelle
-			if optimizer is not None:
-				optimizer.update_frame_time()
-			
-			# Metrikleri topla
-			m = collector.get_metrics()
-			fps_val: Optional[float] = None
-			if present_mon is not None:
+	# Canlı konfigürasyon değişiklikleri (UI thread'inde, sadece değişen anahtarlar)
+	def apply_refresh(cfg: Dict[str, Any], changes: Dict[str, Any]) -> None:
+		nonlocal refresh_ms, sample_ms
+		refresh_ms = max(10, int(cfg.get("refreshMs", 500)))
+		sample_ms = int(cfg.get("sampleMs", refresh_ms))
+		scale = 1.0
+		if optimizer is not None:
+			optimizer.set_base_refresh(refresh_ms)
+			scale = optimizer.get_rate_scale()
+		pacer.set_interval(refresh_ms * scale)
+		sampler.set_interval(sample_ms / 1000.0 * scale)
+
+	def apply_present_mon(cfg: Dict[str, Any], changes: Dict[str, Any]) -> None:
+		nonlocal pm_process
+		pm = cfg.get("presentMon", {}) or {}
+		pm_process = str(pm.get("processName", ""))
+		if process_tracker is not None and "presentMon.processName" in changes:
+			process_tracker.set_target(pm_process)
+		if present_mon is None or replay_reader is not None:
+			return
+		present_mon.window_s = float(pm.get("windowSec", 1.0))
+		present_mon.pacing.stutter_factor = float(pm.get("stutterFactor", 2.0))
+		if "presentMon.enabled" in changes or "presentMon.processName" in changes:
+			# Alt süreci yeniden başlatmak UI thread'ini bekletmesin
+			if bool(pm.get("enabled", False)) and pm_process:
+				target = lambda: present_mon.retarget(pm_process)
+			else:
+				target = present_mon.stop
+			threading.Thread(target=target, name="presentmon-retarget", daemon=True).start()
+
+	def apply_theme(cfg: Dict[str, Any], changes: Dict[str, Any]) -> None:
+		overlay.set_theme_colors((cfg.get("theme", {}) or {}).get("colors", {}) or {})
+
+	def apply_update(cfg: Dict[str, Any], changes: Dict[str, Any]) -> None:
+		nonlocal update_cfg, updates_started
+		update_cfg = cfg.get("update", {}) or {}
+		updater = subsystems.get("updater")
+		if updater is None:
+			# Başlangıçta kapalıydı ve şimdi açıldı: güncelleyiciyi arka planda kur
+			if not updates_started and bool(update_cfg.get("check", True)):
+				updates_started = True
+				threading.Thread(target=start_updates, name="update-start", daemon=True).start()
+			return  # start_updates henüz bitmedi; güncel update_cfg'yi okuyacak
+		if "update.apiUrl" in changes:
+			updater.set_api_url(update_cfg.get("apiUrl") or None)
+		schedule_update_check(task_manager, updater, update_cfg)
+
+	config_service.on_change("refreshMs", apply_refresh)
+	config_service.on_change("sampleMs", apply_refresh)
+	config_service.on_change("presentMon", apply_present_mon)
+	config_service.on_change("theme", apply_theme)
+	config_service.on_change("update", apply_update)
+	apply_theme(config, {})
+
+	frame_count = 0
+
+	def render_frame() -> None:
+		nonlocal frame_count, ui_report
+		if update_launched:
+			overlay.close()
+			return
+		if task_manager is None:
+			config_service.check()
+		config_service.apply_pending()
+
+		# Frame süresini güncelle
+		if optimizer is not None:
+			optimizer.update_frame_time()
+
+		# En yeni snapshot'ı oku (bloklamaz)
+		snapshot = sampler.latest()
+		m = snapshot.metrics if snapshot is not None else {}
+		fps_val: Optional[float] = None
+		if present_mon is not None:
+			with tracer.span("presentmon_read"):
 				fps_val = present_mon.read_fps()
 
-			# Performans bilgilerini banner'a ekle
-			performance_banner = update_banner
-			if optimizer is not None and frame_count % 30 == 0:  # Her 30 frame'de bir
-				perf_report = optimizer.get_performance_report()
-				if perf_report["optimization_active"]:
-					performance_banner = f"⚡ Optimizasyon aktif | {perf_report['avg_cpu']:.0f}% CPU"
+		# Oyun süreci satırı
+		process_label: Optional[str] = None
+		if m.get("proc_cpu_percent") is not None:
+			process_label = f"{pm_process} {m['proc_cpu_percent']:.0f}% | {m.get('proc_rss_mb', 0.0) / 1024:.1f} GB | {m.get('proc_threads', 0):.0f} thr"
+			if m.get("proc_io_read_mbps") is not None:
+				process_label += f" | I/O {m['proc_io_read_mbps']:.1f}/{m.get('proc_io_write_mbps') or 0.0:.1f} MB/s"
 
+		# Sistem geneli disk/ağ hızları
+		io_label: Optional[str] = None
+		if m.get("disk_read_mbps") is not None:
+			io_label = (
+				f"💽 {m['disk_read_mbps']:.1f}/{m.get('disk_write_mbps') or 0.0:.1f} MB/s"
+				f" | 🌐 ↓{m.get('net_rx_mbps') or 0.0:.2f} ↑{m.get('net_tx_mbps') or 0.0:.2f} MB/s"
+			)
+
+		# Performans bilgilerini banner'a ekle
+		performance_banner = update_banner
+		if optimizer is not None and frame_count % 30 == 0:  # Her 30 frame'de bir
+			perf_report = optimizer.get_performance_report()
+			ui_report = {name: perf_report[name] for name in ("render", "pacer") if name in perf_report}
+			if perf_report["optimization_active"]:
+				performance_banner = f"⚡ Optimizasyon aktif | {perf_report['avg_cpu']:.0f}% CPU"
+
+		with tracer.span("set_metrics"):
 			overlay.set_metrics(
 				cpu=float(m.get("cpu_percent", 0.0)),
 				ram_used=float(m.get("ram_used_gb", 0.0)),
@@ -170,17 +539,46 @@ def main() -> None:
 				gpu_mem_total=(None if m.get("gpu_mem_total_gb") is None else float(m.get("gpu_mem_total_gb"))),
 				fps=fps_val,
 				banner=performance_banner,
+				process=process_label,
+				cores=m.get("cpu_cores"),
+				io=io_label,
+				fields=[field.format(m.get(field.key)) for field in source_fields] if source_fields else None,
 			)
 
-			overlay.loop_once()
-			
-			# Akıllı yenileme hızı
-			if optimizer is not None:
-				refresh_ms = optimizer.get_optimal_refresh_rate()
-			
-			time.sleep(max(0.01, refresh_ms / 1000.0))
-			frame_count += 1
-			
+		# Bekleyen çizimleri şimdi işle (aksi halde aynı iş bir sonraki boşta turunda yapılır)
+		with tracer.span("tk_update"):
+			overlay.root.update_idletasks()
+
+		# Akıllı yenileme hızı: kendi CPU bütçesine göre çizim ve örnekleme birlikte yavaşlar
+		if optimizer is not None:
+			pacer.set_interval(max(10, optimizer.get_optimal_refresh_rate()))
+			sampler.set_interval(sample_ms / 1000.0 * optimizer.get_rate_scale())
+		if frame_count == 0:
+			startup.mark("first_frame")
+		if fps_val is not None:
+			startup.mark("first_fps")
+		if m.get("gpu_util_percent") is not None:
+			startup.mark("first_gpu")
+		frame_count += 1
+
+	def safe_render_frame() -> None:
+		try:
+			render_frame()
+		except Exception:
+			log_path = ensure_logs_dir()
+			with open(log_path, "a", encoding="utf-8") as f:
+				f.write("\n" + traceback.format_exc() + "\n")
+			overlay.close()
+
+	# Tk olay döngüsü: giriş olayları sürekli işlenir, frame'ler after() ile planlanır
+	pacer = FramePacer(overlay.root, safe_render_frame, max(10, refresh_ms), history=history)
+	if optimizer is not None:
+		optimizer.add_report_source("render", overlay.get_render_stats)
+		optimizer.add_report_source("pacer", pacer.get_stats)
+
+	try:
+		pacer.start()
+		overlay.root.mainloop()
 	except KeyboardInterrupt:
 		pass
 	except Exception:
@@ -188,15 +586,27 @@ def main() -> None:
 		with open(log_path, "a", encoding="utf-8") as f:
 			f.write("\n" + traceback.format_exc() + "\n")
 	finally:
+		pacer.stop()
 		if present_mon is not None:
 			present_mon.stop()
-		if tray_manager is not None:
-			tray_manager.stop()
+		if "tray" in subsystems:
+			subsystems["tray"].stop()
 		if task_manager is not None:
 			task_manager.stop()
+		sampler.stop()
+		if metrics_server is not None:
+			metrics_server.stop()
+		if shm_publisher is not None:
+			shm_publisher.close()
+		if session_recorder is not None:
+			session_recorder.close()
 		base_collector.close()
 		overlay.close()
+		dump_trace()
+		startup.flush()
 
 
 if __name__ == "__main__":
+	# Ayrı süreçte çalışan metrik kaynakları için (paketlenmiş exe'de spawn)
+	multiprocessing.freeze_support()
 	main()
@@ -6,43 +6,209 @@ import tempfile
 import shutil
 import requests
 import hashlib
-from typing import Optional, Dict, Any
+import time
+from typing import Callable, Optional, Dict, Any
 import tkinter as tk
 from tkinter import messagebox, ttk
 import threading
 
+class _ThrottledProgress:
+	"""İlerleme geri çağrısını zaman ve yüzde adımına göre seyrekleştirir."""
+
+	def __init__(self, callback: Optional[Callable[[float], None]], min_interval: float = 0.1, min_step: float = 1.0):
+		self.callback = callback
+		self.min_interval = min_interval
+		self.min_step = min_step
+		self._last_time = 0.0
+		self._last_value = -1.0
+
+	def __call__(self, value: float, force: bool = False) -> None:
+		if self.callback is None:
+			return
+		now = time.monotonic()
+		if not force and (now - self._last_time < self.min_interval or abs(value - self._last_value) < self.min_step):
+			return
+		self._last_time = now
+		self._last_value = value
+		self.callback(value)
+
+
+def _adaptive_chunks(response: Any, min_size: int = 64 * 1024, max_size: int = 4 * 1024 * 1024,
+					 target_s: float = 0.1):
+	"""Yanıt gövdesini, her okuma ~target_s sürecek şekilde büyüyen/küçülen parçalarla oku."""
+	size = min_size
+	while True:
+		start = time.monotonic()
+		chunk = response.raw.read(size, decode_content=True)
+		if not chunk:
+			return
+		yield chunk
+		elapsed = time.monotonic() - start
+		if elapsed < target_s / 2 and len(chunk) == size:
+			size = min(max_size, size * 2)
+		elif elapsed > target_s * 2:
+			size = max(min_size, size // 2)
+
+
 class AutoUpdater:
-	"""Otomatik güncelleme sistemi."""
+	"""Otomatik güncelleme sistemi.
 
-	def __init__(self, current_version: str = "2.0.0"):
+	Sürüm kontrolü koşullu istek (`If-None-Match` / `If-Modified-Since`)
+	gönderir ve son sürüm bilgisini ETag ile birlikte diskte önbellekler.
+	Hatalarda üstel geri çekilme uygulanır. Yeni sürüm bulunduğunda
+	`on_update_available` geri çağrısı (bloklamayan bildirim) tetiklenir."""
+
+	def __init__(self, current_version: str = "2.0.0", api_url: Optional[str] = None,
+				 cache_path: Optional[str] = None,
+				 on_update_available: Optional[Callable[[Dict[str, Any]], None]] = None,
+				 timeout: float = 10.0, max_backoff: float = 3600.0):
 		self.current_version = current_version
 		self.repo_owner = "Gear2Head"
 		self.repo_name = "Fps-Display"
-		self.update_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
+		self.update_url = api_url or f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
 		self.download_url = f"https://github.com/{self.repo_owner}/{self.repo_name}/releases/latest/download/OSD-Overlay-Setup.exe"
+		self.cache_path = cache_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "update_meta.json")
+		self.on_update_available = on_update_available
+		self.timeout = timeout
+		self.max_backoff = max_backoff
+
+		# Geri çekilme durumu
+		self.failures = 0
+		self.next_check_at = 0.0
+		self.last_status: Optional[int] = None
+		self._notified_version: Optional[str] = None
+		self._lock = threading.Lock()
+		self._cache: Dict[str, Any] = self._load_cache()
+		# İndirme sırasında doğrulanan dosyalar -> SHA-256
+		self._verified: Dict[str, str] = {}
+
+	def set_api_url(self, api_url: Optional[str]) -> None:
+		"""Sürüm kontrol adresini değiştir (geri çekilme sıfırlanır)."""
+		with self._lock:
+			self.update_url = api_url or f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
+			self.failures = 0
+			self.next_check_at = 0.0
 
-	def check_for_updates(self) -> Optional[Dict[str, Any]]:
-		"""Güncelleme kontrolü yap."""
+	def _load_cache(self) -> Dict[str, Any]:
 		try:
-			response = requests.get(self.update_url, timeout=10)
-			response.raise_for_status()
-			
-			release_data = response.json()
-			latest_version = release_data.get("tag_name", "").lstrip("v")
-			
-			if self._is_newer_version(latest_version, self.current_version):
-				return {
-					"version": latest_version,
-					"tag_name": release_data.get("tag_name"),
-					"body": release_data.get("body", ""),
-					"published_at": release_data.get("published_at"),
-					"download_url": self.download_url
-				}
+			with open(self.cache_path, "r", encoding="utf-8") as f:
+				data = json.load(f)
+			return data if isinstance(data, dict) else {}
+		except Exception:
+			return {}
+
+	def _save_cache(self) -> None:
+		"""Önbelleği atomik olarak yaz (yarım dosya bırakmaz)."""
+		try:
+			os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+			tmp_path = self.cache_path + ".tmp"
+			with open(tmp_path, "w", encoding="utf-8") as f:
+				json.dump(self._cache, f, ensure_ascii=False)
+			os.replace(tmp_path, self.cache_path)
 		except Exception as e:
-			print(f"Güncelleme kontrolü hatası: {e}")
-		
+			print(f"Güncelleme önbelleği yazılamadı: {e}")
+
+	def _backoff(self, retry_after: Optional[float] = None) -> None:
+		self.failures += 1
+		delay = min(self.max_backoff, 30.0 * (2 ** (self.failures - 1)))
+		if retry_after is not None:
+			delay = max(delay, retry_after)
+		self.next_check_at = time.time() + delay
+
+	@staticmethod
+	def _retry_after(response: Any) -> Optional[float]:
+		"""Retry-After veya GitHub rate-limit başlıklarından bekleme süresi."""
+		headers = response.headers
+		try:
+			if headers.get("Retry-After"):
+				return float(headers["Retry-After"])
+			if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+				return max(0.0, float(headers["X-RateLimit-Reset"]) - time.time())
+		except ValueError:
+			pass
 		return None
 
+	def _fetch_release(self) -> Optional[Dict[str, Any]]:
+		"""Son sürüm bilgisini koşullu istekle al; 304'te önbelleği döndür."""
+		headers = {"Accept": "application/vnd.github+json"}
+		if self._cache.get("etag"):
+			headers["If-None-Match"] = self._cache["etag"]
+		if self._cache.get("last_modified"):
+			headers["If-Modified-Since"] = self._cache["last_modified"]
+
+		response = requests.get(self.update_url, headers=headers, timeout=self.timeout)
+		self.last_status = response.status_code
+
+		if response.status_code == 304:
+			self._cache["checked_at"] = time.time()
+			self._save_cache()
+			return self._cache.get("release")
+
+		if response.status_code in (403, 429) or response.status_code >= 500:
+			self._backoff(self._retry_after(response))
+			return self._cache.get("release")
+		response.raise_for_status()
+
+		data = response.json()
+		release = {
+			"tag_name": data.get("tag_name", ""),
+			"body": data.get("body", ""),
+			"published_at": data.get("published_at"),
+			"assets": [
+				{
+					"name": asset.get("name"),
+					"url": asset.get("browser_download_url"),
+					"size": asset.get("size"),
+					"digest": asset.get("digest"),
+				}
+				for asset in data.get("assets", []) or []
+			],
+		}
+		self._cache = {
+			"etag": response.headers.get("ETag"),
+			"last_modified": response.headers.get("Last-Modified"),
+			"checked_at": time.time(),
+			"release": release,
+		}
+		self._save_cache()
+		return release
+
+	def check_for_updates(self, force: bool = False) -> Optional[Dict[str, Any]]:
+		"""Güncelleme kontrolü yap (geri çekilme süresindeyse ağa çıkmaz)."""
+		with self._lock:
+			if not force and time.time() < self.next_check_at:
+				release = self._cache.get("release")
+			else:
+				try:
+					release = self._fetch_release()
+					if self.last_status in (200, 304):
+						self.failures = 0
+						self.next_check_at = 0.0
+				except Exception as e:
+					print(f"Güncelleme kontrolü hatası: {e}")
+					self._backoff()
+					release = self._cache.get("release")
+
+		if not release:
+			return None
+		latest_version = str(release.get("tag_name", "")).lstrip("v")
+		if self._is_newer_version(latest_version, self.current_version):
+			return {
+				"version": latest_version,
+				"tag_name": release.get("tag_name"),
+				"body": release.get("body", ""),
+				"published_at": release.get("published_at"),
+				"assets": release.get("assets", []),
+				"download_url": self.download_url
+			}
+		return None
+
+	def check_async(self) -> threading.Thread:
+		"""Kontrolü arka planda çalıştır; sonuç `on_update_available` ile bildirilir."""
+		thread = threading.Thread(target=self.check_and_update, name="update-check", daemon=True)
+		thread.start()
+		return thread
+
 	def _is_newer_version(self, latest: str, current: str) -> bool:
 		"""Versiyon karşılaştırması."""
 		try:
@@ -58,44 +224,234 @@ class AutoUpdater:
 		except:
 			return False
 
-	def download_update(self, download_url: str, progress_callback=None) -> Optional[str]:
-		"""Güncelleme dosyasını indir."""
+	def expected_sha256(self, update_info: Optional[Dict[str, Any]] = None, download_url: Optional[str] = None) -> Optional[str]:
+		"""Yayınlanan SHA-256: önce release asset `digest`, sonra launcher_config.json."""
+		url = download_url or (update_info or {}).get("download_url") or self.download_url
+		name = os.path.basename(url.split("?", 1)[0])
+		for asset in (update_info or {}).get("assets", []) or []:
+			digest = str(asset.get("digest") or "")
+			if asset.get("name") == name and digest.startswith("sha256:"):
+				return digest.split(":", 1)[1].lower()
+		if name != os.path.basename(self.download_url):
+			return None
 		try:
-			response = requests.get(download_url, stream=True, timeout=30)
-			response.raise_for_status()
-			
-			total_size = int(response.headers.get('content-length', 0))
-			downloaded = 0
-			
-			# Geçici dosya oluştur
-			temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".exe")
-			
-			for chunk in response.iter_content(chunk_size=8192):
-				if chunk:
-					temp_file.write(chunk)
-					downloaded += len(chunk)
-					
-					if progress_callback and total_size > 0:
-						progress = (downloaded / total_size) * 100
-						progress_callback(progress)
-			
-			temp_file.close()
-			return temp_file.name
-			
-		except Exception as e:
-			print(f"İndirme hatası: {e}")
+			config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "launcher_config.json")
+			with open(config_path, "r", encoding="utf-8") as f:
+				digest = str(json.load(f).get("sha256", "")).strip().lower()
+			return digest or None
+		except Exception:
 			return None
 
-	def verify_download(self, file_path: str) -> bool:
-		"""İndirilen dosyayı doğrula."""
+	@staticmethod
+	def _read_part_meta(meta_path: str) -> Dict[str, Any]:
 		try:
-			# Basit dosya boyutu kontrolü
+			with open(meta_path, "r", encoding="utf-8") as f:
+				meta = json.load(f)
+			return meta if isinstance(meta, dict) else {}
+		except Exception:
+			return {}
+
+	@staticmethod
+	def _discard_part(part_path: str, meta_path: str) -> None:
+		for path in (part_path, meta_path):
+			try:
+				os.remove(path)
+			except OSError:
+				pass
+
+	def download_update(self, download_url: str, progress_callback=None, expected_sha256: Optional[str] = None,
+						dest_path: Optional[str] = None, max_retries: int = 5,
+						version: Optional[str] = None) -> Optional[str]:
+		"""Güncelleme dosyasını indir.
+
+		Kesintide HTTP `Range` ile kaldığı yerden devam eder, parça boyutunu
+		bağlantı hızına göre ayarlar ve SHA-256'yı baytlar akarken hesaplar;
+		dosya doğrulama için ikinci kez okunmaz. İlerleme geri çağrısı en fazla
+		~10 Hz'de çağrılır.
+
+		Devam etmek için `.part` dosyasının yanındaki `.part.json`'da aynı URL,
+		aynı sürüm ve bir doğrulayıcı (ETag / Last-Modified) olmalıdır; istek
+		`If-Range` ile gönderilir, sunucudaki dosya değiştiyse baştan
+		indirilir. Doğrulayıcı yoksa asla devam edilmez."""
+		if dest_path is None:
+			download_dir = os.path.join(os.path.dirname(self.cache_path), "downloads")
+			os.makedirs(download_dir, exist_ok=True)
+			dest_path = os.path.join(download_dir, os.path.basename(download_url.split("?", 1)[0]) or "update.exe")
+		part_path = dest_path + ".part"
+		meta_path = part_path + ".json"
+		expected = (expected_sha256 or "").lower() or None
+
+		hasher = hashlib.sha256()
+		downloaded = 0
+		validator: Optional[str] = None
+		if os.path.exists(part_path):
+			meta = self._read_part_meta(meta_path)
+			validator = meta.get("validator") or None
+			if validator and meta.get("url") == download_url and meta.get("version") == version:
+				# Ayni surumun yarim kalan parcasi: onekini bir kez hash'le
+				with open(part_path, "rb") as f:
+					for block in iter(lambda: f.read(1024 * 1024), b""):
+						hasher.update(block)
+						downloaded += len(block)
+			else:
+				# Baska bir surumden / dogrulayicisiz kalan parca: eklenemez
+				validator = None
+				self._discard_part(part_path, meta_path)
+
+		total_size = 0
+		progress = _ThrottledProgress(progress_callback)
+		attempt = 0
+
+		while True:
+			try:
+				if downloaded and not validator:
+					# Dogrulayici olmadan devam edilmez
+					hasher, downloaded = hashlib.sha256(), 0
+				headers = {}
+				if downloaded:
+					headers["Range"] = f"bytes={downloaded}-"
+					headers["If-Range"] = validator
+				response = requests.get(download_url, stream=True, timeout=30, headers=headers)
+				if response.status_code == 416 and downloaded:
+					# Aralik dosyanin sonunda: boyut tutuyorsa parca zaten tamam
+					content_range = response.headers.get("Content-Range", "")
+					response.close()
+					complete = content_range.rpartition("/")[2]
+					if complete.isdigit() and int(complete) == downloaded:
+						total_size = downloaded
+						break
+					hasher, downloaded = hashlib.sha256(), 0
+					continue
+				response.raise_for_status()
+
+				if downloaded and response.status_code != 206:
+					# Sunucu araligi yok saydi veya dosya degisti (If-Range): bastan indir
+					hasher, downloaded = hashlib.sha256(), 0
+				validator = response.headers.get("ETag") or response.headers.get("Last-Modified") or None
+				length = int(response.headers.get("content-length", 0) or 0)
+				total_size = downloaded + length if length else total_size
+
+				with open(meta_path, "w", encoding="utf-8") as f:
+					json.dump({"url": download_url, "version": version, "validator": validator}, f)
+				with open(part_path, "ab" if downloaded else "wb") as out:
+					for chunk in _adaptive_chunks(response):
+						out.write(chunk)
+						hasher.update(chunk)
+						downloaded += len(chunk)
+						if total_size > 0:
+							progress((downloaded / total_size) * 100)
+				response.close()
+
+				if total_size and downloaded < total_size:
+					raise IOError(f"Eksik indirme: {downloaded}/{total_size}")
+				break
+			except Exception as e:
+				attempt += 1
+				print(f"İndirme hatası ({attempt}/{max_retries}): {e}")
+				if attempt >= max_retries:
+					return None
+				time.sleep(min(30.0, 2.0 ** attempt))
+
+		progress(100.0, force=True)
+		digest = hasher.hexdigest()
+		if expected and digest != expected:
+			print(f"SHA-256 uyuşmuyor: {digest} != {expected}")
+			self._discard_part(part_path, meta_path)
+			return None
+
+		os.replace(part_path, dest_path)
+		self._discard_part(part_path, meta_path)
+		self._verified[dest_path] = digest
+		return dest_path
+
+	def verify_download(self, file_path: str, expected_sha256: Optional[str] = None) -> bool:
+		"""İndirilen dosyayı doğrula (indirme sırasında hesaplanan hash ile)."""
+		try:
+			digest = self._verified.get(file_path)
+			if expected_sha256:
+				return digest == expected_sha256.lower()
+			if digest is not None:
+				return True
+			# Hash bilgisi yoksa basit dosya boyutu kontrolü
 			if os.path.getsize(file_path) < 1024 * 1024:  # 1MB'den küçükse şüpheli
 				return False
 			return True
 		except:
 			return False
 
+	def _downloads_dir(self) -> str:
+		path = os.path.join(os.path.dirname(self.cache_path), "downloads")
+		os.makedirs(path, exist_ok=True)
+		return path
+
+	def download_delta_update(self, update_info: Dict[str, Any], progress_callback=None) -> Optional[str]:
+		"""Kurulu sürümden son sürüme delta patch'i indir ve uygula.
+
+		Taban, bir önceki güncellemede indirilen kurulum dosyasıdır. Patch
+		yoksa, taban yoksa veya çıktı doğrulanamazsa None döner."""
+		from delta_patch import PatchError, apply_patch, patch_name
+
+		installer_name = os.path.basename(self.download_url)
+		base_path = os.path.join(self._downloads_dir(), installer_name)
+		if not os.path.exists(base_path):
+			return None
+
+		name = patch_name(os.path.splitext(installer_name)[0], self.current_version, update_info["version"])
+		asset = next((a for a in update_info.get("assets", []) or [] if a.get("name") == name), None)
+		if asset is None or not asset.get("url"):
+			return None
+
+		patch_path = self.download_update(
+			asset["url"], progress_callback,
+			expected_sha256=self.expected_sha256(update_info, asset["url"]),
+			version=update_info.get("version"),
+		)
+		if patch_path is None:
+			return None
+
+		out_path = os.path.join(self._downloads_dir(), f"{installer_name}.new")
+		try:
+			digest = apply_patch(base_path, patch_path, out_path)
+		except (PatchError, OSError) as e:
+			print(f"Delta güncelleme uygulanamadı: {e}")
+			return None
+		finally:
+			try:
+				os.remove(patch_path)
+			except OSError:
+				pass
+
+		expected = self.expected_sha256(update_info)
+		if expected and digest != expected:
+			print("Delta çıktısı yayınlanan SHA-256 ile uyuşmuyor")
+			os.remove(out_path)
+			return None
+		os.replace(out_path, base_path)
+		self._verified[base_path] = digest
+		return base_path
+
+	def fetch_update(self, update_info: Dict[str, Any], progress_callback=None) -> Optional[str]:
+		"""Önce delta patch'i dene, olmazsa tam kurulum dosyasını indir."""
+		try:
+			path = self.download_delta_update(update_info, progress_callback)
+			if path is not None:
+				return path
+		except Exception as e:
+			print(f"Delta güncelleme hatası: {e}")
+		return self.download_update(
+			update_info["download_url"], progress_callback,
+			expected_sha256=self.expected_sha256(update_info),
+			version=update_info.get("version"),
+		)
+
+	def download_and_install(self, update_info: Dict[str, Any], progress_callback=None) -> bool:
+		"""Güncellemeyi indir (önce delta), doğrula ve kurulumu başlat (arka plan thread'inde çağrılır)."""
+		installer_path = self.fetch_update(update_info, progress_callback)
+		if not installer_path or not self.verify_download(installer_path):
+			print("Güncelleme indirilemedi veya doğrulanamadı")
+			return False
+		return self.install_update(installer_path)
+
 	def install_update(self, installer_path: str) -> bool:
 		"""Güncellemeyi kur."""
 		try:
@@ -187,7 +543,7 @@ class AutoUpdater:
 			# Arka planda indirme
 			def download_thread():
 				try:
-					downloaded_file = self.download_update(update_info["download_url"], update_progress)
+					downloaded_file = self.fetch_update(update_info, update_progress)
 					
 					if downloaded_file and self.verify_download(downloaded_file):
 						progress_label.config(text="Kurulum başlatılıyor...")
@@ -246,10 +602,17 @@ class AutoUpdater:
 		return result["update"]
 
 	def check_and_update(self) -> bool:
-		"""Güncelleme kontrolü yap ve gerekirse güncelle."""
+		"""Güncelleme kontrolü yap; yeni sürüm varsa bildir.
+
+		Bildirim geri çağrısı verilmişse UI bloklanmaz (her sürüm bir kez
+		bildirilir); verilmemişse eski davranış olan diyalog gösterilir."""
 		update_info = self.check_for_updates()
-		
-		if update_info:
-			return self.show_update_dialog(update_info)
-		
-		return False
+
+		if not update_info:
+			return False
+		if self.on_update_available is not None:
+			if update_info["version"] != self._notified_version:
+				self._notified_version = update_info["version"]
+				self.on_update_available(update_info)
+			return True
+		return self.show_update_dialog(update_info)
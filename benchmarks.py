@@ -0,0 +1,409 @@
+"""Sicak yollar icin basliksiz (GPU ve ekran gerektirmeyen) benchmark paketi.
+
+Kullanim:
+	python benchmarks.py                       # calistir, bench_baseline.json ile karsilastir
+	python benchmarks.py --save                # sonuclari yeni baseline olarak yaz
+	python benchmarks.py --threshold 30        # %30'dan fazla yavaslama = hata
+	python benchmarks.py --only overlay_draw   # tek bir benchmark
+	python benchmarks.py --verify-backends     # /proc arka ucunu psutil ile karsilastir
+
+Bir yol baseline'a gore esik yuzdesinden fazla yavaslarsa cikis kodu 1 olur."""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# isim -> (kurulum fonksiyonu, aciklama); kurulum olculecek islemi dondurur
+# (platformda desteklenmiyorsa None dondurur ve atlanir)
+BENCHMARKS: Dict[str, Tuple[Callable[[], Callable[[], Any]], str]] = {}
+
+
+def benchmark(name: str, description: str = "") -> Callable:
+	"""Benchmark kaydet. Fonksiyon, bir kez cagrilacak islemi dondurur."""
+	def register(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+		BENCHMARKS[name] = (setup, description)
+		return setup
+	return register
+
+
+class StubCanvas:
+	"""Tk olmadan canvas API'sini taklit eder ve cagrilari sayar."""
+
+	def __init__(self) -> None:
+		self._next_id = 0
+		self.calls = 0
+
+	def _create(self, *args: Any, **kwargs: Any) -> int:
+		self.calls += 1
+		self._next_id += 1
+		return self._next_id
+
+	create_rectangle = create_text = create_line = create_polygon = _create
+
+	def coords(self, *args: Any) -> None:
+		self.calls += 1
+
+	def itemconfigure(self, *args: Any, **kwargs: Any) -> None:
+		self.calls += 1
+
+	def move(self, *args: Any) -> None:
+		self.calls += 1
+
+	def delete(self, *args: Any) -> None:
+		self.calls += 1
+
+
+def make_fake_nvml(device_count: int = 1) -> Any:
+	"""Sabit degerler donduren sahte `pynvml` modulu."""
+	util = types.SimpleNamespace(gpu=55, memory=20)
+	mem = types.SimpleNamespace(used=3 * 1024 ** 3, total=8 * 1024 ** 3, free=5 * 1024 ** 3)
+	return types.SimpleNamespace(
+		NVML_TEMPERATURE_GPU=0,
+		NVML_CLOCK_GRAPHICS=0,
+		nvmlInit=lambda: None,
+		nvmlShutdown=lambda: None,
+		nvmlDeviceGetCount=lambda: device_count,
+		nvmlDeviceGetHandleByIndex=lambda i: i,
+		nvmlDeviceGetTemperature=lambda h, sensor: 65,
+		nvmlDeviceGetUtilizationRates=lambda h: util,
+		nvmlDeviceGetMemoryInfo=lambda h: mem,
+		nvmlDeviceGetFanSpeed=lambda h: 40,
+		nvmlDeviceGetClockInfo=lambda h, clock: 1800,
+	)
+
+
+@benchmark("metrics_get", "SystemMetricsCollector.get_metrics (sahte NVML)")
+def _bench_metrics_get() -> Callable[[], Any]:
+	from metrics import SystemMetricsCollector
+	collector = SystemMetricsCollector(nvml=make_fake_nvml())
+	return collector.get_metrics
+
+
+@benchmark("metrics_get_io", "SystemMetricsCollector.get_metrics, disk/ag hizlari acik (1 sn aralik)")
+def _bench_metrics_get_io() -> Callable[[], Any]:
+	from metrics import SystemMetricsCollector
+	collector = SystemMetricsCollector(nvml=make_fake_nvml(), io=True)
+	return collector.get_metrics
+
+
+@benchmark("io_sample", "IoThroughputSource.sample: tum diskler + tum ag arayuzleri tek okuma")
+def _bench_io_sample() -> Callable[[], Any]:
+	from io_metrics import IoThroughputSource
+	source = IoThroughputSource()
+	source.sample()
+	return source.sample
+
+
+@benchmark("process_sample", "ProcessTracker.sample (kendi sureci, top-N tablosu acik)")
+def _bench_process_sample() -> Callable[[], Any]:
+	import psutil
+	from process_metrics import ProcessTracker
+	tracker = ProcessTracker(psutil.Process().name(), top_n=5)
+	tracker.sample()
+	return tracker.sample
+
+
+@benchmark("trace_span_off", "Kapali Tracer.span giris/cikisi")
+def _bench_trace_span_off() -> Callable[[], Any]:
+	from tracing import Tracer
+	tracer = Tracer(enabled=False)
+
+	def span() -> None:
+		with tracer.span("draw"):
+			pass
+	return span
+
+
+@benchmark("frame_graph", "DecimatedGraph: 100 frame-time ekle + 120 sutunluk zarf noktalari")
+def _bench_frame_graph() -> Callable[[], Any]:
+	from graph import DecimatedGraph
+	state = {"t": 0.0}
+	graph = DecimatedGraph(120, 5.0, clock=lambda: state["t"])
+
+	def step() -> None:
+		# ~1000 fps akisinda bir 100 ms'lik cizim araligi
+		for i in range(100):
+			state["t"] += 0.001
+			graph.add(7.0 + (i % 13))
+		graph.points(0, 0, 120, 16)
+	return step
+
+
+@benchmark("cpu_mem_psutil", "CPU yuzdesi + bellek, psutil arka ucu")
+def _bench_cpu_mem_psutil() -> Callable[[], Any]:
+	from metrics import PsutilCpuMemBackend
+	backend = PsutilCpuMemBackend()
+
+	def sample() -> None:
+		backend.cpu_percent()
+		backend.memory()
+	return sample
+
+
+@benchmark("cpu_mem_proc", "CPU yuzdesi + bellek, /proc pread arka ucu (sadece Linux)")
+def _bench_cpu_mem_proc() -> Optional[Callable[[], Any]]:
+	from metrics import ProcCpuMemBackend
+	try:
+		backend = ProcCpuMemBackend()
+	except OSError:
+		return None
+
+	def sample() -> None:
+		backend.cpu_percent()
+		backend.memory()
+	return sample
+
+
+def _synthetic_proc_stat(cores: int, steps: int = 32) -> List[bytes]:
+	"""Verilen cekirdek sayisi icin ardisik /proc/stat icerikleri (sayaclar her adimda ilerler)."""
+	contents = []
+	for tick in range(steps):
+		lines = [f"cpu  {cores * 1000} 0 {cores * 10} {cores * 5000} 0 0 0 0 0 0"]
+		for core in range(cores):
+			busy = (core * 37) % 100
+			lines.append(f"cpu{core} {123456 + busy * tick} 120 {4567 + tick} {987654 + (100 - busy) * tick} 35 0 12 0 0 0")
+		lines += ["intr 123456 0 0", "ctxt 987654", "btime 1700000000", "processes 4242"]
+		contents.append(("\n".join(lines) + "\n").encode("ascii"))
+	return contents
+
+
+def _register_percore(cores: int) -> None:
+	@benchmark(f"percore_{cores}", f"Cekirdek basina CPU: {cores} cekirdekli /proc/stat ayrisma + vektorel delta")
+	def _bench_percore() -> Callable[[], Any]:
+		from percore import PerCoreCpu, parse_proc_stat
+		contents = _synthetic_proc_stat(cores)
+		state = {"i": 0}
+
+		def source() -> Any:
+			# Icerikler sirayla verilir; basa donus tek bir sifirlama ornegidir
+			state["i"] = (state["i"] + 1) % len(contents)
+			return parse_proc_stat(contents[state["i"]])
+
+		engine = PerCoreCpu(source)
+		engine.sample()
+		return engine.sample
+
+
+for _cores in (4, 16, 64, 128):
+	_register_percore(_cores)
+
+
+def verify_backends(samples: int = 5, interval_s: float = 0.25, cpu_tolerance: float = 1.0,
+					mem_tolerance_pct: float = 1.0) -> List[str]:
+	"""/proc arka ucunun sonuclarini ayni aralikta psutil ile karsilastir; farklari dondur."""
+	from metrics import ProcCpuMemBackend, PsutilCpuMemBackend
+	try:
+		fast = ProcCpuMemBackend()
+	except OSError as e:
+		return [f"/proc arka ucu kullanilamiyor: {e}"]
+	reference = PsutilCpuMemBackend()
+	problems = []
+	for index in range(samples):
+		time.sleep(interval_s)
+		fast_cpu, ref_cpu = fast.cpu_percent(), reference.cpu_percent()
+		fast_mem, ref_mem = fast.memory(), reference.memory()
+		if abs(fast_cpu - ref_cpu) > cpu_tolerance:
+			problems.append(f"#{index} cpu: /proc {fast_cpu} != psutil {ref_cpu}")
+		if fast_mem[1] != ref_mem[1]:
+			problems.append(f"#{index} toplam bellek: /proc {fast_mem[1]} != psutil {ref_mem[1]}")
+		if abs(fast_mem[0] - ref_mem[0]) > ref_mem[1] * mem_tolerance_pct / 100.0:
+			problems.append(f"#{index} kullanilan bellek: /proc {fast_mem[0]} != psutil {ref_mem[0]}")
+		print(f"#{index} cpu {fast_cpu:5.1f} / {ref_cpu:5.1f}  bellek {fast_mem[0]} / {ref_mem[0]}")
+	fast.close()
+	return problems
+
+
+@benchmark("overlay_draw", "ModernOverlayWindow.set_metrics + _draw (stub canvas)")
+def _bench_overlay_draw() -> Callable[[], Any]:
+	from ui_overlay import ModernOverlayWindow
+	overlay = ModernOverlayWindow.headless(StubCanvas())
+	state = {"i": 0}
+
+	def draw() -> None:
+		i = state["i"] = state["i"] + 1
+		overlay.set_metrics(
+			cpu=float(i % 100), ram_used=7.5, ram_total=16.0,
+			gpu_util=float((i * 7) % 100), gpu_temp=65.0, gpu_mem_used=3.0, gpu_mem_total=8.0,
+			fps=60.0 + (i % 5), banner=None,
+		)
+	return draw
+
+
+@benchmark("presentmon_parse", "PresentMonReader.feed_line (CSV satiri)")
+def _bench_presentmon_parse() -> Callable[[], Any]:
+	from fps_presentmon import PresentMonReader
+	reader = PresentMonReader("bench.exe")
+	reader.feed_line("Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,Dropped,TimeInSeconds,MsBetweenPresents")
+	line = "bench.exe,1234,0x0000021,DXGI,0,0,0,12.345678,16.667"
+	return lambda: reader.feed_line(line)
+
+
+@benchmark("frame_pacing_add", "FramePacingAnalyzer.add: pencere + oturum + takilma (frame basina)")
+def _bench_frame_pacing_add() -> Callable[[], Any]:
+	from frame_analysis import FramePacingAnalyzer
+	analyzer = FramePacingAnalyzer(window_s=1.0)
+	frames = [6.9 + (i % 17) * 0.05 + (30.0 if i % 250 == 0 else 0.0) for i in range(1000)]
+	for frame_ms in frames:
+		analyzer.add(frame_ms)
+	index = [0]
+
+	def add() -> None:
+		i = index[0]
+		analyzer.add(frames[i])
+		index[0] = i + 1 if i < 999 else 0
+	return add
+
+
+@benchmark("frame_pacing_stats", "PresentMonReader.get_stats: 1 sn pencere, 144 FPS (histogramdan)")
+def _bench_frame_pacing_stats() -> Callable[[], Any]:
+	from fps_presentmon import PresentMonReader
+	reader = PresentMonReader("bench.exe")
+	for i in range(5000):
+		reader.add_frame(6.9 + (i % 17) * 0.05)
+	return reader.get_stats
+
+
+@benchmark("optimizer_update","PerformanceOptimizer frame/cpu guncellemesi + rapor")
+def _bench_optimizer_update() -> Callable[[], Any]:
+	from performance_optimizer import PerformanceOptimizer
+	optimizer = PerformanceOptimizer()
+
+	def update() -> None:
+		optimizer.update_frame_time()
+		optimizer.update_cpu_usage(42.0)
+		optimizer.get_performance_report()
+	return update
+
+
+@benchmark("smart_cache_hit", "SmartMetricsCollector.get_metrics onbellek isabeti")
+def _bench_smart_cache_hit() -> Callable[[], Any]:
+	from performance_optimizer import PerformanceOptimizer, SmartMetricsCollector
+	base = types.SimpleNamespace(get_metrics=lambda: {"cpu_percent": 10.0})
+	smart = SmartMetricsCollector(base, PerformanceOptimizer())
+	smart.collection_interval = 1e9
+	smart.get_metrics()
+	return smart.get_metrics
+
+
+def measure(op: Callable[[], Any], min_time_s: float = 0.2, repeats: int = 5) -> Dict[str, float]:
+	"""Islemi kalibre edilmis donguler halinde calistir; ns/islem medyanini dondur."""
+	op()  # isinma
+	loops = 1
+	while True:
+		start = time.perf_counter()
+		for _ in range(loops):
+			op()
+		elapsed = time.perf_counter() - start
+		if elapsed >= min_time_s / repeats or loops >= 1 << 24:
+			break
+		loops *= 2
+
+	samples: List[float] = []
+	for _ in range(repeats):
+		start = time.perf_counter()
+		for _ in range(loops):
+			op()
+		samples.append((time.perf_counter() - start) / loops * 1e9)
+	return {
+		"ns_per_op": statistics.median(samples),
+		"min_ns": min(samples),
+		"max_ns": max(samples),
+		"loops": float(loops),
+	}
+
+
+def run(names: Optional[List[str]] = None, min_time_s: float = 0.2) -> Dict[str, Dict[str, float]]:
+	results: Dict[str, Dict[str, float]] = {}
+	for name, (setup, _) in BENCHMARKS.items():
+		if names and name not in names:
+			continue
+		op = setup()
+		if op is None:
+			print(f"{name:24s} bu platformda desteklenmiyor, atlandi")
+			continue
+		results[name] = measure(op, min_time_s=min_time_s)
+	return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold_pct: float) -> List[str]:
+	"""Esigi asan yavaslamalarin aciklamalarini dondur."""
+	regressions = []
+	base_results = baseline.get("benchmarks", {})
+	for name, res in results.items():
+		base = base_results.get(name)
+		if not base or base.get("ns_per_op", 0) <= 0:
+			continue
+		change = (res["ns_per_op"] / base["ns_per_op"] - 1.0) * 100.0
+		if change > threshold_pct:
+			regressions.append(f"{name}: {base['ns_per_op']:.0f} ns -> {res['ns_per_op']:.0f} ns (+{change:.1f}%)")
+	return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="OSD Overlay sicak yol benchmark'lari")
+	parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON dosyasi")
+	parser.add_argument("--save", action="store_true", help="sonuclari baseline olarak kaydet")
+	parser.add_argument("--threshold", type=float, default=25.0, help="izin verilen yavaslama yuzdesi")
+	parser.add_argument("--only", action="append", help="sadece bu benchmark(lar)")
+	parser.add_argument("--min-time", type=float, default=0.2, help="benchmark basina olcum suresi (s)")
+	parser.add_argument("--list", action="store_true", help="benchmark'lari listele")
+	parser.add_argument("--verify-backends", action="store_true", help="/proc arka ucunu psutil ile karsilastir")
+	args = parser.parse_args(argv)
+
+	if args.verify_backends:
+		problems = verify_backends()
+		for problem in problems:
+			print(f"UYUMSUZ: {problem}")
+		return 1 if problems else 0
+
+	if args.list:
+		for name, (_, description) in BENCHMARKS.items():
+			print(f"{name:24s} {description}")
+		return 0
+
+	results = run(args.only, args.min_time)
+	for name, res in results.items():
+		print(f"{name:24s} {res['ns_per_op']:12.0f} ns/op  (min {res['min_ns']:.0f}, max {res['max_ns']:.0f})")
+
+	if args.save:
+		existing: Dict[str, Any] = {}
+		if os.path.exists(args.baseline):
+			with open(args.baseline, "r", encoding="utf-8") as f:
+				existing = json.load(f)
+		merged = {**existing.get("benchmarks", {}), **results}
+		with open(args.baseline, "w", encoding="utf-8") as f:
+			json.dump({
+				"python": platform.python_version(),
+				"platform": platform.platform(),
+				"benchmarks": merged,
+			}, f, indent=2)
+		print(f"Baseline kaydedildi: {args.baseline}")
+		return 0
+
+	if not os.path.exists(args.baseline):
+		print("Baseline yok; olusturmak icin --save kullanin.")
+		return 0
+
+	with open(args.baseline, "r", encoding="utf-8") as f:
+		baseline = json.load(f)
+	regressions = compare(results, baseline, args.threshold)
+	if regressions:
+		print(f"Yavaslama (> %{args.threshold:g}):")
+		for line in regressions:
+			print(f"  {line}")
+		return 1
+	print("Tum benchmark'lar esik icinde.")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+	sys.exit(main())
@@ -0,0 +1,285 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_COLOR_RE = re.compile(r"^#(?:[0-9a-fA-F]{3}){1,2}$")
+
+# Bilinen anahtarlar: tip, (tip, min, max), [eleman tipi] veya iç içe şema. Bilinmeyen anahtarlar serbest.
+CONFIG_SCHEMA: Dict[str, Any] = {
+	"refreshMs": (int, 10, 60000),
+	"sampleMs": (int, 10, 60000),
+	"selfCpuBudgetPercent": (float, 0.01, 100.0),
+	"metricsBackend": str,
+	"perCoreCpu": bool,
+	"presentMon": {
+		"enabled": bool,
+		"processName": str,
+		"windowSec": (float, 0.1, 60.0),
+		"stutterFactor": (float, 1.1, 10.0),
+	},
+	"process": {
+		"enabled": bool,
+		"topN": (int, 0, 100),
+	},
+	"io": {
+		"enabled": bool,
+		"intervalMs": (int, 100, 60000),
+		"disks": [str],
+		"nics": [str],
+	},
+	"update": {
+		"check": bool,
+		"url": str,
+		"apiUrl": str,
+	},
+	"theme": {
+		"name": str,
+		"colors": {key: "color" for key in ("cpu", "gpu", "ram", "fps", "text", "panel", "border")},
+	},
+	"trace": {
+		"enabled": bool,
+		"path": str,
+	},
+	"exporter": {
+		"enabled": bool,
+		"host": str,
+		"port": (int, 0, 65535),
+		"unixSocket": str,
+		"maxConnections": (int, 1, 1024),
+	},
+	"sharedMemory": {
+		"enabled": bool,
+		"name": str,
+	},
+	"sources": {
+		"entryPoints": bool,
+		"plugins": [str],
+		"disabled": [str],
+	},
+	"gpu": {
+		"intervalsMs": {key: (float, 10, 600000) for key in ("utilization", "memory", "clock", "temperature", "fan")},
+	},
+	"session": {
+		"record": bool,
+		"dir": str,
+		"replay": str,
+		"replaySpeed": (float, 0.01, 100.0),
+	},
+}
+
+
+def _leaf_error(rule: Any, value: Any, path: str) -> Optional[str]:
+	if rule == "color":
+		if not isinstance(value, str) or not _COLOR_RE.match(value):
+			return f"{path}: renk (#rrggbb) bekleniyordu"
+	elif isinstance(rule, tuple):
+		kind, low, high = rule
+		# bool, int'in alt sınıfı; sayı yerine kabul edilmez
+		if isinstance(value, bool) or not isinstance(value, (int, float)):
+			return f"{path}: sayı bekleniyordu"
+		if kind is int and float(value) != int(value):
+			return f"{path}: tam sayı bekleniyordu"
+		if not low <= value <= high:
+			return f"{path}: {low}..{high} aralığında olmalı"
+	elif isinstance(rule, list):
+		if not isinstance(value, list) or not all(isinstance(item, rule[0]) for item in value):
+			return f"{path}: liste bekleniyordu"
+	elif rule is str:
+		if not isinstance(value, str):
+			return f"{path}: metin bekleniyordu"
+	elif rule is bool:
+		if not isinstance(value, bool):
+			return f"{path}: true/false bekleniyordu"
+	return None
+
+
+def sanitize_config(config: Any, schema: Dict[str, Any] = CONFIG_SCHEMA, prefix: str = "",
+					dropped: Optional[List[Tuple[str, ...]]] = None) -> Tuple[Dict[str, Any], List[str]]:
+	"""Şemaya uymayan alanları at, geçerli olanları koru.
+
+	(temiz kopya, hata mesajları) döndürür; atılan alanların yolları
+	`dropped` listesine eklenir. Birleştirmede bu alanlar varsayılana döner."""
+	if not isinstance(config, dict):
+		if dropped is not None:
+			dropped.append(tuple(prefix.rstrip(".").split(".")) if prefix else ())
+		return {}, [f"{prefix.rstrip('.') or 'config'}: nesne bekleniyordu"]
+
+	clean: Dict[str, Any] = {}
+	errors: List[str] = []
+	for key, value in config.items():
+		rule = schema.get(key)
+		path = f"{prefix}{key}"
+		if rule is None:
+			clean[key] = value
+		elif isinstance(rule, dict):
+			nested, nested_errors = sanitize_config(value, rule, path + ".", dropped)
+			errors.extend(nested_errors)
+			if isinstance(value, dict):
+				clean[key] = nested
+		else:
+			error = _leaf_error(rule, value, path)
+			if error is None:
+				clean[key] = value
+			else:
+				errors.append(error)
+				if dropped is not None:
+					dropped.append(tuple(path.split(".")))
+	return clean, errors
+
+
+def validate_config(config: Any, schema: Dict[str, Any] = CONFIG_SCHEMA, prefix: str = "") -> List[str]:
+	"""Konfigürasyonu şemaya göre doğrula; hata mesajlarının listesini döndür."""
+	return sanitize_config(config, schema, prefix)[1]
+
+
+def merge_config(defaults: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, Any]:
+	"""İç içe birleştirme: kullanıcı değerleri varsayılanların üzerine yazılır."""
+	merged = dict(defaults)
+	for key, value in user.items():
+		if isinstance(value, dict) and isinstance(merged.get(key), dict):
+			merged[key] = merge_config(merged[key], value)
+		else:
+			merged[key] = value
+	return merged
+
+
+def diff_config(old: Any, new: Any, prefix: str = "") -> Dict[str, Tuple[Any, Any]]:
+	"""Değişen yaprak anahtarlar: {"presentMon.processName": (eski, yeni)}."""
+	if isinstance(old, dict) and isinstance(new, dict):
+		changes: Dict[str, Tuple[Any, Any]] = {}
+		for key in set(old) | set(new):
+			changes.update(diff_config(old.get(key), new.get(key), f"{prefix}{key}."))
+		return changes
+	if old != new:
+		return {prefix.rstrip("."): (old, new)}
+	return {}
+
+
+def _restore(target: Dict[str, Any], source: Dict[str, Any], path: Tuple[str, ...]) -> None:
+	"""`path`teki değeri `source`tan `target`a kopyala (yoksa `target`tan sil)."""
+	if not path:
+		target.clear()
+		target.update(source)
+		return
+	for key in path[:-1]:
+		source = source.get(key) if isinstance(source, dict) else None
+		child = target.get(key)
+		if not isinstance(child, dict):
+			child = target[key] = {}
+		else:
+			child = target[key] = dict(child)
+		target = child
+	if isinstance(source, dict) and path[-1] in source:
+		target[path[-1]] = source[path[-1]]
+	else:
+		target.pop(path[-1], None)
+
+
+class ConfigService:
+	"""config.json'u ucuz bir stat (mtime/boyut) kontrolüyle izler.
+
+	`check()` arka plan zamanlayıcısında çalışır; dosya değiştiyse okur,
+	doğrular ve farkı bekleyen değişikliklere ekler. `apply_pending()` UI
+	thread'inde çağrılır ve sadece değişen anahtarlar için kayıtlı
+	işleyicileri çalıştırır. Yarım yazılmış dosyada mevcut konfigürasyon
+	korunur; şemaya uymayan tek tek alanlar yok sayılır (açılışta
+	varsayılana döner, çalışırken mevcut değerini korur)."""
+
+	def __init__(self, path: str, defaults: Dict[str, Any], schema: Dict[str, Any] = CONFIG_SCHEMA) -> None:
+		self.path = path
+		self.defaults = defaults
+		self.schema = schema
+		self._stat: Optional[Tuple[int, int]] = None
+		self._pending: Dict[str, Tuple[Any, Any]] = {}
+		self._lock = threading.Lock()
+		self._handlers: List[Tuple[str, Callable[[Dict[str, Any], Dict[str, Tuple[Any, Any]]], None]]] = []
+		self.last_error: Optional[str] = None
+		self.reload_count = 0
+		self.current = self.load()
+
+	def _read_stat(self) -> Optional[Tuple[int, int]]:
+		try:
+			st = os.stat(self.path)
+		except OSError:
+			return None
+		return (st.st_mtime_ns, st.st_size)
+
+	def load(self) -> Dict[str, Any]:
+		"""Dosyayı oku; yoksa veya geçersizse varsayılanları döndür."""
+		self._stat = self._read_stat()
+		if self._stat is None:
+			return merge_config(self.defaults, {})
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				user_cfg = json.load(f)
+		except Exception as e:
+			self.last_error = str(e)
+			return merge_config(self.defaults, {})
+		user_cfg, errors = sanitize_config(user_cfg, self.schema)
+		if errors:
+			self.last_error = "; ".join(errors)
+			print(f"Geçersiz alanlar varsayılana döndü: {self.last_error}")
+		return merge_config(self.defaults, user_cfg)
+
+	def on_change(self, prefix: str, handler: Callable[[Dict[str, Any], Dict[str, Tuple[Any, Any]]], None]) -> None:
+		"""`prefix` ile başlayan anahtarlar değişince `handler(config, changes)` çağrılır."""
+		self._handlers.append((prefix, handler))
+
+	def check(self) -> bool:
+		"""Dosya değiştiyse yeniden yükle; geçerli bir değişiklik bulunduysa True."""
+		stat = self._read_stat()
+		if stat is None or stat == self._stat:
+			return False
+
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				user_cfg = json.load(f)
+		except Exception as e:
+			# Yazım sürüyor olabilir: stat kaydedilmez, bir sonraki kontrolde tekrar denenir
+			self.last_error = str(e)
+			return False
+		self._stat = stat
+
+		dropped: List[Tuple[str, ...]] = []
+		user_cfg, errors = sanitize_config(user_cfg, self.schema, dropped=dropped)
+		new_config = merge_config(self.defaults, user_cfg)
+		if errors:
+			# Geçersiz alanlar mevcut değerlerini korur; geçerli değişiklikler yine uygulanır
+			self.last_error = "; ".join(errors)
+			print(f"Geçersiz alanlar yok sayıldı: {self.last_error}")
+			for path in dropped:
+				_restore(new_config, self.current, path)
+		else:
+			self.last_error = None
+		changes = diff_config(self.current, new_config)
+		if not changes:
+			return False
+
+		with self._lock:
+			for key, (old, new) in changes.items():
+				# Uygulanmamış eski değişiklik varsa ilk eski değeri koru
+				previous = self._pending.get(key)
+				self._pending[key] = (previous[0] if previous else old, new)
+			self.current = new_config
+		self.reload_count += 1
+		return True
+
+	def apply_pending(self) -> Dict[str, Tuple[Any, Any]]:
+		"""Bekleyen değişiklikleri ilgili işleyicilere dağıt (UI thread'inden)."""
+		if not self._pending:
+			return {}
+		with self._lock:
+			changes, self._pending = self._pending, {}
+			config = self.current
+
+		for prefix, handler in self._handlers:
+			matched = {key: value for key, value in changes.items() if key == prefix or key.startswith(prefix + ".")}
+			if not matched:
+				continue
+			try:
+				handler(config, matched)
+			except Exception as e:
+				print(f"Konfigürasyon uygulanamadı ({prefix}): {e}")
+		return changes
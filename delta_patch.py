@@ -0,0 +1,370 @@
+"""Surumler arasi ikili fark (delta) paketleri.
+
+bsdiff'e benzer sekilde yeni dosya, eski dosyadan kopyalanan bloklar (COPY),
+eski dosyadaki ayni boyutlu bolgeye gore bayt farklari (ADD) ve tamamen yeni
+baytlar (INSERT) olarak kodlanir. Kontrol ve veri akislari ayri ayri LZMA ile
+sikistirilir; ADD farklari cogunlukla sifir oldugundan cok iyi sikisir.
+
+Kullanim:
+	python delta_patch.py make eski.exe yeni.exe cikti.osdpatch
+	python delta_patch.py apply eski.exe cikti.osdpatch yeni.exe
+	python delta_patch.py info cikti.osdpatch"""
+
+import bisect
+import hashlib
+import lzma
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+try:
+	import numpy as _np
+except Exception:
+	_np = None
+
+MAGIC = b"OSDDLT1\0"
+
+OP_COPY = 0
+OP_ADD = 1
+OP_INSERT = 2
+
+# magic, eski boyut, eski sha256, yeni boyut, yeni sha256, kontrol boyutu, veri boyutu
+_HEADER = struct.Struct("<8sQ32sQ32sQQ")
+# islem, eski dosya offset'i, uzunluk
+_OP = struct.Struct("<BQQ")
+
+DEFAULT_BLOCK = 64
+
+# Polinom blok hash'i (mod 2^64); tek sayi taban
+_HASH_BASE = 0x100000001B3
+_SCAN_CHUNK = 1 << 20
+
+
+class PatchError(Exception):
+	"""Patch uygulanamadi veya dogrulanamadi."""
+
+
+def _sha256_file(path: str) -> bytes:
+	hasher = hashlib.sha256()
+	with open(path, "rb") as f:
+		for block in iter(lambda: f.read(1024 * 1024), b""):
+			hasher.update(block)
+	return hasher.digest()
+
+
+def _byte_diff(new: bytes, old: bytes) -> bytes:
+	"""(new - old) mod 256, bayt bayt."""
+	if _np is not None:
+		return (_np.frombuffer(new, dtype=_np.uint8) - _np.frombuffer(old, dtype=_np.uint8)).tobytes()
+	return bytes((a - b) & 0xFF for a, b in zip(new, old))
+
+
+def _byte_add(old: bytes, diff: bytes) -> bytes:
+	"""(old + diff) mod 256, bayt bayt."""
+	if _np is not None:
+		return (_np.frombuffer(old, dtype=_np.uint8) + _np.frombuffer(diff, dtype=_np.uint8)).tobytes()
+	return bytes((a + b) & 0xFF for a, b in zip(old, diff))
+
+
+def _forward_match(old: memoryview, o: int, new: memoryview, n: int) -> int:
+	"""old[o:] ile new[n:] ortak onek uzunlugu (once buyuk bloklarla)."""
+	length = 0
+	limit = min(len(old) - o, len(new) - n)
+	step = 4096
+	while step >= 1:
+		while length + step <= limit and old[o + length:o + length + step] == new[n + length:n + length + step]:
+			length += step
+		step //= 8
+	return length
+
+
+def _block_candidates(old: bytes, new: bytes, block: int) -> Tuple[Dict[int, int], List[int], List[int]]:
+	"""numpy ile yeni dosyadaki tum konumlarin blok hash'ini vektorel hesapla.
+
+	(hash -> eski offset indeksi, eski bir blokla hash'i eslesen yeni dosya
+	konumlari, o konumlarin hash'leri) dondurur; eslesmeyen baytlar Python
+	dongusune hic girmez. Konum hash'leri onek toplamlarindan O(n) bulunur:
+	h(i) = (S[i+blok] - S[i]) * B^-i, S[j] = sum(b[t] * B^t, t < j) (mod 2^64)."""
+	span = _SCAN_CHUNK + block
+	powers = _np.ones(span, dtype=_np.uint64)
+	powers[1:] = _np.cumprod(_np.full(span - 1, _HASH_BASE, dtype=_np.uint64))
+	inverse = _np.ones(span, dtype=_np.uint64)
+	inverse[1:] = _np.cumprod(_np.full(span - 1, pow(_HASH_BASE, -1, 1 << 64), dtype=_np.uint64))
+
+	count = len(old) // block
+	old_blocks = _np.frombuffer(old, dtype=_np.uint8, count=count * block).reshape(count, block)
+	old_hashes = (old_blocks.astype(_np.uint64) * powers[:block]).sum(axis=1, dtype=_np.uint64)
+	index: Dict[int, int] = {}
+	for i, value in enumerate(old_hashes.tolist()):
+		index.setdefault(value, i * block)
+	keys = _np.unique(old_hashes)
+	# Hizli on eleme: hash'in alt 24 bitine gore bit haritasi
+	mask = _np.uint64((1 << 24) - 1)
+	present = _np.zeros(1 << 24, dtype=_np.bool_)
+	present[keys & mask] = True
+
+	new_bytes = _np.frombuffer(new, dtype=_np.uint8)
+	total = len(new) - block + 1
+	positions: List[int] = []
+	hashes: List[int] = []
+	for start in range(0, total, _SCAN_CHUNK):
+		stop = min(total, start + _SCAN_CHUNK)
+		size = stop - start
+		window = new_bytes[start:stop + block - 1].astype(_np.uint64)
+		prefix = _np.zeros(len(window) + 1, dtype=_np.uint64)
+		_np.cumsum(window * powers[:len(window)], out=prefix[1:])
+		acc = (prefix[block:block + size] - prefix[:size]) * inverse[:size]
+		maybe = _np.nonzero(present[acc & mask])[0]
+		if not len(maybe):
+			continue
+		values = acc[maybe]
+		slot = _np.searchsorted(keys, values)
+		slot[slot == len(keys)] = 0
+		hits = maybe[keys[slot] == values]
+		positions.extend((hits + start).tolist())
+		hashes.extend(acc[hits].tolist())
+	return index, positions, hashes
+
+
+def _diff_ops(old: bytes, new: bytes, block: int) -> Iterator[Tuple[int, int, int, int, int]]:
+	"""(islem, eski offset, uzunluk, yeni baslangic, yeni bitis) uret."""
+	old_mv = memoryview(old)
+	new_mv = memoryview(new)
+
+	positions: Optional[List[int]] = None
+	hashes: List[int] = []
+	if _np is not None and len(old) >= block and len(new) >= block:
+		index, positions, hashes = _block_candidates(old, new, block)
+	else:
+		# numpy yok: her konumda Adler-32 (yavas ama bagimsiz)
+		index = {}
+		for i in range(0, len(old) - block + 1, block):
+			index.setdefault(zlib.adler32(old_mv[i:i + block]), i)
+
+	literal_start = 0
+	last_old_end = 0
+	pos = 0
+	end = len(new) - block
+	k = 0
+	while pos <= end:
+		if positions is not None:
+			# Bir sonraki aday konuma atla
+			k = bisect.bisect_left(positions, pos, k)
+			if k == len(positions):
+				break
+			pos = positions[k]
+			cand = index.get(hashes[k])
+		else:
+			cand = index.get(zlib.adler32(new_mv[pos:pos + block]))
+		if cand is None or old_mv[cand:cand + block] != new_mv[pos:pos + block]:
+			pos += 1
+			continue
+
+		# Eslesmeyi geriye (bekleyen literal icine) ve ileriye uzat
+		back = 0
+		while pos - back > literal_start and cand - back > 0 and new[pos - back - 1] == old[cand - back - 1]:
+			back += 1
+		start_new, start_old = pos - back, cand - back
+		length = back + _forward_match(old_mv, cand, new_mv, pos)
+
+		if start_new > literal_start:
+			gap = start_new - literal_start
+			# Ayni boyutlu degismis bolge: eski dosyaya gore fark (bsdiff tarzi)
+			if start_old - last_old_end == gap and last_old_end + gap <= len(old):
+				yield (OP_ADD, last_old_end, gap, literal_start, start_new)
+			else:
+				yield (OP_INSERT, 0, gap, literal_start, start_new)
+		yield (OP_COPY, start_old, length, start_new, start_new + length)
+
+		pos = start_new + length
+		literal_start = pos
+		last_old_end = start_old + length
+
+	if literal_start < len(new):
+		gap = len(new) - literal_start
+		if last_old_end + gap <= len(old) and gap <= 4 * block:
+			yield (OP_ADD, last_old_end, gap, literal_start, len(new))
+		else:
+			yield (OP_INSERT, 0, gap, literal_start, len(new))
+
+
+def make_patch(old_path: str, new_path: str, patch_path: str, block: int = DEFAULT_BLOCK) -> Dict[str, int]:
+	"""`old_path` -> `new_path` icin patch dosyasi uret."""
+	with open(old_path, "rb") as f:
+		old = f.read()
+	with open(new_path, "rb") as f:
+		new = f.read()
+
+	control = bytearray()
+	data_comp = lzma.LZMACompressor(preset=9)
+	data_parts: List[bytes] = []
+	counts = {OP_COPY: 0, OP_ADD: 0, OP_INSERT: 0}
+	for op, old_off, length, n0, n1 in _diff_ops(old, new, block):
+		control += _OP.pack(op, old_off, length)
+		counts[op] += 1
+		if op == OP_ADD:
+			data_parts.append(data_comp.compress(_byte_diff(new[n0:n1], old[old_off:old_off + length])))
+		elif op == OP_INSERT:
+			data_parts.append(data_comp.compress(new[n0:n1]))
+	data_parts.append(data_comp.flush())
+	data = b"".join(data_parts)
+	control_z = lzma.compress(bytes(control), preset=9)
+
+	header = _HEADER.pack(
+		MAGIC,
+		len(old), hashlib.sha256(old).digest(),
+		len(new), hashlib.sha256(new).digest(),
+		len(control_z), len(data),
+	)
+	tmp_path = patch_path + ".tmp"
+	with open(tmp_path, "wb") as f:
+		f.write(header)
+		f.write(control_z)
+		f.write(data)
+	os.replace(tmp_path, patch_path)
+	return {
+		"old_size": len(old),
+		"new_size": len(new),
+		"patch_size": _HEADER.size + len(control_z) + len(data),
+		"copy_ops": counts[OP_COPY],
+		"add_ops": counts[OP_ADD],
+		"insert_ops": counts[OP_INSERT],
+	}
+
+
+class PatchInfo:
+	def __init__(self, old_size: int, old_sha256: bytes, new_size: int, new_sha256: bytes,
+				 control_size: int, data_size: int) -> None:
+		self.old_size = old_size
+		self.old_sha256 = old_sha256.hex()
+		self.new_size = new_size
+		self.new_sha256 = new_sha256.hex()
+		self.control_size = control_size
+		self.data_size = data_size
+
+
+def read_patch_info(patch: BinaryIO) -> PatchInfo:
+	raw = patch.read(_HEADER.size)
+	if len(raw) != _HEADER.size:
+		raise PatchError("Patch basligi eksik")
+	magic, *fields = _HEADER.unpack(raw)
+	if magic != MAGIC:
+		raise PatchError("Gecersiz patch dosyasi")
+	return PatchInfo(*fields)
+
+
+class _StreamDecompressor:
+	"""LZMA veri akisini dosyadan parca parca acip tam istenen kadar bayt verir."""
+
+	def __init__(self, source: BinaryIO, remaining: int) -> None:
+		self.source = source
+		self.remaining = remaining
+		self.decomp = lzma.LZMADecompressor()
+		self.buffer = b""
+
+	def read(self, size: int) -> bytes:
+		parts = []
+		needed = size
+		while needed:
+			if self.buffer:
+				piece, self.buffer = self.buffer[:needed], self.buffer[needed:]
+				parts.append(piece)
+				needed -= len(piece)
+				continue
+			if self.decomp.needs_input:
+				if self.remaining <= 0:
+					raise PatchError("Patch veri akisi erken bitti")
+				chunk = self.source.read(min(1024 * 1024, self.remaining))
+				self.remaining -= len(chunk)
+			else:
+				chunk = b""
+			self.buffer = self.decomp.decompress(chunk, max_length=max(needed, 1024 * 1024))
+		return b"".join(parts)
+
+
+def apply_patch(old_path: str, patch_path: str, out_path: str, verify_old: bool = True) -> str:
+	"""Patch'i akis halinde uygula; cikti SHA-256'si yazilirken hesaplanir.
+
+	Eski dosyanin veya ciktinin hash'i tutmazsa `PatchError` firlatir ve
+	yarim ciktiyi siler. Dogrulanmis cikti SHA-256'sini (hex) dondurur."""
+	with open(patch_path, "rb") as patch:
+		info = read_patch_info(patch)
+		if os.path.getsize(old_path) != info.old_size:
+			raise PatchError("Eski dosya boyutu patch ile uyusmuyor")
+		if verify_old and _sha256_file(old_path).hex() != info.old_sha256:
+			raise PatchError("Eski dosya hash'i patch ile uyusmuyor")
+
+		control = lzma.decompress(patch.read(info.control_size))
+		data = _StreamDecompressor(patch, info.data_size)
+		hasher = hashlib.sha256()
+		tmp_path = out_path + ".tmp"
+		written = 0
+		try:
+			with open(old_path, "rb") as old_file, open(tmp_path, "wb") as out:
+				old = mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ) if info.old_size else b""
+				try:
+					for offset in range(0, len(control), _OP.size):
+						op, old_off, length = _OP.unpack_from(control, offset)
+						if op == OP_COPY:
+							# Buyuk kopyalari parcalara bol (bellek sabit kalsin)
+							for start in range(old_off, old_off + length, 4 * 1024 * 1024):
+								piece = old[start:min(old_off + length, start + 4 * 1024 * 1024)]
+								out.write(piece)
+								hasher.update(piece)
+						elif op == OP_ADD:
+							piece = _byte_add(old[old_off:old_off + length], data.read(length))
+							out.write(piece)
+							hasher.update(piece)
+						elif op == OP_INSERT:
+							piece = data.read(length)
+							out.write(piece)
+							hasher.update(piece)
+						else:
+							raise PatchError(f"Bilinmeyen patch islemi: {op}")
+						written += length
+				finally:
+					if info.old_size:
+						old.close()
+
+			digest = hasher.hexdigest()
+			if written != info.new_size or digest != info.new_sha256:
+				raise PatchError("Patch ciktisi dogrulanamadi")
+			os.replace(tmp_path, out_path)
+			return digest
+		except Exception:
+			if os.path.exists(tmp_path):
+				os.remove(tmp_path)
+			raise
+
+
+def patch_name(base: str, from_version: str, to_version: str) -> str:
+	"""Release asset adi: OSD-Overlay-2.0.0-to-2.1.0.osdpatch"""
+	return f"{base}-{from_version}-to-{to_version}.osdpatch"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	args = sys.argv[1:] if argv is None else argv
+	if len(args) == 4 and args[0] == "make":
+		stats = make_patch(args[1], args[2], args[3])
+		ratio = stats["patch_size"] / max(1, stats["new_size"]) * 100
+		print(f"Patch: {stats['patch_size']} bayt (yeni dosyanin %{ratio:.1f}'i), "
+			  f"COPY {stats['copy_ops']}, ADD {stats['add_ops']}, INSERT {stats['insert_ops']}")
+		return 0
+	if len(args) == 4 and args[0] == "apply":
+		print(apply_patch(args[1], args[2], args[3]))
+		return 0
+	if len(args) == 2 and args[0] == "info":
+		with open(args[1], "rb") as f:
+			info = read_patch_info(f)
+		print(f"eski: {info.old_size} bayt {info.old_sha256}")
+		print(f"yeni: {info.new_size} bayt {info.new_sha256}")
+		return 0
+	print(__doc__)
+	return 2
+
+
+if __name__ == "__main__":
+	sys.exit(main())
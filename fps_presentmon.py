@@ -1,23 +1,61 @@
 import subprocess
 import sys
 import re
-from typing import Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from frame_analysis import FramePacingAnalyzer
+from history import HistoryStore
+
+_FPS_RE = re.compile(r"fps\s+([0-9]+\.?[0-9]*)", re.IGNORECASE)
+# PresentMon 1.x "MsBetweenPresents", 2.x "msBetweenPresents" / "FrameTime"
+_FRAME_TIME_COLUMNS = ("msbetweenpresents", "frametime")
+
 
 class PresentMonReader:
 	"""PresentMon ile FPS okumasi yapar. PresentMon sistemde olmali.
 
+	Cikti ayri bir thread'de surekli okunur ve her frame-time satiri
+	`pacing` analizorune eklenir (frame'lerin tek kopyasi onun sabit boyutlu
+	penceresindedir); `read_fps` ve `get_stats` asla bloklamaz ve siralama
+	yapmaz. Her okuyucu thread'i baslatildigi nesli tasir; `stop()` nesli
+	artirdiktan sonra eski thread'in satirlari atilir, boylece yeniden
+	hedeflemede eski surecin frame'leri yeni istatistiklere karismaz.
+
 	process_name ornegi: 'witcher3.exe' """
 
-	def __init__(self, process_name: Optional[str] = None) -> None:
+	def __init__(self, process_name: Optional[str] = None, window_s: float = 1.0,
+				 capacity: int = 20000, popen: Optional[Callable[..., Any]] = None,
+				 history: Optional[HistoryStore] = None, stutter_factor: float = 2.0) -> None:
 		self.process_name = process_name
 		self.proc: Optional[subprocess.Popen] = None
+		self.pacing = FramePacingAnalyzer(window_s, capacity=capacity, stutter_factor=stutter_factor, history=history)
+		self._popen = popen or subprocess.Popen
+		self._thread: Optional[threading.Thread] = None
+		# Okuyucu nesli: stop() artirir, eski thread'ler satir eklemeyi birakir
+		self._generation = 0
+		self._feed_lock = threading.Lock()
+		self._frame_time_col: Optional[int] = None
+		self.lines_read = 0
+		# Her frame-time icin cagrilir (ornegin oturum kaydedici)
+		self.listeners: List[Callable[[float], None]] = []
+		self.listener_errors = 0
+		self._failed_listeners: List[Callable[[float], None]] = []
+
+	@property
+	def window_s(self) -> float:
+		return self.pacing.window_s
+
+	@window_s.setter
+	def window_s(self, window_s: float) -> None:
+		self.pacing.set_window(window_s)
 
 	def start(self) -> None:
 		if not self.process_name:
 			return
 		try:
-			# CSV satirlari: MsBetweenPresents ...
-			self.proc = subprocess.Popen(
+			# CSV satirlari: MsBetweenPresents ... (kabuk yok: terminate() PresentMon'un kendisini durdurur)
+			self.proc = self._popen(
 				[
 					"presentmon",
 					"-process_name",
@@ -26,30 +64,127 @@ class PresentMonReader:
 					"-no_csv",
 					"-simple",
 				],
-				shell=True,
 				stdout=subprocess.PIPE,
 				stderr=subprocess.STDOUT,
 				text=True,
 			)
 		except Exception:
 			self.proc = None
+			return
 
-	def read_fps(self) -> Optional[float]:
-		if self.proc is None or self.proc.stdout is None:
-			return None
+		self._thread = threading.Thread(
+			target=self._drain, args=(self.proc, self._generation), name="presentmon-reader", daemon=True
+		)
+		self._thread.start()
+
+	def _drain(self, proc: Any, generation: int) -> None:
+		"""stdout akisini EOF'a veya nesil degisene kadar tuket."""
+		if proc is None or proc.stdout is None:
+			return
 		try:
-			line = self.proc.stdout.readline().strip()
-			# Beklenen ornek: "pid 1234, fps 60.1"
-			match = re.search(r"fps\s+([0-9]+\.?[0-9]*)", line, re.IGNORECASE)
-			if match:
-				return float(match.group(1))
-		except Exception:
+			for line in proc.stdout:
+				with self._feed_lock:
+					if generation != self._generation:
+						return
+					self.feed_line(line)
+		except Exception as e:
+			if generation == self._generation:
+				print(f"PresentMon okuma hatasi: {e}")
+
+	def feed_line(self, line: str) -> Optional[float]:
+		"""Tek bir PresentMon satirini isle; frame-time (ms) bulunursa ekle."""
+		self.lines_read += 1
+		frame_ms = self.parse_line(line)
+		if frame_ms is not None and frame_ms > 0:
+			self.add_frame(frame_ms)
+		return frame_ms
+
+	def add_frame(self, frame_ms: float) -> None:
+		self.pacing.add(frame_ms)
+		for listener in self.listeners:
+			try:
+				listener(frame_ms)
+			except Exception as e:
+				# Okuyucu thread'i durmasin; ayni dinleyicinin hatasi frame basina tekrar yazdirilmaz
+				self.listener_errors += 1
+				if listener not in self._failed_listeners:
+					self._failed_listeners.append(listener)
+					print(f"Frame-time dinleyici hatasi: {e}")
+
+	def parse_line(self, line: str) -> Optional[float]:
+		line = line.strip()
+		if not line:
 			return None
+
+		if "," in line:
+			cols = line.split(",")
+			# CSV basligi: frame-time sutununu bul
+			lowered = [c.strip().lower() for c in cols]
+			for name in _FRAME_TIME_COLUMNS:
+				if name in lowered:
+					self._frame_time_col = lowered.index(name)
+					return None
+			if self._frame_time_col is not None and self._frame_time_col < len(cols):
+				try:
+					return float(cols[self._frame_time_col])
+				except ValueError:
+					return None
+
+		# Beklenen ornek: "pid 1234, fps 60.1"
+		match = _FPS_RE.search(line)
+		if match:
+			fps = float(match.group(1))
+			return 1000.0 / fps if fps > 0 else None
 		return None
 
-	def stop(self) -> None:
-		if self.proc:
+	def read_fps(self) -> Optional[float]:
+		"""Son pencere icin ortalama FPS (bloklamaz, O(1))."""
+		return self.pacing.avg_fps()
+
+	def get_stats(self) -> Dict[str, Any]:
+		"""`window_s` pencere istatistikleri; `session` altinda oturum ozeti, `stutters` takilma sayisi."""
+		return self.pacing.stats()
+
+	def retarget(self, process_name: Optional[str]) -> None:
+		"""Farkli bir surece gec: PresentMon yeniden baslatilir, istatistikler sifirlanir, dinleyiciler korunur."""
+		self.stop()
+		self.process_name = process_name
+		self._frame_time_col = None
+		self.pacing.reset()
+		self.start()
+
+	@staticmethod
+	def _terminate_tree(proc: Any) -> None:
+		"""Sureci ve (varsa) alt sureclerini sonlandir; kapanmazsa oldur."""
+		children: List[Any] = []
+		try:
+			import psutil
+			children = psutil.Process(proc.pid).children(recursive=True)
+		except Exception:
+			pass
+		for child in children:
 			try:
-				self.proc.terminate()
+				child.terminate()
 			except Exception:
-				pass
\ No newline at end of file
+				pass
+		try:
+			proc.terminate()
+			proc.wait(timeout=1)
+		except subprocess.TimeoutExpired:
+			try:
+				proc.kill()
+			except Exception:
+				pass
+		except Exception:
+			pass
+
+	def stop(self) -> None:
+		# Once nesli degistir: eski thread bundan sonra okudugu satirlari atar
+		with self._feed_lock:
+			self._generation += 1
+		if self.proc:
+			self._terminate_tree(self.proc)
+			self.proc = None
+		if self._thread is not None:
+			self._thread.join(timeout=1)
+			self._thread = None
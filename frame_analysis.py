@@ -0,0 +1,385 @@
+import math
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from history import HistoryStore, MetricHistory, percentile_sorted
+
+
+class P2Quantile:
+	"""Tek bir yuzdelik icin P-kare tahmincisi (Jain & Chlamtac, 1985).
+
+	Bes isaretcinin yuksekligi ve konumu tutulur; her deger O(1) zamanda ve
+	sabit bellekle islenir, dagilimin kendisi saklanmaz. Bes degerden az
+	veri varsa tam sonuc dondurulur."""
+
+	__slots__ = ("p", "count", "_q", "_n", "_want", "_step")
+
+	def __init__(self, p: float) -> None:
+		if not 0.0 < p < 1.0:
+			raise ValueError(f"yuzdelik 0-1 araliginda olmali: {p}")
+		self.p = p
+		self._q = [0.0] * 5
+		self._n = [0] * 5
+		self._want = [0.0] * 5
+		self._step = [0.0, p / 2.0, p, (1.0 + p) / 2.0, 1.0]
+		self.reset()
+
+	def reset(self) -> None:
+		p = self.p
+		self.count = 0
+		self._n[:] = (0, 1, 2, 3, 4)
+		self._want[:] = (0.0, 2.0 * p, 4.0 * p, 2.0 + 2.0 * p, 4.0)
+
+	def add(self, x: float) -> None:
+		q = self._q
+		count = self.count
+		self.count = count + 1
+		if count < 5:
+			q[count] = x
+			if count == 4:
+				q.sort()
+			return
+
+		# x'in dustugu hucre; uc isaretciler min/max'i izler
+		if x < q[0]:
+			q[0] = x
+			k = 0
+		elif x >= q[4]:
+			q[4] = x
+			k = 3
+		elif x < q[2]:
+			k = 0 if x < q[1] else 1
+		else:
+			k = 2 if x < q[3] else 3
+
+		n = self._n
+		i = k + 1
+		while i < 5:
+			n[i] += 1
+			i += 1
+		want = self._want
+		step = self._step
+		want[1] += step[1]
+		want[2] += step[2]
+		want[3] += step[3]
+		want[4] += 1.0
+
+		# Ara isaretcileri istenen konuma bir adim yaklastir (parabolik, olmazsa dogrusal)
+		for i in (1, 2, 3):
+			ni = n[i]
+			d = want[i] - ni
+			if d >= 1.0:
+				right = n[i + 1] - ni
+				if right <= 1:
+					continue
+				s = 1
+			elif d <= -1.0:
+				left = ni - n[i - 1]
+				if left <= 1:
+					continue
+				s = -1
+			else:
+				continue
+			left = ni - n[i - 1]
+			right = n[i + 1] - ni
+			qi = q[i]
+			q_left = q[i - 1]
+			q_right = q[i + 1]
+			qp = qi + s / (left + right) * ((left + s) * (q_right - qi) / right + (right - s) * (qi - q_left) / left)
+			if not q_left < qp < q_right:
+				qp = qi + (q_right - qi) / right if s > 0 else qi + (q_left - qi) / left
+			q[i] = qp
+			n[i] = ni + s
+
+	def value(self) -> Optional[float]:
+		count = self.count
+		if count >= 5:
+			return self._q[2]
+		if not count:
+			return None
+		return percentile_sorted(sorted(self._q[:count]), self.p * 100.0)
+
+
+class FramePacingAnalyzer:
+	"""Frame-time akisindan kayan pencere ve oturum istatistikleri.
+
+	Pencere (`window_s`, frame-time toplamiyla olculur) sabit boyutlu halka
+	diziler ve logaritmik bir histogramla tutulur: frame eklenirken ve
+	pencereden cikarken sadece sayaclar degisir, yuzdelikler histogramdan
+	(~%2 cozunurluk, kutu icinde interpolasyon) okunur. Oturum boyunca
+	ortalama/varyans Welford ile, p50/p99/p99.9 P-kare ile sabit bellekte
+	tahmin edilir.
+
+	Takilma (stutter): pencere medyaninin `stutter_factor` katindan uzun
+	frame; medyan `median_every` frame'de bir histogramdan yenilenir. Her
+	`series_interval_s` saniyelik frame-time'da o araligin varyansi (ms^2)
+	`history` deposundaki seriye eklenir.
+
+	`add` frame basina liste/nesne olusturmaz; okuma tarafi ayri thread'den
+	cagrilabilir."""
+
+	min_ms = 0.05
+	max_ms = 5000.0
+	bin_ratio = 1.02
+	median_every = 32
+	min_stutter_frames = 8
+
+	def __init__(self, window_s: float = 1.0, capacity: int = 20000, stutter_factor: float = 2.0,
+				 history: Optional[HistoryStore] = None, series_interval_s: float = 1.0,
+				 series_capacity: int = 600, name: str = "presentmon.frame_var") -> None:
+		self.capacity = max(2, int(capacity))
+		self.stutter_factor = float(stutter_factor)
+		self.series_interval_ms = max(1.0, float(series_interval_s) * 1000.0)
+		store = history if history is not None else HistoryStore()
+		self.variance: MetricHistory = store.series(name, max(1, int(series_capacity)))
+
+		bins = int(math.ceil(math.log(self.max_ms / self.min_ms) / math.log(self.bin_ratio))) + 1
+		self._bins = bins
+		self._scale = 1.0 / math.log(self.bin_ratio)
+		self._edges = array("d", (self.min_ms * self.bin_ratio ** b for b in range(bins + 1)))
+		self._counts = array("l", bytes(array("l").itemsize * bins))
+		self._bin_sums = array("d", bytes(8 * bins))
+
+		self._ring_ms = array("d", bytes(8 * self.capacity))
+		self._ring_bin = array("H", bytes(2 * self.capacity))
+		self._ring_stutter = array("b", bytes(self.capacity))
+		self._session = (P2Quantile(0.5), P2Quantile(0.99), P2Quantile(0.999))
+		self._lock = threading.Lock()
+		self.window_ms = max(1.0, float(window_s) * 1000.0)
+		self.reset()
+
+	@property
+	def window_s(self) -> float:
+		return self.window_ms / 1000.0
+
+	def reset(self) -> None:
+		"""Pencereyi ve oturumu sifirla (hedef surec degisti)."""
+		with self._lock:
+			counts = self._counts
+			sums = self._bin_sums
+			for b in range(self._bins):
+				counts[b] = 0
+				sums[b] = 0.0
+			self._head = 0
+			self._count = 0
+			self._sum = 0.0
+			self._sumsq = 0.0
+			self._stutters = 0
+			self._median = 0.0
+			self._since_median = 0
+			self._since_resum = 0
+
+			for estimator in self._session:
+				estimator.reset()
+			self.session_frames = 0
+			self.session_ms = 0.0
+			self._mean = 0.0
+			self._m2 = 0.0
+			self.session_max_ms = 0.0
+			self.session_stutters = 0
+
+			self._chunk_n = 0
+			self._chunk_sum = 0.0
+			self._chunk_sumsq = 0.0
+		self.variance.clear()
+
+	def set_window(self, window_s: float) -> None:
+		"""Pencere suresini degistir; kisaliyorsa eski frame'ler hemen cikar."""
+		with self._lock:
+			self.window_ms = max(1.0, float(window_s) * 1000.0)
+			self._evict()
+
+	def add(self, frame_ms: float) -> None:
+		if frame_ms <= 0.0:
+			return
+		with self._lock:
+			# Takilma: guncel pencere medyanina gore
+			count = self._count
+			self._since_median += 1
+			if self._since_median >= self.median_every or (self._median == 0.0 and count >= self.min_stutter_frames):
+				self._median = self._quantile(0.5) if count >= self.min_stutter_frames else 0.0
+				self._since_median = 0
+			stutter = 1 if self._median > 0.0 and frame_ms > self.stutter_factor * self._median else 0
+
+			# Pencere: halka dolu ise en eskiyi cikar, sonra ekle
+			if count == self.capacity:
+				self._drop_oldest()
+				count -= 1
+			b = int(math.log(frame_ms / self.min_ms) * self._scale) if frame_ms > self.min_ms else 0
+			if b >= self._bins:
+				b = self._bins - 1
+			head = self._head
+			self._ring_ms[head] = frame_ms
+			self._ring_bin[head] = b
+			self._ring_stutter[head] = stutter
+			self._head = head + 1 if head + 1 < self.capacity else 0
+			self._count = count + 1
+			self._counts[b] += 1
+			self._bin_sums[b] += frame_ms
+			self._sum += frame_ms
+			self._sumsq += frame_ms * frame_ms
+			self._stutters += stutter
+			self._evict()
+
+			# Kayan nokta sapmasi: her tam turda toplamlari halkadan yeniden hesapla
+			self._since_resum += 1
+			if self._since_resum >= self.capacity:
+				self._resum()
+
+			# Oturum
+			n = self.session_frames + 1
+			self.session_frames = n
+			self.session_ms += frame_ms
+			delta = frame_ms - self._mean
+			self._mean += delta / n
+			self._m2 += delta * (frame_ms - self._mean)
+			if frame_ms > self.session_max_ms:
+				self.session_max_ms = frame_ms
+			self.session_stutters += stutter
+			for estimator in self._session:
+				estimator.add(frame_ms)
+
+			# Varyans serisi: araliktaki frame'lerin varyansi
+			self._chunk_n += 1
+			self._chunk_sum += frame_ms
+			self._chunk_sumsq += frame_ms * frame_ms
+			if self._chunk_sum >= self.series_interval_ms:
+				mean = self._chunk_sum / self._chunk_n
+				self.variance.append(max(0.0, self._chunk_sumsq / self._chunk_n - mean * mean))
+				self._chunk_n = 0
+				self._chunk_sum = 0.0
+				self._chunk_sumsq = 0.0
+
+	def _tail(self) -> int:
+		tail = self._head - self._count
+		return tail + self.capacity if tail < 0 else tail
+
+	def _drop_oldest(self) -> None:
+		tail = self._tail()
+		frame_ms = self._ring_ms[tail]
+		b = self._ring_bin[tail]
+		self._counts[b] -= 1
+		self._bin_sums[b] -= frame_ms
+		self._sum -= frame_ms
+		self._sumsq -= frame_ms * frame_ms
+		self._stutters -= self._ring_stutter[tail]
+		self._count -= 1
+
+	def _evict(self) -> None:
+		# En eski frame haric toplam pencereyi dolduruyorsa cikar (yeni frame her zaman pencerede)
+		while self._count > 1 and self._sum - self._ring_ms[self._tail()] >= self.window_ms:
+			self._drop_oldest()
+
+	def _resum(self) -> None:
+		sums = self._bin_sums
+		for b in range(self._bins):
+			sums[b] = 0.0
+		total = 0.0
+		total_sq = 0.0
+		index = self._tail()
+		for _ in range(self._count):
+			frame_ms = self._ring_ms[index]
+			sums[self._ring_bin[index]] += frame_ms
+			total += frame_ms
+			total_sq += frame_ms * frame_ms
+			index = index + 1 if index + 1 < self.capacity else 0
+		self._sum = total
+		self._sumsq = total_sq
+		self._since_resum = 0
+
+	def _quantiles(self, fractions: Sequence[float]) -> List[float]:
+		"""Artan sirali kesirler icin histogramdan yuzdelikler (tek gecis).
+
+		`percentile_sorted` ile ayni tanim: (n-1)*p sirasindaki iki deger
+		arasinda interpolasyon. Kutudaki degerler, kutu ortalamasi etrafinda
+		kutuya sigan en genis aralikta esit dagilmis kabul edilir (tek
+		degerli kutu tam sonuc verir)."""
+		count = self._count
+		result = [0.0] * len(fractions)
+		if not count:
+			return result
+		counts = self._counts
+		sums = self._bin_sums
+		edges = self._edges
+		last = self._bins - 1
+		cumulative = 0
+		b = 0
+
+		def rank_value(rank: int) -> float:
+			nonlocal cumulative, b
+			while b < last and cumulative + counts[b] <= rank:
+				cumulative += counts[b]
+				b += 1
+			in_bin = counts[b] or 1
+			mean = sums[b] / in_bin
+			spread = 2.0 * min(mean - edges[b], edges[b + 1] - mean)
+			if spread < 0.0:
+				spread = 0.0
+			return mean + spread * (min(1.0, (rank - cumulative + 0.5) / in_bin) - 0.5)
+
+		for i, fraction in enumerate(fractions):
+			pos = (count - 1) * fraction
+			lo = int(pos)
+			low = rank_value(lo)
+			result[i] = low + (rank_value(lo + 1) - low) * (pos - lo) if lo + 1 < count else low
+		return result
+
+	def _quantile(self, fraction: float) -> float:
+		return self._quantiles((fraction,))[0]
+
+	def avg_fps(self) -> Optional[float]:
+		"""Pencere ortalama FPS'i (O(1))."""
+		total = self._sum
+		count = self._count
+		return 1000.0 * count / total if count and total > 0 else None
+
+	def stats(self, percentiles: Iterable[float] = (50.0, 90.0, 99.0)) -> Dict[str, Any]:
+		"""Pencere istatistikleri; `session` altinda oturum ozeti.
+
+		%1 low = 1000 / p99 frame-time, %0.1 low = 1000 / p99.9 frame-time."""
+		pcts = list(percentiles)
+		with self._lock:
+			count = self._count
+			if not count:
+				result: Dict[str, Any] = {"frames": 0, "avg_fps": None, "low_1_fps": None, "low_01_fps": None,
+										  "frame_time_ms": {}, "frame_time_std_ms": None, "stutters": 0}
+			else:
+				fractions = sorted(set([pct / 100.0 for pct in pcts] + [0.99, 0.999]))
+				values = dict(zip(fractions, self._quantiles(fractions)))
+				mean = self._sum / count
+				p99 = values[0.99]
+				p999 = values[0.999]
+				result = {
+					"frames": count,
+					"avg_fps": 1000.0 / mean if mean > 0 else None,
+					"low_1_fps": (1000.0 / p99) if p99 > 0 else None,
+					"low_01_fps": (1000.0 / p999) if p999 > 0 else None,
+					"frame_time_ms": {f"p{pct:g}": values[pct / 100.0] for pct in pcts},
+					"frame_time_std_ms": math.sqrt(max(0.0, self._sumsq / count - mean * mean)),
+					"stutters": self._stutters,
+				}
+			result["session"] = self._session_stats()
+		return result
+
+	def session_stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return self._session_stats()
+
+	def _session_stats(self) -> Dict[str, Any]:
+		n = self.session_frames
+		if not n:
+			return {"frames": 0, "duration_s": 0.0, "avg_fps": None, "low_1_fps": None, "low_01_fps": None,
+					"frame_time_ms": {}, "frame_time_std_ms": None, "max_frame_ms": None, "stutters": 0}
+		p50, p99, p999 = (estimator.value() for estimator in self._session)
+		return {
+			"frames": n,
+			"duration_s": self.session_ms / 1000.0,
+			"avg_fps": 1000.0 * n / self.session_ms if self.session_ms > 0 else None,
+			"low_1_fps": (1000.0 / p99) if p99 else None,
+			"low_01_fps": (1000.0 / p999) if p999 else None,
+			"frame_time_ms": {"p50": p50, "p99": p99, "p99.9": p999},
+			"frame_time_std_ms": math.sqrt(self._m2 / n),
+			"max_frame_ms": self.session_max_ms,
+			"stutters": self.session_stutters,
+		}
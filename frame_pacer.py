@@ -0,0 +1,95 @@
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+from history import HistoryStore
+
+
+class FramePacer:
+	"""Tk `after()` tabanlı frame zamanlayıcı.
+
+	Frame'ler `time.perf_counter` üzerinde mutlak son tarihlere göre planlanır,
+	bu yüzden sleep kayması birikmez. Geç kalınan frame'ler kuyruğa alınmaz,
+	atlanır. Gecikme ve frame aralığı paylaşılan geçmiş deposuna yazılır."""
+
+	def __init__(self, root: Any, frame_fn: Callable[[], None], interval_ms: float,
+				 history: Optional[HistoryStore] = None, clock: Callable[[], float] = time.perf_counter) -> None:
+		self.root = root
+		self.frame_fn = frame_fn
+		self.interval_s = max(0.001, float(interval_ms) / 1000.0)
+		self.clock = clock
+		store = history if history is not None else HistoryStore()
+		self.lateness_ms = store.series("pacer.lateness_ms", 240)
+		self.interval_ms = store.series("pacer.interval_ms", 240)
+		self.frames = 0
+		self.skipped_frames = 0
+		self._deadline = 0.0
+		self._last_frame_at: Optional[float] = None
+		self._after_id: Optional[str] = None
+		self.running = False
+
+	def start(self) -> None:
+		"""İlk frame'i hemen planla."""
+		if self.running:
+			return
+		self.running = True
+		self._deadline = self.clock()
+		self._after_id = self.root.after(0, self._tick)
+
+	def stop(self) -> None:
+		self.running = False
+		if self._after_id is not None:
+			try:
+				self.root.after_cancel(self._after_id)
+			except Exception:
+				pass
+			self._after_id = None
+
+	def set_interval(self, interval_ms: float) -> None:
+		"""Frame aralığını değiştir (bir sonraki son tarihten itibaren geçerli)."""
+		self.interval_s = max(0.001, float(interval_ms) / 1000.0)
+
+	def _tick(self) -> None:
+		self._after_id = None
+		if not self.running:
+			return
+
+		now = self.clock()
+		late = now - self._deadline
+		# Bir veya daha fazla frame kaçırıldıysa onları atla, kuyruğa alma
+		if late >= self.interval_s:
+			missed = int(late // self.interval_s)
+			self.skipped_frames += missed
+			self._deadline += missed * self.interval_s
+			late = now - self._deadline
+		self.lateness_ms.append(max(0.0, late) * 1000.0)
+		if self._last_frame_at is not None:
+			self.interval_ms.append((now - self._last_frame_at) * 1000.0)
+		self._last_frame_at = now
+		self.frames += 1
+
+		try:
+			self.frame_fn()
+		finally:
+			if self.running:
+				self._deadline += self.interval_s
+				delay_ms = max(0, int(round((self._deadline - self.clock()) * 1000.0)))
+				self._after_id = self.root.after(delay_ms, self._tick)
+
+	def get_stats(self) -> Dict[str, float]:
+		"""Frame jitter'ı (aralık standart sapması) ve gecikme istatistikleri."""
+		intervals = self.interval_ms.values()
+		jitter = 0.0
+		if len(intervals) > 1:
+			mean = sum(intervals) / len(intervals)
+			jitter = math.sqrt(sum((v - mean) ** 2 for v in intervals) / (len(intervals) - 1))
+		return {
+			"frames": self.frames,
+			"skipped_frames": self.skipped_frames,
+			"target_interval_ms": self.interval_s * 1000.0,
+			"avg_interval_ms": self.interval_ms.mean(),
+			"jitter_ms": jitter,
+			"lateness_avg_ms": self.lateness_ms.mean(),
+			"lateness_p99_ms": self.lateness_ms.percentile(99.0),
+			"lateness_max_ms": self.lateness_ms.max(),
+		}
@@ -0,0 +1,154 @@
+import math
+import threading
+import time
+from array import array
+from typing import Callable, List, Optional, Tuple
+
+
+def nice_ceil(value: float) -> float:
+	"""Değeri 1-2-5 dizisinde bir üst yuvarlak sayıya çıkar (ölçek nadiren değişir)."""
+	if value <= 0:
+		return 1.0
+	exponent = math.floor(math.log10(value))
+	base = 10.0 ** exponent
+	for step in (1.0, 2.0, 5.0, 10.0):
+		if value <= step * base:
+			return step * base
+	return 10.0 * base
+
+
+class DecimatedGraph:
+	"""Yüksek hızlı veri için piksel sütunu başına min/max zarfı.
+
+	Her sütun `window_s / columns` saniyeyi kapsar; gelen her değer sadece
+	o anki sütunun min/max'ını günceller (O(1), bellek ayırmaz). Sütunlar
+	sabit boyutlu bir halkada kayar, pikselleri bir kez hesaplanır; çizim
+	maliyeti veri hızından bağımsız olarak sütun sayısıyla sınırlıdır.
+	Ölçek değişmedikçe eski sütunların pikselleri yeniden hesaplanmaz."""
+
+	def __init__(self, columns: int, window_s: float, fixed_max: Optional[float] = None,
+				 clock: Callable[[], float] = time.monotonic) -> None:
+		self.columns = max(2, int(columns))
+		self.window_s = float(window_s)
+		self.column_s = self.window_s / self.columns
+		self.fixed_max = fixed_max
+		self.clock = clock
+
+		n = self.columns
+		self._mins = array("d", [0.0] * n)
+		self._maxs = array("d", [0.0] * n)
+		self._head = 0  # bir sonraki yazılacak halka konumu
+		self._count = 0
+		self._column = None  # şu anki sütunun zaman indeksi
+		self._cur_min = math.inf
+		self._cur_max = -math.inf
+		self._last = (0.0, 0.0)  # boş sütunlar için son değerler
+		self._lock = threading.Lock()
+		self.samples = 0
+
+		# Çizim önbelleği: halka konumu başına piksel y (düşük/yüksek)
+		self._scale = 0.0
+		self._geometry: Tuple[float, float, float, float] = (0, 0, 0, 0)
+		self._ylo = array("d", [0.0] * n)
+		self._yhi = array("d", [0.0] * n)
+		self._xs: List[float] = []
+
+	def add(self, value: float, t: Optional[float] = None) -> None:
+		"""Tek değer ekle (herhangi bir thread'den çağrılabilir)."""
+		t = self.clock() if t is None else t
+		column = int(t / self.column_s)
+		with self._lock:
+			if self._column is None or column > self._column:
+				self._advance(column)
+			if value < self._cur_min:
+				self._cur_min = value
+			if value > self._cur_max:
+				self._cur_max = value
+			self.samples += 1
+
+	def clear(self) -> None:
+		with self._lock:
+			self._count = 0
+			self._head = 0
+			self._column = None
+			self._cur_min = math.inf
+			self._cur_max = -math.inf
+			self._scale = 0.0
+
+	def _advance(self, column: int) -> None:
+		# Kilit altında çağrılmalı: biten sütunu halkaya it, boş geçen sütunları son değerle doldur
+		if self._column is not None and column > self._column:
+			if self._cur_min <= self._cur_max:
+				self._last = (self._cur_min, self._cur_max)
+			steps = min(column - self._column, self.columns)
+			for _ in range(steps):
+				self._push(*self._last)
+				self._last = (self._last[1], self._last[1])
+		self._column = column
+		self._cur_min = math.inf
+		self._cur_max = -math.inf
+
+	def _push(self, lo: float, hi: float) -> None:
+		head = self._head
+		self._mins[head] = lo
+		self._maxs[head] = hi
+		if self._scale:
+			self._project(head)
+		self._head = (head + 1) % self.columns
+		if self._count < self.columns:
+			self._count += 1
+
+	def _project(self, slot: int) -> None:
+		_, y, _, h = self._geometry
+		scale = self._scale
+		self._ylo[slot] = y + h - min(1.0, self._mins[slot] / scale) * h
+		self._yhi[slot] = y + h - min(1.0, self._maxs[slot] / scale) * h
+
+	def max(self) -> float:
+		"""Görünen sütunların en büyük değeri."""
+		with self._lock:
+			return self._max_locked()
+
+	def _max_locked(self) -> float:
+		if not self._count:
+			return 0.0
+		return max(self._maxs) if self._count == self.columns else max(
+			self._maxs[(self._head - i - 1) % self.columns] for i in range(self._count)
+		)
+
+	def points(self, x: float, y: float, w: float, h: float, now: Optional[float] = None) -> Tuple[float, ...]:
+		"""Canvas çizgisi için koordinatlar (sütun başına min ve max noktası).
+
+		Zaman ilerlediyse yeni veri gelmese de grafik kayar. Nokta sayısı en
+		fazla 2 * columns'tur."""
+		now = self.clock() if now is None else now
+		with self._lock:
+			column = int(now / self.column_s)
+			if self._column is not None and column > self._column:
+				self._advance(column)
+			count = self._count
+			if count < 2:
+				return ()
+
+			scale = self.fixed_max or nice_ceil(self._max_locked())
+			geometry = (x, y, w, h)
+			if scale != self._scale or geometry != self._geometry:
+				# Ölçek/konum değişti: tüm pikselleri yeniden hesapla (nadiren)
+				self._scale = scale
+				self._geometry = geometry
+				step = w / (self.columns - 1)
+				self._xs = [x + i * step for i in range(self.columns)]
+				for slot in range(self.columns):
+					self._project(slot)
+
+			n = self.columns
+			start = (self._head - count) % n
+			offset = n - count
+			xs, ylo, yhi = self._xs, self._ylo, self._yhi
+			coords: List[float] = []
+			for i in range(count):
+				slot = (start + i) % n
+				px = xs[offset + i]
+				# Zikzak: her sütunda önce max sonra min (dikey çizgi = zarf)
+				coords += (px, yhi[slot], px, ylo[slot])
+			return tuple(coords)
@@ -0,0 +1,157 @@
+import threading
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+class MetricHistory:
+	"""Sabit kapasiteli, tipli dizi tabanlı metrik geçmişi.
+
+	Ekleme O(1); ortalama (çalışan toplam), min ve max (monoton deque)
+	O(1); yüzdelikler istenen pencere üzerinde hesaplanır."""
+
+	def __init__(self, capacity: int, typecode: str = "d") -> None:
+		self.capacity = max(1, int(capacity))
+		self._data = array(typecode, [0] * self.capacity)
+		self._seq = 0  # toplam eklenen değer sayısı
+		self._count = 0
+		self._sum = 0.0
+		# (seq, value) çiftleri; pencereden çıkan seq'ler baştan atılır
+		self._min_q: Deque[tuple] = deque()
+		self._max_q: Deque[tuple] = deque()
+		self._lock = threading.Lock()
+
+	def append(self, value: float) -> None:
+		with self._lock:
+			slot = self._seq % self.capacity
+			if self._count == self.capacity:
+				self._sum -= self._data[slot]
+			else:
+				self._count += 1
+			self._data[slot] = value
+			self._sum += value
+
+			seq = self._seq
+			self._seq += 1
+			oldest = self._seq - self._count
+
+			min_q = self._min_q
+			while min_q and min_q[-1][1] >= value:
+				min_q.pop()
+			min_q.append((seq, value))
+			while min_q[0][0] < oldest:
+				min_q.popleft()
+
+			max_q = self._max_q
+			while max_q and max_q[-1][1] <= value:
+				max_q.pop()
+			max_q.append((seq, value))
+			while max_q[0][0] < oldest:
+				max_q.popleft()
+
+			# Kayan nokta sapmasını önlemek için her tam turda toplamı yeniden hesapla
+			if slot == self.capacity - 1 and self._count == self.capacity:
+				self._sum = float(sum(self._data))
+
+	def clear(self) -> None:
+		with self._lock:
+			self._seq = 0
+			self._count = 0
+			self._sum = 0.0
+			self._min_q.clear()
+			self._max_q.clear()
+
+	def __len__(self) -> int:
+		return self._count
+
+	@property
+	def total(self) -> int:
+		"""Şimdiye kadar eklenen toplam değer sayısı."""
+		return self._seq
+
+	def sum(self) -> float:
+		return self._sum
+
+	def mean(self) -> float:
+		count = self._count
+		return self._sum / count if count else 0.0
+
+	def min(self) -> float:
+		q = self._min_q
+		return q[0][1] if q else 0.0
+
+	def max(self) -> float:
+		q = self._max_q
+		return q[0][1] if q else 0.0
+
+	def last(self) -> Optional[float]:
+		if not self._count:
+			return None
+		return self._data[(self._seq - 1) % self.capacity]
+
+	def values(self, window: Optional[int] = None) -> List[float]:
+		"""Son `window` değeri eskiden yeniye döndür."""
+		with self._lock:
+			count = self._count if window is None else max(0, min(int(window), self._count))
+			if not count:
+				return []
+			end = self._seq % self.capacity
+			start = end - count
+			if start >= 0:
+				return self._data[start:end].tolist()
+			return self._data[start:].tolist() + self._data[:end].tolist()
+
+	def percentile(self, pct: float, window: Optional[int] = None) -> float:
+		"""Son `window` değer üzerinde doğrusal interpolasyonlu yüzdelik."""
+		return percentile_sorted(sorted(self.values(window)), pct)
+
+	def percentiles(self, pcts: List[float], window: Optional[int] = None) -> Dict[float, float]:
+		ordered = sorted(self.values(window))
+		return {pct: percentile_sorted(ordered, pct) for pct in pcts}
+
+
+def percentile_sorted(sorted_values: List[float], pct: float) -> float:
+	"""Sıralı dizide doğrusal interpolasyonlu yüzdelik."""
+	if not sorted_values:
+		return 0.0
+	if len(sorted_values) == 1:
+		return float(sorted_values[0])
+	pos = (len(sorted_values) - 1) * (pct / 100.0)
+	lo = int(pos)
+	hi = min(lo + 1, len(sorted_values) - 1)
+	frac = pos - lo
+	return float(sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * frac)
+
+
+class HistoryStore:
+	"""Tüm bileşenlerin paylaştığı isimli metrik geçmişleri."""
+
+	def __init__(self, default_capacity: int = 60) -> None:
+		self.default_capacity = default_capacity
+		self._series: Dict[str, MetricHistory] = {}
+		self._lock = threading.Lock()
+
+	def series(self, name: str, capacity: Optional[int] = None) -> MetricHistory:
+		"""İsimli geçmişi döndür, yoksa oluştur."""
+		hist = self._series.get(name)
+		if hist is not None:
+			return hist
+		with self._lock:
+			hist = self._series.get(name)
+			if hist is None:
+				hist = MetricHistory(capacity or self.default_capacity)
+				self._series[name] = hist
+			return hist
+
+	def append(self, name: str, value: float) -> None:
+		self.series(name).append(value)
+
+	def names(self) -> List[str]:
+		return list(self._series.keys())
+
+	def summary(self) -> Dict[str, Dict[str, float]]:
+		"""Her seri için O(1) özet (son, ortalama, min, max)."""
+		return {
+			name: {"last": hist.last() or 0.0, "mean": hist.mean(), "min": hist.min(), "max": hist.max(), "count": len(hist)}
+			for name, hist in list(self._series.items())
+		}
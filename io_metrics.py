@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+import time
+import psutil
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from metric_sources import MetricField, MetricSource
+
+_MB = 1024 ** 2
+_SECTOR = 512  # /proc/diskstats her zaman 512 baytlik sektor sayar
+
+# cihaz adi -> (giren bayt, cikan bayt): disk icin (okuma, yazma), ag icin (alma, gonderme)
+IoCounters = Dict[str, Tuple[int, int]]
+
+IO_KEYS = (
+	"disk_read_mbps",
+	"disk_write_mbps",
+	"net_rx_mbps",
+	"net_tx_mbps",
+)
+
+# Sayilmayan cihazlar: sanal/geri dongu arayuzleri ve fiziksel diskleri tekrar sayan mantiksal aygitlar
+_VIRTUAL_DISK = re.compile(r"^(loop|ram|zram|sr|fd|dm-|md)\d*", re.IGNORECASE)
+_VIRTUAL_NIC = re.compile(
+	r"^(lo\d*$|docker|veth|br-|virbr|vmnet|vboxnet|tun|tap|utun|awdl|llw|zt)"
+	r"|loopback|pseudo|virtual|vethernet|hyper-v|vmware|teredo|isatap|bluetooth",
+	re.IGNORECASE,
+)
+_PARTITION = re.compile(r"^(.+?)p?\d+$")
+
+
+def _is_partition(name: str, names: Sequence[str]) -> bool:
+	"""sda1 / nvme0n1p1 / mmcblk0p1 gibi bolumler (ust disk de listede ise)."""
+	match = _PARTITION.match(name)
+	if match is None:
+		return False
+	base = match.group(1)
+	return base != name and base in names
+
+
+class PsutilIoCounters:
+	"""Disk/ag sayaclari icin psutil arka ucu (tum platformlar)."""
+
+	name = "psutil"
+
+	def disks(self) -> IoCounters:
+		counters = psutil.disk_io_counters(perdisk=True) or {}
+		return {name: (c.read_bytes, c.write_bytes) for name, c in counters.items()}
+
+	def nics(self) -> IoCounters:
+		counters = psutil.net_io_counters(pernic=True) or {}
+		return {name: (c.bytes_recv, c.bytes_sent) for name, c in counters.items()}
+
+	def close(self) -> None:
+		pass
+
+
+class ProcIoCounters:
+	"""Linux hizli yolu: /proc/diskstats ve /proc/net/dev acik tutulur, `os.pread` ile okunur.
+
+	psutil'in cihaz basina yaptigi sysfs kontrollerini atlar; degerler
+	psutil ile aynidir (sektor = 512 bayt)."""
+
+	name = "proc"
+
+	def __init__(self, diskstats_path: str = "/proc/diskstats", netdev_path: str = "/proc/net/dev") -> None:
+		self._disk_fd = os.open(diskstats_path, os.O_RDONLY)
+		try:
+			self._net_fd = os.open(netdev_path, os.O_RDONLY)
+		except OSError:
+			os.close(self._disk_fd)
+			raise
+
+	@staticmethod
+	def _read(fd: int) -> bytes:
+		size = 1 << 15
+		while True:
+			data = os.pread(fd, size, 0)
+			if len(data) < size:
+				return data
+			size *= 2
+
+	def disks(self) -> IoCounters:
+		result: IoCounters = {}
+		for line in self._read(self._disk_fd).splitlines():
+			fields = line.split()
+			if len(fields) >= 14:
+				# major minor ad okuma birlesen sektor_okunan ms yazma birlesen sektor_yazilan ...
+				result[fields[2].decode()] = (int(fields[5]) * _SECTOR, int(fields[9]) * _SECTOR)
+			elif len(fields) == 7:
+				# Eski cekirdeklerde bolum satiri: ad okuma sektor_okunan yazma sektor_yazilan
+				result[fields[2].decode()] = (int(fields[4]) * _SECTOR, int(fields[6]) * _SECTOR)
+		return result
+
+	def nics(self) -> IoCounters:
+		result: IoCounters = {}
+		for line in self._read(self._net_fd).splitlines()[2:]:
+			name, _, rest = line.rpartition(b":")
+			fields = rest.split()
+			if len(fields) >= 9:
+				result[name.strip().decode()] = (int(fields[0]), int(fields[8]))
+		return result
+
+	def close(self) -> None:
+		for fd in (self._disk_fd, self._net_fd):
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+
+
+def make_io_counters(preferred: str = "auto") -> Any:
+	"""Disk/ag sayac arka ucu: "auto" Linux'ta /proc, digerlerinde psutil."""
+	if preferred in ("auto", "proc") and sys.platform.startswith("linux"):
+		try:
+			return ProcIoCounters()
+		except OSError as e:
+			if preferred == "proc":
+				print(f"/proc I/O arka ucu acilamadi, psutil kullaniliyor: {e}")
+	return PsutilIoCounters()
+
+
+class IoThroughputSource(MetricSource):
+	"""Disk okuma/yazma ve ag alma/gonderme hizlari (MB/s).
+
+	Her aralikta tum diskler ve tum ag arayuzleri icin tek bir toplu okuma
+	yapilir (`disk_io_counters(perdisk=True)` / `net_io_counters(pernic=True)`
+	veya Linux'ta ayni dosyalarin dogrudan okunmasi). Hangi cihazlarin
+	toplanacagi ilk taramada belirlenir ve cihaz sayisi degisene kadar
+	onbellekte kalir (sanal arayuzler, bolumler ve mantiksal aygitlar cift
+	sayilmaz). Hizlar monotonik saate gore hesaplanir ve EWMA ile
+	yumusatilir; sayac sifirlanirsa o aralik atlanir."""
+
+	name = "io"
+	fields = (
+		MetricField("disk_read_mbps", " MB/s", "Disk R"),
+		MetricField("disk_write_mbps", " MB/s", "Disk W"),
+		MetricField("net_rx_mbps", " MB/s", "Ag RX"),
+		MetricField("net_tx_mbps", " MB/s", "Ag TX"),
+	)
+
+	def __init__(self, interval_s: float = 1.0, smoothing: float = 0.3,
+				 disks: Sequence[str] = (), nics: Sequence[str] = (), backend: Any = "auto",
+				 clock: Callable[[], float] = time.monotonic,
+				 nic_stats: Callable[[], Any] = psutil.net_if_stats) -> None:
+		self.interval_s = float(interval_s)
+		self.smoothing = float(smoothing)
+		# Bos liste: otomatik secim; dolu liste: sadece bu cihazlar
+		self.disk_filter = tuple(disks)
+		self.nic_filter = tuple(nics)
+		self.clock = clock
+		# backend: "auto" / "proc" / "psutil" veya disks()/nics() saglayan nesne
+		self.backend = make_io_counters(backend) if isinstance(backend, str) else backend
+		self._nic_stats = nic_stats
+
+		self._disks: Optional[Tuple[str, ...]] = None
+		self._nics: Optional[Tuple[str, ...]] = None
+		self._seen = (-1, -1)  # taramadaki (disk, nic) sayisi
+		self._last: Optional[Tuple[float, Tuple[int, int, int, int]]] = None
+		# Yumusatma durumu yuvarlanmadan tutulur; sadece dondurulen degerler yuvarlanir
+		self._smoothed: Dict[str, Optional[float]] = self.empty()
+		self._rates: Dict[str, Optional[float]] = self.empty()
+		self.scans = 0
+
+	def _scan(self, disks: IoCounters, nics: IoCounters) -> None:
+		if self.disk_filter:
+			self._disks = tuple(name for name in self.disk_filter if name in disks)
+		else:
+			names = list(disks)
+			self._disks = tuple(
+				name for name in names if not _VIRTUAL_DISK.match(name) and not _is_partition(name, names)
+			)
+
+		if self.nic_filter:
+			self._nics = tuple(name for name in self.nic_filter if name in nics)
+		else:
+			try:
+				stats = self._nic_stats()
+			except Exception:
+				stats = {}
+			self._nics = tuple(
+				name for name in nics
+				if not _VIRTUAL_NIC.search(name) and getattr(stats.get(name), "isup", True)
+			)
+
+		self._seen = (len(disks), len(nics))
+		# Cihaz kumesi degisti: toplamlar karsilastirilamaz, bir sonraki aralik yeni referans
+		self._last = None
+		self.scans += 1
+
+	def sample(self) -> Dict[str, Any]:
+		now = self.clock()
+		disks = self.backend.disks()
+		nics = self.backend.nics()
+		if self._disks is None or (len(disks), len(nics)) != self._seen:
+			self._scan(disks, nics)
+
+		read = write = received = sent = 0
+		for name in self._disks:
+			counters = disks.get(name)
+			if counters is not None:
+				read += counters[0]
+				write += counters[1]
+		for name in self._nics:
+			counters = nics.get(name)
+			if counters is not None:
+				received += counters[0]
+				sent += counters[1]
+		totals = (read, write, received, sent)
+
+		last, self._last = self._last, (now, totals)
+		if last is None:
+			return self._rates
+		elapsed = now - last[0]
+		if elapsed <= 0:
+			return self._rates
+
+		smoothed = self._smoothed
+		alpha = self.smoothing
+		for key, current, previous in zip(IO_KEYS, totals, last[1]):
+			delta = current - previous
+			if delta < 0:
+				continue  # sayac sifirlandi / tasti
+			rate = delta / elapsed / _MB
+			previous_rate = smoothed[key]
+			smoothed[key] = rate if previous_rate is None else previous_rate + alpha * (rate - previous_rate)
+		self._rates = {key: None if value is None else round(value, 2) for key, value in smoothed.items()}
+		return self._rates
+
+	def close(self) -> None:
+		self.backend.close()
@@ -0,0 +1,250 @@
+import importlib
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Eklentilerin kayit oldugu entry point grubu (pyproject.toml):
+#   [project.entry-points."osd_overlay.metric_sources"]
+#   sicaklik = "paketim.sensor:SicaklikSource"
+ENTRY_POINT_GROUP = "osd_overlay.metric_sources"
+
+
+@dataclass(frozen=True)
+class MetricField:
+	"""Bir kaynagin urettigi tek metrik: anahtar, birim ve overlay etiketi."""
+
+	key: str
+	unit: str = ""
+	label: str = ""
+	precision: int = 1
+
+	def format(self, value: Any) -> str:
+		"""Overlay icin "etiket deger birim" metni (deger yoksa "-")."""
+		label = self.label or self.key
+		if value is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+			return f"{label} -"
+		return f"{label} {value:.{self.precision}f}{self.unit}"
+
+
+class MetricSource:
+	"""Metrik kaynagi eklenti arayuzu.
+
+	Alt siniflar `name`, `fields` ve `interval_s` tanimlar ve `sample()`
+	icinde alan anahtari -> deger sozlugu dondurur. `interval_s` dolmadan
+	toplayici son degerleri tekrar kullanir (0 = her ornekte). `isolated`
+	True ise kaynak ayri bir surecte calistirilir ve `timeout_s` icinde
+	yanit vermezse surec yeniden baslatilir; yavas veya cokebilen
+	sensorler icin kullanilir."""
+
+	name: str = ""
+	fields: Tuple[MetricField, ...] = ()
+	interval_s: float = 0.0
+	isolated: bool = False
+	timeout_s: float = 1.0
+
+	def open(self) -> None:
+		"""Kaynagi hazirla (ilk ornekten once, ornekleyici thread'inde)."""
+
+	def sample(self) -> Dict[str, Any]:
+		raise NotImplementedError
+
+	def close(self) -> None:
+		"""Kaynaklari birak."""
+
+	def empty(self) -> Dict[str, Any]:
+		"""Hata/zaman asiminda kullanilan bos degerler."""
+		return {field.key: None for field in self.fields}
+
+
+def load_source(target: Any) -> MetricSource:
+	"""Sinif, fabrika veya "modul:isim" metninden kaynak olustur.
+
+	`isolated` kaynaklar burada olusturulmaz; alt surecte olusturulmak
+	uzere `IsolatedSource` ile sarilir."""
+	if isinstance(target, str):
+		module_name, _, attr = target.partition(":")
+		target = getattr(importlib.import_module(module_name), attr)
+	if getattr(target, "isolated", False) and isinstance(target, type):
+		return IsolatedSource(target)
+	source = target() if callable(target) and not isinstance(target, MetricSource) else target
+	if not isinstance(source, MetricSource):
+		raise TypeError(f"{target!r} bir MetricSource degil")
+	return source
+
+
+def discover_sources(plugins: Sequence[str] = (), disabled: Sequence[str] = (),
+					 entry_points: bool = True, group: str = ENTRY_POINT_GROUP) -> List[MetricSource]:
+	"""Entry point'lerden ve verilen "modul:isim" listesinden kaynaklari yukle.
+
+	Yuklenemeyen eklenti atlanir (hata yazdirilir); `disabled` icindeki
+	entry point veya kaynak adlari yuklenmez."""
+	targets: List[Tuple[str, Any]] = []
+	if entry_points:
+		try:
+			from importlib.metadata import entry_points as _entry_points
+			found = _entry_points()
+			selected = found.select(group=group) if hasattr(found, "select") else found.get(group, [])
+			targets.extend((ep.name, ep) for ep in selected)
+		except Exception as e:
+			print(f"Entry point taramasi basarisiz: {e}")
+	targets.extend((spec, spec) for spec in plugins)
+
+	sources: List[MetricSource] = []
+	for name, target in targets:
+		if name in disabled:
+			continue
+		try:
+			if hasattr(target, "load"):
+				target = target.load()
+			source = load_source(target)
+		except Exception as e:
+			print(f"Metrik kaynagi yuklenemedi ({name}): {e}")
+			continue
+		if source.name in disabled:
+			source.close()
+			continue
+		sources.append(source)
+	return sources
+
+
+def _isolated_worker(conn: Any, factory: Callable[[], MetricSource]) -> None:
+	# Alt surec: istek geldikce ornekle; hata metni ebeveyne iletilir
+	try:
+		source = factory()
+		source.open()
+	except Exception as e:
+		conn.send(("error", f"acilamadi: {e}"))
+		return
+	try:
+		while True:
+			if conn.recv() is None:
+				break
+			try:
+				conn.send(("ok", source.sample()))
+			except Exception as e:
+				conn.send(("error", str(e)))
+	except (EOFError, OSError, KeyboardInterrupt):
+		pass
+	finally:
+		try:
+			source.close()
+		except Exception:
+			pass
+
+
+class IsolatedSource(MetricSource):
+	"""Kaynagi ayri bir surecte calistiran sarmalayici.
+
+	`sample()` hic beklemez: bekleyen yanit varsa alinir, yoksa yeni istek
+	gonderilir ve son bilinen degerler doner (degerler en fazla bir aralik
+	gecikmelidir). Istek `timeout_s` icinde yanitlanmazsa veya surec
+	olurse surec sonlandirilir ve artan bekleme ile yeniden baslatilir;
+	bu sirada alanlar None olur. Boylece takilan bir sensor ornekleyiciyi
+	hicbir zaman durduramaz."""
+
+	max_backoff_s = 30.0
+
+	def __init__(self, factory: Callable[[], MetricSource], name: str = "",
+				 fields: Optional[Sequence[MetricField]] = None, interval_s: Optional[float] = None,
+				 timeout_s: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+		self.factory = factory
+		self.name = name or getattr(factory, "name", "") or getattr(factory, "__name__", "isolated")
+		self.fields = tuple(fields if fields is not None else getattr(factory, "fields", ()))
+		self.interval_s = float(interval_s if interval_s is not None else getattr(factory, "interval_s", 1.0))
+		self.timeout_s = float(timeout_s if timeout_s is not None else getattr(factory, "timeout_s", 1.0))
+		self.isolated = True
+		self.clock = clock
+		self._context = multiprocessing.get_context("spawn")
+		self._process: Any = None
+		self._conn: Any = None
+		self._sent_at: Optional[float] = None
+		self._values: Dict[str, Any] = self.empty()
+		self._retry_at = 0.0
+		self._backoff = 1.0
+		self.restarts = 0
+		self.timeouts = 0
+		self.last_error: Optional[str] = None
+
+	def _start(self) -> None:
+		parent, child = self._context.Pipe()
+		process = self._context.Process(
+			target=_isolated_worker, args=(child, self.factory), name=f"source-{self.name}", daemon=True
+		)
+		process.start()
+		child.close()
+		self._process, self._conn = process, parent
+		self._sent_at = None
+
+	def _kill(self, reason: str) -> None:
+		self.last_error = reason
+		print(f"Metrik kaynagi yeniden baslatiliyor ({self.name}): {reason}")
+		if self._process is not None:
+			try:
+				self._process.kill()
+				self._process.join(timeout=0.1)
+			except Exception:
+				pass
+		if self._conn is not None:
+			try:
+				self._conn.close()
+			except Exception:
+				pass
+		self._process = self._conn = None
+		self._sent_at = None
+		self._values = self.empty()
+		self._retry_at = self.clock() + self._backoff
+		self._backoff = min(self.max_backoff_s, self._backoff * 2)
+		self.restarts += 1
+
+	def sample(self) -> Dict[str, Any]:
+		now = self.clock()
+		if self._process is None:
+			if now < self._retry_at:
+				return self._values
+			try:
+				self._start()
+			except Exception as e:
+				self._kill(f"baslatilamadi: {e}")
+				return self._values
+
+		try:
+			if self._sent_at is not None and self._conn.poll():
+				status, payload = self._conn.recv()
+				self._sent_at = None
+				if status == "ok":
+					self._values = {field.key: payload.get(field.key) for field in self.fields} if self.fields else dict(payload)
+					self._backoff = 1.0
+					self.last_error = None
+				else:
+					self.last_error = payload
+					self._values = self.empty()
+					if not self._process.is_alive():
+						self._kill(payload)
+						return self._values
+			if self._sent_at is None:
+				self._conn.send(True)
+				self._sent_at = now
+			elif now - self._sent_at > self.timeout_s:
+				self.timeouts += 1
+				self._kill(f"{self.timeout_s:g} sn icinde yanit yok")
+		except (EOFError, OSError):
+			self._kill(f"surec sonlandi (cikis kodu {self._process.exitcode if self._process else None})")
+		return self._values
+
+	def close(self) -> None:
+		if self._conn is not None:
+			try:
+				self._conn.send(None)
+			except Exception:
+				pass
+		if self._process is not None:
+			self._process.join(timeout=0.5)
+			if self._process.is_alive():
+				self._process.kill()
+		if self._conn is not None:
+			try:
+				self._conn.close()
+			except Exception:
+				pass
+		self._process = self._conn = None
@@ -1,96 +1,454 @@
+import os
+import sys
+import time
 import psutil
-from typing import Dict, Optional
-
-try:
-	from pynvml import (
-		nvmlInit,
-		nvmlShutdown,
-		nvmlDeviceGetHandleByIndex,
-		nvmlDeviceGetTemperature,
-		nvmlDeviceGetUtilizationRates,
-		nvmlDeviceGetMemoryInfo,
-		nvmlDeviceGetFanSpeed,
-		nvmlDeviceGetClockInfo,
-		NVML_TEMPERATURE_GPU,
-		NVML_CLOCK_GRAPHICS,
-	)
-	_NV_AVAILABLE = True
-except Exception:
-	_NV_AVAILABLE = False
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from io_metrics import IoThroughputSource
+from metric_sources import MetricField, MetricSource
 
-class SystemMetricsCollector:
-	"""Toplayici: CPU, RAM ve (varsa) NVIDIA GPU metrikleri."""
 
-	def __init__(self) -> None:
-		self._nv_handle = None
-		if _NV_AVAILABLE:
-			try:
-				nvmlInit()
-				self._nv_handle = nvmlDeviceGetHandleByIndex(0)
-			except Exception:
-				self._nv_handle = None
+def _load_pynvml() -> Any:
+	"""pynvml'i ilk kullanimda yukle (baslangic suresini kisaltir)."""
+	try:
+		import pynvml
+		return pynvml
+	except Exception:
+		return None
+
+
+_GB = 1024 ** 3
+
+# GPU alan gruplari ve urettikleri anahtarlar
+GPU_FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+	"utilization": ("gpu_util_percent",),
+	"memory": ("gpu_mem_used_gb", "gpu_mem_total_gb"),
+	"clock": ("gpu_clock_mhz",),
+	"temperature": ("gpu_temp_c",),
+	"fan": ("gpu_fan_percent",),
+}
+
+# Varsayilan yenileme araliklari (saniye): hizli degisenler sik, yavaslar seyrek
+DEFAULT_GPU_INTERVALS: Dict[str, float] = {
+	"utilization": 0.25,
+	"memory": 0.5,
+	"clock": 0.5,
+	"temperature": 2.0,
+	"fan": 2.0,
+}
+
+GPU_KEYS: Tuple[str, ...] = tuple(key for keys in GPU_FIELD_KEYS.values() for key in keys)
+
+
+def _read_utilization(nvml: Any, handle: Any) -> Dict[str, Optional[float]]:
+	return {"gpu_util_percent": float(nvml.nvmlDeviceGetUtilizationRates(handle).gpu)}
+
+
+def _read_memory(nvml: Any, handle: Any) -> Dict[str, Optional[float]]:
+	mem = nvml.nvmlDeviceGetMemoryInfo(handle)
+	return {
+		"gpu_mem_used_gb": round(mem.used / _GB, 2),
+		"gpu_mem_total_gb": round(mem.total / _GB, 2),
+	}
+
+
+def _read_clock(nvml: Any, handle: Any) -> Dict[str, Optional[float]]:
+	return {"gpu_clock_mhz": float(nvml.nvmlDeviceGetClockInfo(handle, nvml.NVML_CLOCK_GRAPHICS))}
+
+
+def _read_temperature(nvml: Any, handle: Any) -> Dict[str, Optional[float]]:
+	return {"gpu_temp_c": float(nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU))}
+
+
+def _read_fan(nvml: Any, handle: Any) -> Dict[str, Optional[float]]:
+	return {"gpu_fan_percent": float(nvml.nvmlDeviceGetFanSpeed(handle))}
+
+
+_GPU_FIELD_READERS: Dict[str, Callable[[Any, Any], Dict[str, Optional[float]]]] = {
+	"utilization": _read_utilization,
+	"memory": _read_memory,
+	"clock": _read_clock,
+	"temperature": _read_temperature,
+	"fan": _read_fan,
+}
+
+
+class NvmlGpuCollector:
+	"""Tum NVIDIA GPU'lari okur; her alan kendi araliginda yenilenir.
+
+	Aralik dolmadan istenen alanlar onbellekten doner, boylece surucuye
+	yapilan cagri sayisi alanin degisim hizina gore azalir. `nvml` parametresi
+	ile sahte bir `pynvml` modulu verilebilir."""
+
+	def __init__(self, nvml: Any = None, intervals: Optional[Dict[str, float]] = None,
+				 clock: Callable[[], float] = time.monotonic) -> None:
+		self.nvml = nvml
+		self.intervals = {**DEFAULT_GPU_INTERVALS, **(intervals or {})}
+		self.clock = clock
+		self.handles: List[Any] = []
+		self._initialized = False
+		# cihaz -> alan -> (son okuma zamani, degerler)
+		self._cache: List[Dict[str, Tuple[float, Dict[str, Optional[float]]]]] = []
+		self.nvml_calls = 0
+
+	def open(self) -> bool:
+		"""NVML'i baslat ve tum cihazlarin handle'larini al.
+
+		Ornekleyici thread'i calisirken baska bir thread'den cagrilabilir;
+		handle listesi en son, tek atamayla yayinlanir."""
+		if self.nvml is None:
+			self.nvml = _load_pynvml()
+		if self.nvml is None:
+			return False
+		handles: List[Any] = []
+		try:
+			self.nvml.nvmlInit()
+			self._initialized = True
+			count = int(self.nvml.nvmlDeviceGetCount())
+			handles = [self.nvml.nvmlDeviceGetHandleByIndex(i) for i in range(count)]
+		except Exception:
+			handles = []
+		self._cache = [{} for _ in handles]
+		self.handles = handles
+		return bool(handles)
 
 	def close(self) -> None:
-		if _NV_AVAILABLE and self._nv_handle is not None:
+		if self._initialized:
 			try:
-				nvmlShutdown()
+				self.nvml.nvmlShutdown()
 			except Exception:
 				pass
+			self._initialized = False
+		self.handles = []
+		self._cache = []
+
+	@property
+	def device_count(self) -> int:
+		return len(self.handles)
+
+	def sample(self) -> List[Dict[str, Optional[float]]]:
+		"""Her cihaz icin metrikleri dondur; suresi dolan alanlar yeniden okunur."""
+		now = self.clock()
+		result: List[Dict[str, Optional[float]]] = []
+		# open()/close() baska thread'den cagrilabilir; eslesmeyen listeler zip ile kisalir
+		for handle, cache in zip(self.handles, self._cache):
+			values: Dict[str, Optional[float]] = {}
+			for field, reader in _GPU_FIELD_READERS.items():
+				entry = cache.get(field)
+				if entry is None or now - entry[0] >= self.intervals[field]:
+					try:
+						fresh = reader(self.nvml, handle)
+					except Exception:
+						# Desteklenmeyen/basarisiz alan: None, bir sonraki aralikta tekrar dene
+						fresh = {key: None for key in GPU_FIELD_KEYS[field]}
+					self.nvml_calls += 1
+					entry = (now, fresh)
+					cache[field] = entry
+				values.update(entry[1])
+			result.append(values)
+		return result
+
 
-	def get_metrics(self) -> Dict[str, Optional[float]]:
-		cpu_percent = psutil.cpu_percent(interval=None)
+class PsutilCpuMemBackend:
+	"""CPU yuzdesi ve bellek icin psutil arka ucu (tum platformlar)."""
+
+	name = "psutil"
+
+	def __init__(self) -> None:
+		psutil.cpu_percent(interval=None)  # ilk cagri referans noktasi
+
+	def cpu_percent(self) -> float:
+		return psutil.cpu_percent(interval=None)
+
+	def memory(self) -> Tuple[int, int]:
+		"""(kullanilan, toplam) bayt; kullanilan = toplam - available."""
 		virtual_mem = psutil.virtual_memory()
-		ram_used_gb = (virtual_mem.total - virtual_mem.available) / (1024 ** 3)
-		ram_total_gb = virtual_mem.total / (1024 ** 3)
+		return virtual_mem.total - virtual_mem.available, virtual_mem.total
+
+	def close(self) -> None:
+		pass
+
+
+class ProcCpuMemBackend:
+	"""Linux hizli yolu: /proc/stat ve /proc/meminfo acik tutulur.
+
+	Her ornekte dosyalar `os.pread` ile bastan okunur (seq_file icerigi
+	offset 0'da yeniden uretilir); sadece ilk `cpu` satiri ile MemTotal /
+	MemAvailable ayristirilir. Hesaplama psutil ile aynidir: mesgul sure =
+	toplam - idle - iowait, toplamdan guest/guest_nice cikarilir."""
+
+	name = "proc"
+
+	def __init__(self, stat_path: str = "/proc/stat", meminfo_path: str = "/proc/meminfo") -> None:
+		self._stat_fd = os.open(stat_path, os.O_RDONLY)
+		try:
+			self._meminfo_fd = os.open(meminfo_path, os.O_RDONLY)
+		except OSError:
+			os.close(self._stat_fd)
+			raise
+		self._last = self.cpu_times()
+
+	def cpu_times(self) -> Tuple[float, float]:
+		"""(toplam, mesgul) CPU suresi (jiffy)."""
+		data = os.pread(self._stat_fd, 512, 0)
+		fields = data[:data.index(b"\n")].split()
+		values = [int(v) for v in fields[1:]]
+		# user nice system idle iowait irq softirq steal guest guest_nice
+		total = sum(values) - sum(values[8:10])
+		busy = total - values[3] - (values[4] if len(values) > 4 else 0)
+		return float(total), float(busy)
+
+	def cpu_percent(self) -> float:
+		total, busy = self.cpu_times()
+		last_total, last_busy = self._last
+		self._last = (total, busy)
+		total_delta = total - last_total
+		if total_delta <= 0:
+			return 0.0
+		percent = (busy - last_busy) / total_delta * 100.0
+		return round(min(100.0, max(0.0, percent)), 1)
+
+	def memory(self) -> Tuple[int, int]:
+		data = os.pread(self._meminfo_fd, 4096, 0)
+		total = available = None
+		for line in data.split(b"\n"):
+			if line.startswith(b"MemTotal:"):
+				total = int(line.split()[1]) * 1024
+			elif line.startswith(b"MemAvailable:"):
+				available = int(line.split()[1]) * 1024
+				break
+		if total is None or available is None:
+			# Cok eski cekirdek: psutil'in tahminine birak
+			virtual_mem = psutil.virtual_memory()
+			return virtual_mem.total - virtual_mem.available, virtual_mem.total
+		return total - available, total
+
+	def close(self) -> None:
+		for fd in (self._stat_fd, self._meminfo_fd):
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+
+
+def make_cpu_mem_backend(preferred: str = "auto") -> Any:
+	"""CPU/bellek arka ucunu sec: "auto" (Linux'ta /proc, yoksa psutil), "proc" veya "psutil"."""
+	if preferred in ("auto", "proc") and sys.platform.startswith("linux"):
+		try:
+			return ProcCpuMemBackend()
+		except Exception as e:
+			if preferred == "proc":
+				print(f"/proc arka ucu acilamadi, psutil kullaniliyor: {e}")
+	return PsutilCpuMemBackend()
+
 
-		metrics: Dict[str, Optional[float]] = {
-			"cpu_percent": cpu_percent,
-			"ram_used_gb": round(ram_used_gb, 2),
-			"ram_total_gb": round(ram_total_gb, 2),
+class CpuMemSource(MetricSource):
+	"""Yerlesik kaynak: toplam CPU yuzdesi ve RAM (secilen arka uctan)."""
+
+	name = "cpu_mem"
+	fields = (
+		MetricField("cpu_percent", "%", "CPU", 0),
+		MetricField("ram_used_gb", " GB", "RAM"),
+		MetricField("ram_total_gb", " GB", "RAM toplam"),
+	)
+
+	def __init__(self, backend: Any) -> None:
+		self.backend = backend
+
+	def sample(self) -> Dict[str, Any]:
+		ram_used, ram_total = self.backend.memory()
+		return {
+			"cpu_percent": self.backend.cpu_percent(),
+			"ram_used_gb": round(ram_used / _GB, 2),
+			"ram_total_gb": round(ram_total / _GB, 2),
 		}
 
-		# GPU (NVIDIA NVML varsa)
-		if self._nv_handle is not None:
+	def close(self) -> None:
+		self.backend.close()
+
+
+_GPU_UNITS: Dict[str, str] = {
+	"gpu_util_percent": "%",
+	"gpu_mem_used_gb": " GB",
+	"gpu_mem_total_gb": " GB",
+	"gpu_clock_mhz": " MHz",
+	"gpu_temp_c": " C",
+	"gpu_fan_percent": "%",
+}
+
+
+class GpuSource(MetricSource):
+	"""Yerlesik kaynak: NVML ile tum NVIDIA GPU'lar (alan bazli araliklar NvmlGpuCollector'da)."""
+
+	name = "gpu"
+	fields = (MetricField("gpu_count", "", "GPU", 0),) + tuple(
+		MetricField(key, _GPU_UNITS.get(key, "")) for key in GPU_KEYS
+	)
+
+	def __init__(self, gpu: NvmlGpuCollector) -> None:
+		self.gpu = gpu
+
+	def sample(self) -> Dict[str, Any]:
+		devices = self.gpu.sample()
+		metrics: Dict[str, Any] = {"gpu_count": float(len(devices))}
+		if devices:
+			metrics.update(devices[0])
+			for index, device in enumerate(devices[1:], start=1):
+				for key, value in device.items():
+					metrics[key.replace("gpu_", f"gpu{index}_", 1)] = value
+		else:
+			metrics.update({key: None for key in GPU_KEYS})
+		return metrics
+
+	def close(self) -> None:
+		self.gpu.close()
+
+
+class PerCoreSource(MetricSource):
+	"""Yerlesik kaynak: cekirdek basina CPU (`cpu_cores` demeti + en yogun cekirdek).
+
+	Motor (ve numpy) ilk ornekte, ornekleyici thread'inde yuklenir."""
+
+	name = "per_core"
+	fields = (MetricField("cpu_core_max_percent", "%", "En yogun cekirdek", 0),)
+
+	def __init__(self, engine: Any = None) -> None:
+		self.engine = engine
+
+	def open(self) -> None:
+		if self.engine is None:
+			from percore import PerCoreCpu
+			self.engine = PerCoreCpu()
+
+	def sample(self) -> Dict[str, Any]:
+		cores = tuple(self.engine.sample())
+		return {"cpu_cores": cores, "cpu_core_max_percent": max(cores) if cores else None}
+
+	def close(self) -> None:
+		close = getattr(self.engine, "close", None)
+		if close is not None:
+			close()
+
+
+class ProcessSource(MetricSource):
+	"""Yerlesik kaynak: takip edilen oyun surecinin `proc_*` metrikleri."""
+
+	name = "process"
+	fields = (
+		MetricField("proc_cpu_percent", "%", "Surec CPU", 0),
+		MetricField("proc_rss_mb", " MB", "Surec RSS", 0),
+		MetricField("proc_threads", "", "Thread", 0),
+		MetricField("proc_io_read_mbps", " MB/s", "Okuma"),
+		MetricField("proc_io_write_mbps", " MB/s", "Yazma"),
+	)
+
+	def __init__(self, tracker: Any) -> None:
+		self.tracker = tracker
+
+	def sample(self) -> Dict[str, Any]:
+		return self.tracker.sample()
+
+
+class _SourceState:
+	__slots__ = ("source", "due", "values", "opened", "errors")
+
+	def __init__(self, source: MetricSource) -> None:
+		self.source = source
+		self.due = 0.0
+		self.values: Dict[str, Any] = source.empty()
+		self.opened = False
+		self.errors = 0
+
+
+class SystemMetricsCollector:
+	"""Toplayici: kayitli `MetricSource`'lari kendi araliklarinda okur ve birlestirir.
+
+	Yerlesik kaynaklar CPU/RAM, NVIDIA GPU (ilk GPU `gpu_*`, digerleri
+	`gpu1_*` ...; `gpu_count` cihaz sayisi), `per_core=True` ise cekirdek
+	basina CPU (`cpu_cores`, `cpu_core_max_percent`), `io=True` ise disk/ag
+	hizlari (`disk_*_mbps`, `net_*_mbps`) ve `process_tracker` verilirse oyun
+	surecinin `proc_*` metrikleridir. `sources` ve
+	`add_sources()` ile eklenti kaynaklari eklenir. Araligi dolmamis
+	kaynagin son degerleri kullanilir; hata veren kaynagin alanlari None
+	olur, diger kaynaklar etkilenmez."""
+
+	def __init__(self, nvml: Any = None, gpu_intervals: Optional[Dict[str, float]] = None,
+				 open_gpu: bool = True, process_tracker: Any = None, backend: Any = "auto",
+				 per_core: Any = False, io: Any = False, sources: Sequence[MetricSource] = (),
+				 clock: Callable[[], float] = time.monotonic) -> None:
+		self.gpu = NvmlGpuCollector(nvml=nvml, intervals=gpu_intervals)
+		# backend: "auto" / "proc" / "psutil" veya cpu_percent()/memory() saglayan nesne
+		self.backend = make_cpu_mem_backend(backend) if isinstance(backend, str) else backend
+		self.process_tracker = process_tracker
+		self.clock = clock
+
+		builtin: List[MetricSource] = [CpuMemSource(self.backend), GpuSource(self.gpu)]
+		if per_core:
+			# per_core: True (ilk ornekte olusturulur) veya sample() saglayan motor
+			builtin.append(PerCoreSource(None if per_core is True else per_core))
+		if io:
+			# io: True (varsayilan ayarlar) veya hazir IoThroughputSource
+			builtin.append(IoThroughputSource(backend=backend if isinstance(backend, str) else "auto") if io is True else io)
+		if process_tracker is not None:
+			builtin.append(ProcessSource(process_tracker))
+		self.builtin_count = len(builtin)
+		# Ornekleyici thread'i okurken baska thread'den eklenebilir: tek atamayla yayinlanir
+		self._states: Tuple[_SourceState, ...] = tuple(_SourceState(source) for source in builtin)
+		self.add_sources(sources)
+
+		# open_gpu=False: NVML daha sonra (ornegin ayri thread'de) gpu.open() ile acilir
+		if open_gpu:
+			self.gpu.open()
+
+	@property
+	def sources(self) -> List[MetricSource]:
+		return [state.source for state in self._states]
+
+	def add_sources(self, sources: Sequence[MetricSource]) -> None:
+		"""Eklenti kaynaklarini ekle (herhangi bir thread'den)."""
+		if sources:
+			self._states = self._states + tuple(_SourceState(source) for source in sources)
+
+	def plugin_fields(self) -> List[MetricField]:
+		"""Eklenti kaynaklarinin alanlari (overlay'de genel satirlar olarak gosterilir)."""
+		return [field for state in self._states[self.builtin_count:] for field in state.source.fields]
+
+	def field_keys(self) -> List[str]:
+		"""Tum kaynaklarin bildirdigi alan anahtarlari (kayit/yayin semasi icin).
+
+		Sonradan eklenen kaynaklar ve ek GPU'larin `gpuN_*` alanlari burada
+		yoktur; tuketiciler yeni anahtarlari snapshot'lardan ekler."""
+		return [field.key for state in self._states for field in state.source.fields]
+
+	def source_errors(self) -> Dict[str, int]:
+		return {state.source.name: state.errors for state in self._states if state.errors}
+
+	def close(self) -> None:
+		for state in self._states:
 			try:
-				gpu_temp = nvmlDeviceGetTemperature(self._nv_handle, NVML_TEMPERATURE_GPU)
-				util = nvmlDeviceGetUtilizationRates(self._nv_handle)
-				mem = nvmlDeviceGetMemoryInfo(self._nv_handle)
-				fan = nvmlDeviceGetFanSpeed(self._nv_handle)
-				clock = nvmlDeviceGetClockInfo(self._nv_handle, NVML_CLOCK_GRAPHICS)
-
-				metrics.update(
-					{
-						"gpu_temp_c": float(gpu_temp),
-						"gpu_util_percent": float(util.gpu),
-						"gpu_mem_used_gb": round(mem.used / (1024 ** 3), 2),
-						"gpu_mem_total_gb": round(mem.total / (1024 ** 3), 2),
-						"gpu_fan_percent": float(fan),
-						"gpu_clock_mhz": float(clock),
-					}
-				)
+				state.source.close()
 			except Exception:
-				# NVML basarisizsa None birak
-				metrics.update(
-					{
-						"gpu_temp_c": None,
-						"gpu_util_percent": None,
-						"gpu_mem_used_gb": None,
-						"gpu_mem_total_gb": None,
-						"gpu_fan_percent": None,
-						"gpu_clock_mhz": None,
-					}
-				)
-		else:
-			metrics.update(
-				{
-					"gpu_temp_c": None,
-					"gpu_util_percent": None,
-					"gpu_mem_used_gb": None,
-					"gpu_mem_total_gb": None,
-					"gpu_fan_percent": None,
-					"gpu_clock_mhz": None,
-				}
-			)
-
-		return metrics
\ No newline at end of file
+				pass
+
+	def get_metrics(self) -> Dict[str, Any]:
+		now = self.clock()
+		metrics: Dict[str, Any] = {}
+		for state in self._states:
+			if now >= state.due:
+				source = state.source
+				state.due = now + source.interval_s
+				try:
+					if not state.opened:
+						source.open()
+						state.opened = True
+					state.values = source.sample()
+				except Exception as e:
+					state.errors += 1
+					if state.errors == 1:
+						print(f"Metrik kaynagi hatasi ({source.name}): {e}")
+					state.values = source.empty()
+					if not state.opened:
+						# Acilamayan kaynak her ornekte yeniden denenmez
+						state.due = now + max(source.interval_s, 5.0)
+			metrics.update(state.values)
+		return metrics
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Sabit yanıtlar: her scrape'te yeniden oluşturulmaz
+_NOT_FOUND = b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+_BAD_REQUEST = b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+_BUSY = b"HTTP/1.1 503 Service Unavailable\r\nRetry-After: 1\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+_NO_DATA = b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+_GPU_INDEX = re.compile(r"^gpu(\d+)_(.+)$")
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _http_response(body: bytes, content_type: str) -> bytes:
+	header = (
+		"HTTP/1.1 200 OK\r\n"
+		f"Content-Type: {content_type}\r\n"
+		f"Content-Length: {len(body)}\r\n"
+		"Cache-Control: no-store\r\n"
+		"Connection: close\r\n\r\n"
+	)
+	return header.encode("ascii") + body
+
+
+def _label_value(value: Any) -> str:
+	return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_prometheus(metrics: Dict[str, Any], fps: Optional[Dict[str, Any]] = None,
+					  seq: int = 0, timestamp: float = 0.0, duration_s: float = 0.0,
+					  top: Optional[List[Dict[str, Any]]] = None,
+					  ui: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+	"""Metrikleri Prometheus metin biçimine çevir.
+
+	`gpu1_util_percent` gibi anahtarlar `osd_gpu_util_percent{gpu="1"}` olur;
+	sayı olmayan / None değerler atlanır. `top` verilirse en çok CPU kullanan
+	süreçler `pid`/`name` etiketleriyle eklenir; `ui` grupları (`render`,
+	`pacer`) `osd_<grup>_<anahtar>` olarak yazılır."""
+	series: Dict[str, list] = {}
+
+	def add(name: str, value: Any, labels: str = "") -> None:
+		if value is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+			return
+		series.setdefault(name, []).append(f"{name}{labels} {float(value)!r}")
+
+	for key, value in metrics.items():
+		match = _GPU_INDEX.match(key)
+		if key.startswith("gpu_") and key != "gpu_count":
+			add("osd_" + _INVALID_NAME.sub("_", key), value, '{gpu="0"}')
+		elif match:
+			add("osd_gpu_" + _INVALID_NAME.sub("_", match.group(2)), value, f'{{gpu="{match.group(1)}"}}')
+		else:
+			add("osd_" + _INVALID_NAME.sub("_", key), value)
+
+	if fps:
+		add("osd_fps_avg", fps.get("avg_fps"))
+		add("osd_fps_low_1", fps.get("low_1_fps"))
+		add("osd_fps_low_01", fps.get("low_01_fps"))
+		add("osd_fps_window_frames", fps.get("frames"))
+		add("osd_fps_window_stutters", fps.get("stutters"))
+		add("osd_frame_time_std_ms", fps.get("frame_time_std_ms"))
+		for name, value in (fps.get("frame_time_ms") or {}).items():
+			add("osd_frame_time_ms", value, f'{{quantile="{float(name[1:]) / 100:g}"}}')
+		session = fps.get("session") or {}
+		add("osd_fps_session_avg", session.get("avg_fps"))
+		add("osd_fps_session_low_1", session.get("low_1_fps"))
+		add("osd_fps_session_low_01", session.get("low_01_fps"))
+		add("osd_fps_session_frames", session.get("frames"))
+		add("osd_fps_session_stutters", session.get("stutters"))
+		add("osd_frame_time_session_std_ms", session.get("frame_time_std_ms"))
+		add("osd_frame_time_session_max_ms", session.get("max_frame_ms"))
+		for name, value in (session.get("frame_time_ms") or {}).items():
+			add("osd_frame_time_session_ms", value, f'{{quantile="{float(name[1:]) / 100:g}"}}')
+
+	for row in top or ():
+		labels = f'{{pid="{row.get("pid")}",name="{_label_value(row.get("name", ""))}"}}'
+		add("osd_top_process_cpu_percent", row.get("cpu_percent"), labels)
+		add("osd_top_process_rss_mb", row.get("rss_mb"), labels)
+
+	for group, stats in (ui or {}).items():
+		for key, value in (stats or {}).items():
+			add(f"osd_{_INVALID_NAME.sub('_', group)}_{_INVALID_NAME.sub('_', key)}", value)
+
+	add("osd_snapshot_seq", seq)
+	add("osd_snapshot_timestamp_seconds", timestamp)
+	add("osd_sample_duration_seconds", duration_s)
+
+	lines = []
+	for name, samples in series.items():
+		lines.append(f"# TYPE {name} gauge")
+		lines.extend(samples)
+	return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+	"""Yerel metrik uç noktası: `/metrics` (Prometheus) ve `/metrics.json`.
+
+	Kendi thread'inde bir asyncio döngüsü çalıştırır. Yanıtlar örnekleyicinin
+	abonelik çağrısında (`publish`) bir kez hazırlanır ve tek referans
+	atamasıyla yayınlanır; scrape'ler sadece hazır baytları yazar, sensörlere
+	veya Tk thread'ine hiç dokunmaz. `max_connections` aşılırsa yeni
+	bağlantılara hemen 503 döner. `top_processes` verilirse (`process.topN`
+	> 0) en çok CPU kullanan süreçler, `ui_stats` verilirse overlay'in çizim
+	ve frame pacer istatistikleri de yayınlanır (Tk thread'inin hazırladığı
+	kopya okunur)."""
+
+	def __init__(self, host: str = "127.0.0.1", port: int = 9105, unix_path: Optional[str] = None,
+				 max_connections: int = 8, request_timeout: float = 2.0,
+				 fps_stats: Optional[Callable[[], Dict[str, Any]]] = None,
+				 top_processes: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+				 ui_stats: Optional[Callable[[], Optional[Dict[str, Dict[str, Any]]]]] = None) -> None:
+		self.host = host
+		self.port = port
+		self.unix_path = unix_path
+		self.max_connections = max(1, int(max_connections))
+		self.request_timeout = request_timeout
+		self.fps_stats = fps_stats
+		self.top_processes = top_processes
+		self.ui_stats = ui_stats
+		# (prometheus yanıtı, json yanıtı)
+		self._responses: Optional[Tuple[bytes, bytes]] = None
+		self._active = 0
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+		self._server: Optional[asyncio.AbstractServer] = None
+		self._thread: Optional[threading.Thread] = None
+		self._ready = threading.Event()
+		self.requests_served = 0
+		self.requests_rejected = 0
+		self.error: Optional[str] = None
+
+	def publish(self, snapshot: Any) -> None:
+		"""Snapshot'ı önceden serileştir (örnekleyici thread'inden çağrılır)."""
+		metrics = dict(snapshot.metrics)
+		fps = None
+		if self.fps_stats is not None:
+			try:
+				fps = self.fps_stats()
+			except Exception:
+				fps = None
+		top = None
+		if self.top_processes is not None:
+			try:
+				top = self.top_processes()
+			except Exception:
+				top = None
+		ui = None
+		if self.ui_stats is not None:
+			try:
+				ui = self.ui_stats()
+			except Exception:
+				ui = None
+		text = format_prometheus(metrics, fps, snapshot.seq, snapshot.timestamp, snapshot.duration_s, top, ui)
+		data = {
+			"seq": snapshot.seq,
+			"timestamp": snapshot.timestamp,
+			"duration_s": snapshot.duration_s,
+			"metrics": metrics,
+			"fps": fps,
+		}
+		if top is not None:
+			data["top_processes"] = top
+		if ui is not None:
+			data["ui"] = ui
+		payload = json.dumps(data, separators=(",", ":"))
+		self._responses = (
+			_http_response(text.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"),
+			_http_response(payload.encode("utf-8"), "application/json"),
+		)
+
+	def start(self) -> bool:
+		"""Sunucu thread'ini başlat; dinleme başarılıysa True döner."""
+		if self._thread is not None:
+			return self.error is None
+		self._thread = threading.Thread(target=self._run, name="metrics-server", daemon=True)
+		self._thread.start()
+		self._ready.wait(timeout=5)
+		return self.error is None
+
+	def stop(self) -> None:
+		loop = self._loop
+		if loop is not None and not loop.is_closed():
+			loop.call_soon_threadsafe(loop.stop)
+		if self._thread is not None:
+			self._thread.join(timeout=2)
+			self._thread = None
+
+	@property
+	def address(self) -> Any:
+		"""Dinlenen adres (port 0 verildiyse gerçek port dahil)."""
+		if self._server is None or not self._server.sockets:
+			return None
+		return self._server.sockets[0].getsockname()
+
+	def _run(self) -> None:
+		loop = asyncio.new_event_loop()
+		self._loop = loop
+		try:
+			if self.unix_path:
+				if os.path.exists(self.unix_path):
+					os.unlink(self.unix_path)
+				coro = asyncio.start_unix_server(self._handle, path=self.unix_path)
+			else:
+				coro = asyncio.start_server(self._handle, host=self.host, port=self.port)
+			self._server = loop.run_until_complete(coro)
+		except Exception as e:
+			self.error = str(e)
+			print(f"Metrik sunucusu başlatılamadı: {e}")
+			self._ready.set()
+			loop.close()
+			return
+
+		self._ready.set()
+		try:
+			loop.run_forever()
+		finally:
+			self._server.close()
+			loop.run_until_complete(self._server.wait_closed())
+			loop.close()
+			if self.unix_path and os.path.exists(self.unix_path):
+				try:
+					os.unlink(self.unix_path)
+				except Exception:
+					pass
+
+	async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		if self._active >= self.max_connections:
+			self.requests_rejected += 1
+			await self._reply(writer, _BUSY)
+			return
+
+		self._active += 1
+		try:
+			try:
+				# Tüm istek için tek süre sınırı (yavaş gönderen istemciler bağlantı tutamaz)
+				request_line = await asyncio.wait_for(self._read_request(reader), self.request_timeout)
+			except (asyncio.TimeoutError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+				await self._reply(writer, _BAD_REQUEST)
+				return
+
+			parts = request_line.split()
+			if len(parts) < 2 or parts[0] != b"GET":
+				await self._reply(writer, _BAD_REQUEST)
+				return
+
+			path = parts[1].split(b"?", 1)[0]
+			responses = self._responses
+			if path in (b"/metrics", b"/metrics.json", b"/"):
+				if responses is None:
+					response = _NO_DATA
+				else:
+					response = responses[1] if path == b"/metrics.json" else responses[0]
+				self.requests_served += 1
+			else:
+				response = _NOT_FOUND
+			await self._reply(writer, response)
+		finally:
+			self._active -= 1
+
+	async def _read_request(self, reader: asyncio.StreamReader) -> bytes:
+		request_line = await reader.readline()
+		# Başlıkları oku ve at (satır boyutu StreamReader limitiyle sınırlı)
+		while True:
+			line = await reader.readline()
+			if line in (b"\r\n", b"\n", b""):
+				break
+		return request_line
+
+	async def _reply(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+		try:
+			writer.write(data)
+			await asyncio.wait_for(writer.drain(), self.request_timeout)
+		except Exception:
+			pass
+		finally:
+			try:
+				writer.close()
+			except Exception:
+				pass
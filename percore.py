@@ -0,0 +1,179 @@
+import os
+import sys
+from array import array
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import psutil
+
+try:
+	import numpy as _np
+except ImportError:  # numpy opsiyonel: array ile ayni sonuc, biraz daha yavas
+	_np = None
+
+# Kaynak ciktisi: (duz sayac dizisi, satir basina sutun, ilk sayac sutunu, idle sutunlari, guest sutunlari)
+CoreTimes = Tuple[Sequence[float], int, int, Tuple[int, ...], Tuple[int, ...]]
+_Layout = Tuple[int, int, Tuple[int, ...], Tuple[int, ...]]
+
+
+def parse_proc_stat(data: bytes, use_numpy: bool = True) -> CoreTimes:
+	"""/proc/stat iceriginden cpuN satirlarini tek seferde duz bir sayi dizisine cevir.
+
+	Ilk sutun cekirdek numarasidir (kapali cekirdeklerin satiri yoktur)."""
+	start = data.index(b"\n") + 1  # toplam "cpu" satirini atla
+	end = data.find(b"\nintr", start)
+	if end < 0:
+		end = start
+		while data.startswith(b"cpu", end):
+			end = data.index(b"\n", end) + 1
+	block = data[start:end]
+
+	# cpuN user nice system idle iowait irq softirq steal [guest guest_nice]
+	line_end = block.find(b"\n")
+	columns = len(block[:line_end if line_end >= 0 else len(block)].split())
+	idle = (4, 5) if columns > 5 else (4,)
+	guest = tuple(c for c in (9, 10) if c < columns)
+
+	numbers = block.replace(b"cpu", b" ")
+	if use_numpy and _np is not None:
+		values: Any = _np.fromstring(numbers.decode("ascii"), dtype=_np.int64, sep=" ")
+	else:
+		values = array("q", map(int, numbers.split()))
+	return values, columns, 1, idle, guest
+
+
+class ProcStatCoreSource:
+	"""/proc/stat kaynagi; dosya acik tutulur ve her ornekte tek `os.pread` yapilir."""
+
+	def __init__(self, path: str = "/proc/stat", use_numpy: bool = True) -> None:
+		self._fd = os.open(path, os.O_RDONLY)
+		self._size = 1 << 16
+		self.use_numpy = use_numpy and _np is not None
+
+	def _read(self) -> bytes:
+		while True:
+			data = os.pread(self._fd, self._size, 0)
+			if len(data) < self._size:
+				return data
+			self._size *= 2
+
+	def __call__(self) -> CoreTimes:
+		return parse_proc_stat(self._read(), self.use_numpy)
+
+	def close(self) -> None:
+		try:
+			os.close(self._fd)
+		except OSError:
+			pass
+
+
+class PsutilCoreSource:
+	"""`psutil.cpu_times(percpu=True)` tabanli kaynak (tum platformlar)."""
+
+	def __init__(self) -> None:
+		self._layout: Optional[_Layout] = None
+
+	def __call__(self) -> CoreTimes:
+		cores = psutil.cpu_times(percpu=True)
+		if self._layout is None:
+			fields = cores[0]._fields
+			# psutil ile ayni hesap: toplamdan guest cikar, mesgul = toplam - idle - iowait
+			idle = tuple(i for i, name in enumerate(fields) if name in ("idle", "iowait"))
+			guest = tuple(i for i, name in enumerate(fields) if name in ("guest", "guest_nice"))
+			self._layout = (len(fields), 0, idle, guest)
+		values = array("d")
+		for core in cores:
+			values.extend(core)
+		return (values,) + self._layout
+
+	def close(self) -> None:
+		pass
+
+
+def default_core_source(use_numpy: bool = True) -> Callable[[], CoreTimes]:
+	if sys.platform.startswith("linux"):
+		try:
+			return ProcStatCoreSource(use_numpy=use_numpy)
+		except OSError:
+			pass
+	return PsutilCoreSource()
+
+
+class PerCoreCpu:
+	"""Cekirdek basina CPU kullanimi, tum cekirdekler icin tek vektorel delta.
+
+	Numpy varsa sayaclar (cekirdek x sutun) matrisine cevrilir; toplam ve
+	mesgul sureler tek bir agirlik matrisi carpimiyla, delta ve yuzdeler
+	birkac dizi islemiyle hesaplanir (cekirdek sayisindan bagimsiz sabit
+	sayida cagri). Numpy yoksa ayni hesap `array` ile dongude yapilir. Ilk
+	ornek referans noktasidir (0 dondurur)."""
+
+	def __init__(self, source: Optional[Callable[[], CoreTimes]] = None, use_numpy: Optional[bool] = None) -> None:
+		self.use_numpy = (_np is not None) if use_numpy is None else (use_numpy and _np is not None)
+		self.source = source if source is not None else default_core_source(self.use_numpy)
+		self._last: Any = None
+		self._weights: Any = None
+		self._weights_layout: Optional[_Layout] = None
+		self.core_count = 0
+
+	def _weights_for(self, layout: _Layout) -> Any:
+		# Sutun agirliklari: [:, 0] toplam (guest haric), [:, 1] mesgul (idle/iowait de haric)
+		if layout != self._weights_layout:
+			columns, first, idle, guest = layout
+			weights = _np.zeros((columns, 2))
+			weights[first:, :] = 1.0
+			weights[list(guest), :] = 0.0
+			weights[list(idle), 1] = 0.0
+			self._weights = weights
+			self._weights_layout = layout
+		return self._weights
+
+	def _sample_numpy(self, values: Any, columns: int, first: int, idle: Tuple[int, ...], guest: Tuple[int, ...]) -> List[float]:
+		matrix = _np.asarray(values, dtype=_np.float64).reshape(-1, columns)
+		times = matrix @ self._weights_for((columns, first, idle, guest))
+		last, self._last = self._last, times
+		count = len(times)
+		self.core_count = count
+		if last is None or len(last) != count:
+			return [0.0] * count
+		delta = times - last
+		percents = _np.divide(delta[:, 1], delta[:, 0], out=_np.zeros(count), where=delta[:, 0] > 0)
+		percents *= 100.0
+		_np.clip(percents, 0.0, 100.0, out=percents)
+		return _np.round(percents, 1, out=percents).tolist()
+
+	def _sample_array(self, values: Sequence[float], columns: int, first: int, idle: Tuple[int, ...], guest: Tuple[int, ...]) -> List[float]:
+		rows = len(values) // columns
+		total = array("d", bytes(8 * rows))
+		busy = array("d", bytes(8 * rows))
+		for row in range(rows):
+			base = row * columns
+			row_total = float(sum(values[base + first:base + columns]))
+			for column in guest:
+				row_total -= values[base + column]
+			row_busy = row_total
+			for column in idle:
+				row_busy -= values[base + column]
+			total[row] = row_total
+			busy[row] = row_busy
+
+		last, self._last = self._last, (total, busy)
+		self.core_count = rows
+		percents = [0.0] * rows
+		if last is not None and len(last[0]) == rows:
+			last_total, last_busy = last
+			for i in range(rows):
+				total_delta = total[i] - last_total[i]
+				if total_delta > 0:
+					percents[i] = round(min(100.0, max(0.0, (busy[i] - last_busy[i]) / total_delta * 100.0)), 1)
+		return percents
+
+	def sample(self) -> List[float]:
+		"""Cekirdek basina yuzde listesi (0-100, bir ondalik)."""
+		if self.use_numpy:
+			return self._sample_numpy(*self.source())
+		return self._sample_array(*self.source())
+
+	def close(self) -> None:
+		close = getattr(self.source, "close", None)
+		if close is not None:
+			close()
@@ -1,33 +1,56 @@
 import time
 import threading
-import queue
+import heapq
+import itertools
 import psutil
-from typing import Dict, Any, Optional, Callable
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, List, Tuple
 import gc
 
+from history import HistoryStore
+from tracing import NULL_TRACER, Tracer
+
 class PerformanceOptimizer:
 	"""Performans optimizasyonu ve akıllı yenileme sistemi."""
 
-	def __init__(self, target_fps: int = 2, max_history: int = 60):
+	def __init__(self, target_fps: int = 2, max_history: int = 60, history: Optional[HistoryStore] = None,
+				 base_refresh_ms: int = 500, cpu_budget_percent: float = 0.5, tracer: Tracer = NULL_TRACER):
 		self.target_fps = target_fps
+		self.tracer = tracer
 		self.max_history = max_history
-		self.frame_times = deque(maxlen=max_history)
-		self.cpu_usage_history = deque(maxlen=max_history)
+		self.history = history if history is not None else HistoryStore(max_history)
+		self.frame_times = self.history.series("optimizer.frame_time", max_history)
+		self.cpu_usage_history = self.history.series("optimizer.cpu", max_history)
+		self.self_cpu_history = self.history.series("optimizer.self_cpu", max_history)
 		self.last_frame_time = time.time()
 		
-		# Akıllı yenileme
+		# Akıllı yenileme: ayarlanan hız en hızlı sınırdır, bütçe aşılırsa yavaşlanır
 		self.adaptive_refresh = True
-		self.min_refresh_ms = 100
-		self.max_refresh_ms = 2000
-		self.current_refresh_ms = 500
+		self.base_refresh_ms = max(10, int(base_refresh_ms))
+		self.min_refresh_ms = self.base_refresh_ms
+		self.max_refresh_ms = max(2000, self.base_refresh_ms)
+		self.current_refresh_ms = float(self.base_refresh_ms)
+		
+		# Kendi CPU bütçesi (tek çekirdeğin yüzdesi) ve geri besleme ayarları
+		self.cpu_budget_percent = max(0.01, float(cpu_budget_percent))
+		self.controller_gain = 0.5  # log-oranın her adımda uygulanan kısmı
+		self.controller_deadband = 0.1  # bütçenin ±%10'u içinde hız değişmez
+		self.smoothing = 0.3  # EWMA katsayısı
+		self.min_measure_s = 0.5
+		self._process = psutil.Process()
+		self._frame_counter = 0
+		self._last_self_sample: Optional[Tuple[float, float, int]] = None
+		self._self_cpu_smoothed: Optional[float] = None
+		self._self_cpu_last: Optional[float] = None
 		
 		# Performans metrikleri
 		self.performance_metrics = {
 			"avg_frame_time": 0.0,
 			"fps": 0.0,
 			"cpu_usage": 0.0,
-			"memory_usage": 0.0
+			"memory_usage": 0.0,
+			"self_cpu_percent": 0.0,
+			"self_cpu_ms_per_frame": 0.0,
 		}
 		
 		# Optimizasyon ayarları
@@ -41,37 +64,45 @@ class PerformanceOptimizer:
 		
 		self.last_gc_time = time.time()
 
+		# Rapora eklenen ek istatistikler (ör. çizim ve frame pacer sayaçları)
+		self.report_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+		self._failed_report_sources: set = set()
+
+	def add_report_source(self, name: str, func: Callable[[], Dict[str, Any]]) -> None:
+		"""`get_performance_report()` içinde `name` anahtarıyla verilecek istatistik kaynağı ekle."""
+		self.report_sources[name] = func
+
 	def update_frame_time(self):
 		"""Frame süresini güncelle."""
 		current_time = time.time()
 		frame_time = current_time - self.last_frame_time
 		self.frame_times.append(frame_time)
 		self.last_frame_time = current_time
+		self._frame_counter += 1
 		
-		# Ortalama frame süresi
+		# Ortalama frame süresi (çalışan toplamdan, O(1))
 		if self.frame_times:
-			self.performance_metrics["avg_frame_time"] = sum(self.frame_times) / len(self.frame_times)
+			self.performance_metrics["avg_frame_time"] = self.frame_times.mean()
 			self.performance_metrics["fps"] = 1.0 / self.performance_metrics["avg_frame_time"] if self.performance_metrics["avg_frame_time"] > 0 else 0
 
-	def update_cpu_usage(self):
-		"""CPU kullanımını güncelle."""
+	def update_cpu_usage(self, cpu_percent: Optional[float] = None):
+		"""CPU kullanımını güncelle (toplayıcının değeri verilirse psutil tekrar çağrılmaz)."""
 		try:
-			cpu_percent = psutil.cpu_percent(interval=None)
+			if cpu_percent is None:
+				cpu_percent = psutil.cpu_percent(interval=None)
 			self.cpu_usage_history.append(cpu_percent)
 			self.performance_metrics["cpu_usage"] = cpu_percent
 			
 			# Ortalama CPU kullanımı
 			if self.cpu_usage_history:
-				avg_cpu = sum(self.cpu_usage_history) / len(self.cpu_usage_history)
-				self.performance_metrics["avg_cpu_usage"] = avg_cpu
+				self.performance_metrics["avg_cpu_usage"] = self.cpu_usage_history.mean()
 		except:
 			pass
 
 	def update_memory_usage(self):
 		"""Bellek kullanımını güncelle."""
 		try:
-			process = psutil.Process()
-			memory_info = process.memory_info()
+			memory_info = self._process.memory_info()
 			self.performance_metrics["memory_usage"] = memory_info.rss
 		except:
 			pass
@@ -86,6 +117,11 @@ class PerformanceOptimizer:
 		if self.performance_metrics["memory_usage"] > self.optimization_settings["memory_threshold"]:
 			return True
 		
+		# Overlay kendi CPU bütçesini aşıyorsa
+		smoothed = self._self_cpu_smoothed
+		if smoothed is not None and smoothed > self.cpu_budget_percent * (1.0 + self.controller_deadband):
+			return True
+		
 		# FPS düşükse
 		if self.performance_metrics["fps"] < self.target_fps * 0.8:
 			return True
@@ -105,40 +141,112 @@ class PerformanceOptimizer:
 		if self.optimization_settings["adaptive_refresh"]:
 			self._adjust_refresh_rate()
 
+	def update_self_cpu(self) -> Optional[float]:
+		"""Overlay sürecinin kendi CPU süresini ölç (tek çekirdeğin yüzdesi, EWMA ile yumuşatılmış).
+
+		Ölçüm penceresi kısaysa (min_measure_s) önceki değer korunur."""
+		now = time.monotonic()
+		try:
+			times = self._process.cpu_times()
+		except Exception:
+			return self._self_cpu_smoothed
+		cpu_s = times.user + times.system
+		frames = self._frame_counter
+
+		last = self._last_self_sample
+		if last is not None:
+			dt = now - last[0]
+			if dt < self.min_measure_s:
+				return self._self_cpu_smoothed
+			used = max(0.0, cpu_s - last[1])
+			percent = used / dt * 100.0
+			self.self_cpu_history.append(percent)
+			self._self_cpu_last = percent
+			if self._self_cpu_smoothed is None:
+				self._self_cpu_smoothed = percent
+			else:
+				self._self_cpu_smoothed += self.smoothing * (percent - self._self_cpu_smoothed)
+			self.performance_metrics["self_cpu_percent"] = self._self_cpu_smoothed
+			if frames > last[2]:
+				self.performance_metrics["self_cpu_ms_per_frame"] = used / (frames - last[2]) * 1000.0
+		self._last_self_sample = (now, cpu_s, frames)
+		return self._self_cpu_smoothed
+
 	def _adjust_refresh_rate(self):
-		"""Yenileme hızını akıllıca ayarla."""
-		avg_cpu = self.performance_metrics.get("avg_cpu_usage", 0)
-		current_fps = self.performance_metrics["fps"]
-		
-		# CPU yüksekse yenileme hızını azalt
-		if avg_cpu > 70:
-			self.current_refresh_ms = min(self.max_refresh_ms, self.current_refresh_ms * 1.2)
-		# CPU düşükse yenileme hızını artır
-		elif avg_cpu < 30 and current_fps < self.target_fps:
-			self.current_refresh_ms = max(self.min_refresh_ms, self.current_refresh_ms * 0.9)
+		"""Yenileme hızını kendi CPU bütçesine göre ayarla.
+
+		Maliyet yaklaşık olarak hızla orantılıdır: son penceredeki ölçüm bütçeyi
+		tutturacak aralığı verir. Aralık bu hedefe log ölçekte `controller_gain`
+		oranında yaklaşır (sabit çarpanlar yerine yumuşak geri besleme)."""
+		if self.update_self_cpu() is None or self._self_cpu_last is None:
+			return
+
+		ratio = self._self_cpu_last / self.cpu_budget_percent
+		if abs(ratio - 1.0) > self.controller_deadband:
+			step = max(0.5, min(2.0, max(ratio, 1e-3) ** self.controller_gain))
+			self.current_refresh_ms *= step
 		
 		# Sınırları kontrol et
 		self.current_refresh_ms = max(self.min_refresh_ms, min(self.max_refresh_ms, self.current_refresh_ms))
 
+	def set_base_refresh(self, refresh_ms: int) -> None:
+		"""Ayarlanan yenileme hızını değiştir; mevcut yavaşlama oranı korunur."""
+		scale = self.get_rate_scale()
+		self.base_refresh_ms = max(10, int(refresh_ms))
+		self.min_refresh_ms = self.base_refresh_ms
+		self.max_refresh_ms = max(2000, self.base_refresh_ms)
+		self.target_fps = max(1, round(1000 / self.base_refresh_ms))
+		self.current_refresh_ms = max(self.min_refresh_ms, min(self.max_refresh_ms, self.base_refresh_ms * scale))
+
+	def get_rate_scale(self) -> float:
+		"""Ayarlanan hıza göre yavaşlama katsayısı (örnekleme aralığına da uygulanır)."""
+		return self.current_refresh_ms / self.base_refresh_ms
+
+	def get_budget_status(self) -> Dict[str, Any]:
+		"""Kendi CPU kullanımının bütçeye uzaklığı (pozitif = bütçe aşıldı)."""
+		smoothed = self._self_cpu_smoothed
+		return {
+			"self_cpu_percent": smoothed,
+			"budget_percent": self.cpu_budget_percent,
+			"over_budget_percent": None if smoothed is None else smoothed - self.cpu_budget_percent,
+			"budget_ratio": None if smoothed is None else smoothed / self.cpu_budget_percent,
+			"cpu_ms_per_frame": self.performance_metrics["self_cpu_ms_per_frame"],
+			"rate_scale": self.get_rate_scale(),
+		}
+
 	def get_optimal_refresh_rate(self) -> int:
 		"""Optimal yenileme hızını döndür."""
 		return int(self.current_refresh_ms)
 
 	def get_performance_report(self) -> Dict[str, Any]:
 		"""Performans raporu döndür."""
-		return {
+		report = {
 			"metrics": self.performance_metrics.copy(),
 			"refresh_rate": self.current_refresh_ms,
 			"optimization_active": self.should_optimize(),
 			"frame_count": len(self.frame_times),
-			"avg_cpu": sum(self.cpu_usage_history) / len(self.cpu_usage_history) if self.cpu_usage_history else 0
+			"avg_cpu": self.cpu_usage_history.mean(),
+			"budget": self.get_budget_status(),
+			"stages": self.tracer.stats((50, 99)),
 		}
+		for name, func in self.report_sources.items():
+			try:
+				report[name] = func()
+			except Exception as e:
+				if name not in self._failed_report_sources:
+					self._failed_report_sources.add(name)
+					print(f"Rapor kaynağı hatası ({name}): {e}")
+		return report
 
 	def reset_metrics(self):
 		"""Metrikleri sıfırla."""
 		self.frame_times.clear()
 		self.cpu_usage_history.clear()
-		self.current_refresh_ms = 500
+		self.self_cpu_history.clear()
+		self.current_refresh_ms = float(self.base_refresh_ms)
+		self._last_self_sample = None
+		self._self_cpu_smoothed = None
+		self._self_cpu_last = None
 		self.last_gc_time = time.time()
 
 class SmartMetricsCollector:
@@ -166,7 +274,7 @@ class SmartMetricsCollector:
 			self.last_collection_time = current_time
 			
 			# Performans metriklerini güncelle
-			self.optimizer.update_cpu_usage()
+			self.optimizer.update_cpu_usage(metrics.get("cpu_percent"))
 			self.optimizer.update_memory_usage()
 			
 			return metrics
@@ -175,55 +283,185 @@ class SmartMetricsCollector:
 			return self.cached_metrics
 
 class BackgroundTaskManager:
-	"""Arka plan görev yöneticisi."""
+	"""Arka plan görev yöneticisi.
+
+	Görevler bir min-heap'te bir sonraki çalışma zamanına göre tutulur;
+	zamanlayıcı thread'i tam olarak en yakın zamana kadar uyur ve görevleri
+	küçük bir worker havuzuna dağıtır. Aynı görev üst üste çalışmaz.
+
+	Zaman aşımı thread'i durduramaz (Python'da zorla sonlandırma yok): aşım
+	sayılır ve loglanır, görev bitene kadar yeniden çalıştırılmaz ve takılan
+	worker'ın yerine yeni bir havuz açılır; diğer görevler tam kapasiteyle
+	çalışmaya devam eder."""
 
-	def __init__(self):
-		self.tasks = {}
-		self.task_queue = queue.Queue()
+	def __init__(self, max_workers: int = 2, default_timeout: Optional[float] = None, tracer: Tracer = NULL_TRACER):
+		self.tracer = tracer
+		self.tasks: Dict[str, Dict[str, Any]] = {}
+		self.max_workers = max(1, max_workers)
+		self.default_timeout = default_timeout
 		self.worker_thread = None
 		self.running = False
+		self._heap: List[Tuple[float, int, str, int, str, int]] = []
+		self._cond = threading.Condition()
+		self._pool: Optional[ThreadPoolExecutor] = None
+		self._counter = itertools.count()
 
 	def start(self):
 		"""Arka plan işleyicisini başlat."""
-		if not self.running:
+		with self._cond:
+			if self.running:
+				return
 			self.running = True
-			self.worker_thread = threading.Thread(target=self._worker, daemon=True)
-			self.worker_thread.start()
+			self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bg-task")
+		self.worker_thread = threading.Thread(target=self._worker, name="bg-scheduler", daemon=True)
+		self.worker_thread.start()
 
 	def stop(self):
 		"""Arka plan işleyicisini durdur."""
-		self.running = False
+		with self._cond:
+			self.running = False
+			self._cond.notify_all()
 		if self.worker_thread:
 			self.worker_thread.join(timeout=1)
+		if self._pool is not None:
+			self._pool.shutdown(wait=False, cancel_futures=True)
+			self._pool = None
 
-	def add_task(self, task_id: str, task_func: Callable, interval: float = 1.0):
-		"""Arka plan görevi ekle."""
-		self.tasks[task_id] = {
-			"func": task_func,
-			"interval": interval,
-			"last_run": 0
-		}
+	def add_task(self, task_id: str, task_func: Callable, interval: float = 1.0, timeout: Optional[float] = None,
+				 once: bool = False):
+		"""Arka plan görevi ekle (ilk çalışma hemen planlanır; `once` ise bitince kaldırılır)."""
+		with self._cond:
+			previous = self.tasks.get(task_id)
+			self.tasks[task_id] = {
+				"func": task_func,
+				"interval": max(0.001, float(interval)),
+				"timeout": timeout if timeout is not None else self.default_timeout,
+				"once": once,
+				"generation": next(self._counter),
+				"last_run": 0,
+				"running": bool(previous and previous["running"]),
+				"run_id": previous["run_id"] if previous else 0,
+				"future": previous["future"] if previous else None,
+				"stats": previous["stats"] if previous else {
+					"run_count": 0,
+					"error_count": 0,
+					"timeout_count": 0,
+					"skipped_overlap": 0,
+					"last_duration": 0.0,
+					"max_duration": 0.0,
+					"last_lag": 0.0,
+					"max_lag": 0.0,
+				},
+			}
+			self._schedule(task_id, "run", time.monotonic())
 
 	def remove_task(self, task_id: str):
-		"""Arka plan görevini kaldır."""
-		if task_id in self.tasks:
-			del self.tasks[task_id]
+		"""Arka plan görevini kaldır (heap'teki kayıtlar tembel olarak atılır)."""
+		with self._cond:
+			self.tasks.pop(task_id, None)
+			self._cond.notify_all()
+
+	def get_stats(self) -> Dict[str, Dict[str, Any]]:
+		"""Görev başına çalışma sayısı, son süre ve gecikme istatistikleri."""
+		with self._cond:
+			return {
+				task_id: {**info["stats"], "interval": info["interval"], "running": info["running"]}
+				for task_id, info in self.tasks.items()
+			}
+
+	def _schedule(self, task_id: str, kind: str, deadline: float) -> None:
+		# Kilit altında çağrılmalı
+		info = self.tasks[task_id]
+		entry = (deadline, next(self._counter), task_id, info["generation"], kind, info["run_id"])
+		heapq.heappush(self._heap, entry)
+		if self._heap[0] is entry:
+			self._cond.notify_all()
 
 	def _worker(self):
-		"""Arka plan işleyici."""
-		while self.running:
-			try:
-				current_time = time.time()
-				
-				for task_id, task_info in self.tasks.items():
-					if current_time - task_info["last_run"] >= task_info["interval"]:
-						try:
-							task_info["func"]()
-							task_info["last_run"] = current_time
-						except Exception as e:
-							print(f"Arka plan görev hatası ({task_id}): {e}")
-				
-				time.sleep(0.1)  # 100ms bekle
-			except Exception as e:
-				print(f"Arka plan işleyici hatası: {e}")
-				time.sleep(1)
+		"""Zamanlayıcı: en yakın son tarihe kadar uyu, sonra görevi havuza gönder."""
+		with self._cond:
+			while self.running:
+				if not self._heap:
+					self._cond.wait()
+					continue
+
+				deadline, _, task_id, generation, kind, run_id = self._heap[0]
+				now = time.monotonic()
+				if deadline > now:
+					self._cond.wait(deadline - now)
+					continue
+
+				heapq.heappop(self._heap)
+				info = self.tasks.get(task_id)
+				if info is None or info["generation"] != generation:
+					continue  # kaldırılmış veya yeniden eklenmiş görev
+
+				if kind == "timeout":
+					# Thread'ler zorla durdurulamaz: aşımı say, görev bitene kadar yeniden başlatma
+					if info["running"] and info["run_id"] == run_id:
+						info["stats"]["timeout_count"] += 1
+						print(f"Arka plan görevi zaman aşımı ({task_id}): {info['timeout']:.1f}s, worker değiştiriliyor")
+						self._replace_pool()
+					continue
+
+				# Sonraki çalışmayı sabit aralıkla planla, kaçırılanları biriktirme
+				if not info["once"]:
+					next_deadline = deadline + info["interval"]
+					if next_deadline <= now:
+						next_deadline = now + info["interval"]
+					self._schedule(task_id, "run", next_deadline)
+
+				if info["running"]:
+					info["stats"]["skipped_overlap"] += 1
+					if info["once"]:
+						# Tek seferlik görev kaybolmasın: önceki çalışma bitince dene
+						self._schedule(task_id, "run", now + info["interval"])
+					continue
+
+				info["running"] = True
+				info["run_id"] += 1
+				info["stats"]["last_lag"] = now - deadline
+				info["stats"]["max_lag"] = max(info["stats"]["max_lag"], now - deadline)
+				if info["timeout"]:
+					self._schedule(task_id, "timeout", now + info["timeout"])
+				try:
+					info["future"] = self._pool.submit(self._run_task, task_id, info, info["run_id"])
+				except RuntimeError:
+					info["running"] = False
+
+	def _replace_pool(self) -> None:
+		# Kilit altında çağrılmalı; takılan thread eski havuzda biter, yeni işler yeni havuza gider
+		old_pool = self._pool
+		self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bg-task")
+		if old_pool is not None:
+			old_pool.shutdown(wait=False, cancel_futures=True)
+		# Eski havuzda sırada bekleyip iptal edilenler bir sonraki zamanda yeni havuzda çalışır
+		for info in self.tasks.values():
+			future = info["future"]
+			if future is not None and future.cancelled():
+				info["running"] = False
+				info["future"] = None
+
+	def _run_task(self, task_id: str, info: Dict[str, Any], run_id: int):
+		start = time.monotonic()
+		try:
+			with self.tracer.span(f"task.{task_id}"):
+				info["func"]()
+			info["last_run"] = time.time()
+		except Exception as e:
+			info["stats"]["error_count"] += 1
+			print(f"Arka plan görev hatası ({task_id}): {e}")
+		finally:
+			duration = time.monotonic() - start
+			with self._cond:
+				stats = info["stats"]
+				stats["run_count"] += 1
+				stats["last_duration"] = duration
+				stats["max_duration"] = max(stats["max_duration"], duration)
+				info["running"] = False
+				# Çalışırken yeniden eklendiyse yeni kayıt bu çalışmanın durumunu taşır
+				current = self.tasks.get(task_id)
+				if current is not None and current is not info and current["run_id"] == run_id:
+					current["running"] = False
+				elif current is info and info["once"]:
+					self.tasks.pop(task_id, None)
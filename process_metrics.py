@@ -0,0 +1,184 @@
+import os
+import time
+import psutil
+from typing import Any, Callable, Dict, List, Optional, Set
+
+_MB = 1024 ** 2
+
+PROCESS_KEYS = (
+	"proc_cpu_percent",
+	"proc_rss_mb",
+	"proc_threads",
+	"proc_io_read_mbps",
+	"proc_io_write_mbps",
+)
+
+
+class ProcessTracker:
+	"""Takip edilen oyun sureci icin CPU, RSS, thread ve I/O hizlari.
+
+	`psutil.Process` handle'lari kalici tutulur ve her okuma `oneshot()`
+	icinde yapilir. PID tablosu her turda `process_iter()` ile yeniden
+	taranmaz: `psutil.pids()` farkindan sadece yeni PID'ler incelenir.
+	Opsiyonel top-N tablosu her turda sabit sayida handle gunceller, boylece
+	ornekleme maliyeti sistemdeki surec sayisiyla buyumez."""
+
+	def __init__(self, process_name: str = "", top_n: int = 0, batch_size: int = 16,
+				 pid_refresh_s: float = 2.0, clock: Callable[[], float] = time.monotonic) -> None:
+		self.process_name = process_name.lower()
+		self.top_n = max(0, int(top_n))
+		self.batch_size = max(1, int(batch_size))
+		self.pid_refresh_s = pid_refresh_s
+		self.clock = clock
+		self.cpu_count = psutil.cpu_count() or 1
+
+		self._tracked: Optional[psutil.Process] = None
+		self._last_io: Optional[tuple] = None  # (zaman, read_bytes, write_bytes)
+		self._handles: Dict[int, psutil.Process] = {}
+		self._names: Dict[int, str] = {}
+		self._known_pids: Set[int] = set()
+		self._last_pid_refresh = -1e9
+		self._rr_pids: List[int] = []
+		self._rr_pos = 0
+		self._table: Dict[int, Dict[str, Any]] = {}
+
+	def _refresh_pid_table(self, now: float) -> None:
+		"""Sadece yeni/kaybolan PID'leri isle."""
+		if now - self._last_pid_refresh < self.pid_refresh_s:
+			return
+		self._last_pid_refresh = now
+		try:
+			pids = set(psutil.pids())
+		except Exception:
+			return
+
+		for pid in self._known_pids - pids:
+			self._handles.pop(pid, None)
+			self._names.pop(pid, None)
+			self._table.pop(pid, None)
+
+		for pid in pids - self._known_pids:
+			try:
+				proc = psutil.Process(pid)
+				name = proc.name()
+			except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+				continue
+			self._names[pid] = name
+			if self.top_n:
+				self._handles[pid] = proc
+				proc.cpu_percent(None)  # ilk okuma referans noktasi
+			if self._tracked is None and self.process_name and name.lower() == self.process_name:
+				self._set_tracked(proc)
+
+		self._known_pids = pids
+		self._rr_pids = list(self._handles.keys())
+		self._rr_pos = 0
+
+	def _set_tracked(self, proc: psutil.Process) -> None:
+		self._tracked = proc
+		self._last_io = None
+		try:
+			proc.cpu_percent(None)
+		except Exception:
+			pass
+
+	def _find_tracked(self) -> None:
+		"""Takip edilen surec oldugunde bilinen isimler arasinda yeniden ara."""
+		for pid, name in self._names.items():
+			if name.lower() == self.process_name:
+				try:
+					self._set_tracked(psutil.Process(pid))
+					return
+				except (psutil.NoSuchProcess, psutil.AccessDenied):
+					continue
+
+	def set_target(self, process_name: str) -> None:
+		"""Takip edilen sureci degistir (bilinen PID tablosundan hemen aranir)."""
+		self.process_name = process_name.lower()
+		self._tracked = None
+		self._last_io = None
+		if self.process_name:
+			self._find_tracked()
+
+	def _sample_tracked(self, now: float) -> Dict[str, Optional[float]]:
+		proc = self._tracked
+		if proc is None:
+			return {key: None for key in PROCESS_KEYS}
+		try:
+			with proc.oneshot():
+				cpu = proc.cpu_percent(None) / self.cpu_count
+				rss = proc.memory_info().rss
+				threads = proc.num_threads()
+				try:
+					io = proc.io_counters()
+					io_bytes = (io.read_bytes, io.write_bytes)
+				except (AttributeError, psutil.AccessDenied):
+					io_bytes = None
+		except (psutil.NoSuchProcess, psutil.ZombieProcess):
+			self._tracked = None
+			self._find_tracked()
+			return {key: None for key in PROCESS_KEYS}
+		except psutil.AccessDenied:
+			return {key: None for key in PROCESS_KEYS}
+
+		read_rate = write_rate = None
+		if io_bytes is not None:
+			if self._last_io is not None and now > self._last_io[0]:
+				dt = now - self._last_io[0]
+				read_rate = max(0.0, (io_bytes[0] - self._last_io[1]) / dt / _MB)
+				write_rate = max(0.0, (io_bytes[1] - self._last_io[2]) / dt / _MB)
+			self._last_io = (now, io_bytes[0], io_bytes[1])
+
+		return {
+			"proc_cpu_percent": round(cpu, 1),
+			"proc_rss_mb": round(rss / _MB, 1),
+			"proc_threads": float(threads),
+			"proc_io_read_mbps": None if read_rate is None else round(read_rate, 2),
+			"proc_io_write_mbps": None if write_rate is None else round(write_rate, 2),
+		}
+
+	def _update_top_batch(self) -> None:
+		"""Top-N tablosu icin sirayla sabit sayida handle guncelle."""
+		pids = self._rr_pids
+		if not pids:
+			return
+		for _ in range(min(self.batch_size, len(pids))):
+			if self._rr_pos >= len(pids):
+				self._rr_pos = 0
+			pid = pids[self._rr_pos]
+			self._rr_pos += 1
+			proc = self._handles.get(pid)
+			if proc is None:
+				continue
+			try:
+				with proc.oneshot():
+					self._table[pid] = {
+						"pid": pid,
+						"name": self._names.get(pid, ""),
+						"cpu_percent": proc.cpu_percent(None) / self.cpu_count,
+						"rss_mb": proc.memory_info().rss / _MB,
+					}
+			except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+				self._table.pop(pid, None)
+
+	def sample(self) -> Dict[str, Optional[float]]:
+		"""Takip edilen surecin metriklerini dondur (bulunamazsa None)."""
+		if not self.process_name and not self.top_n:
+			return {key: None for key in PROCESS_KEYS}
+		now = self.clock()
+		self._refresh_pid_table(now)
+		if self.top_n:
+			self._update_top_batch()
+		return self._sample_tracked(now)
+
+	@property
+	def tracked_pid(self) -> Optional[int]:
+		return self._tracked.pid if self._tracked is not None else None
+
+	def top_processes(self, key: str = "cpu_percent") -> List[Dict[str, Any]]:
+		"""En cok CPU (veya `key`) kullanan ilk N sureci dondur."""
+		if not self.top_n:
+			return []
+		rows = [row for pid, row in list(self._table.items()) if pid != os.getpid()]
+		rows.sort(key=lambda row: row.get(key, 0.0), reverse=True)
+		return rows[:self.top_n]
@@ -0,0 +1,368 @@
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from fps_presentmon import PresentMonReader
+
+MAGIC = b"OSDREC1\0"
+FOOTER_MAGIC = b"OSDIDX1\0"
+FORMAT_VERSION = 2
+# Surum 1 dosyalarinda sema parcasi yoktur; ayni okuyucuyla acilir
+_READABLE_VERSIONS = (1, 2)
+
+KIND_METRICS = 1
+KIND_FRAMES = 2
+# Yeni alanlar gelince yazilir: sonraki metrik parcalarinin tam alan listesi (JSON)
+KIND_SCHEMA = 3
+
+# kind, kayit sayisi, ham boyut, sikistirilmis boyut, ilk/son zaman damgasi
+_CHUNK_HEADER = struct.Struct("<BIIIdd")
+# offset, kind, kayit sayisi, ilk/son zaman damgasi
+_INDEX_ENTRY = struct.Struct("<QBIdd")
+# index offset, index kayit sayisi, magic
+_FOOTER = struct.Struct("<QI8s")
+_HEADER_PREFIX = struct.Struct("<8sHI")
+
+_NATIVE_LE = sys.byteorder == "little"
+
+
+def _pack_columns(columns: Sequence[array]) -> bytes:
+	"""Sutunlari (little-endian) art arda paketle; sutunlu duzen daha iyi sikisir."""
+	parts = []
+	for col in columns:
+		if not _NATIVE_LE:
+			col = array(col.typecode, col)
+			col.byteswap()
+		parts.append(col.tobytes())
+	return b"".join(parts)
+
+
+def _unpack_columns(raw: bytes, count: int, typecodes: Sequence[str]) -> List[array]:
+	columns = []
+	offset = 0
+	for code in typecodes:
+		col = array(code)
+		size = col.itemsize * count
+		col.frombytes(raw[offset:offset + size])
+		if not _NATIVE_LE:
+			col.byteswap()
+		columns.append(col)
+		offset += size
+	return columns
+
+
+class SessionRecorder:
+	"""Metrik snapshot'larini ve PresentMon frame-time'larini kaydeder.
+
+	Kayitlar sabit genislikli (zaman damgasi float64 + alan basina float32,
+	None -> NaN) olarak parcalar halinde biriktirilir; her parca sutunlu
+	paketlenip zlib ile sikistirilir. Dosya sonunda aranabilir bir parca
+	indeksi bulunur.
+
+	`fields` baslangic semasidir (genelde toplayicinin bildirdigi alanlar);
+	sonradan gelen sayisal anahtarlar (gec yuklenen eklentiler, ek GPU'lar)
+	acik parca yazilip bir sema parcasi eklenerek sona eklenir."""
+
+	def __init__(self, path: str, fields: Optional[Sequence[str]] = None,
+				 chunk_records: int = 4096, compress_level: int = 6) -> None:
+		self.path = path
+		self.fields: Optional[List[str]] = list(fields) if fields is not None else None
+		self.chunk_records = max(16, int(chunk_records))
+		self.compress_level = compress_level
+		self._file = None
+		self._index: List[Tuple[int, int, int, float, float]] = []
+		self._metric_cols: List[array] = []
+		self._frame_cols: List[array] = [array("d"), array("f")]
+		self._known = set(self.fields or ())
+		self._lock = threading.Lock()
+		self.closed = False
+		if self.fields is not None:
+			self._open()
+
+	def _open(self) -> None:
+		header = json.dumps({"fields": self.fields, "created": time.time()}).encode("utf-8")
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+		self._file = open(self.path, "wb")
+		self._file.write(_HEADER_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+		self._file.write(header)
+		self._metric_cols = [array("d")] + [array("f") for _ in self.fields]
+
+	def record_metrics(self, timestamp: float, metrics: Mapping[str, Any]) -> None:
+		"""Tek bir snapshot ekle. Alan listesi verilmediyse ilk snapshot belirler."""
+		with self._lock:
+			if self.closed:
+				return
+			if self._file is None:
+				self.fields = sorted(k for k, v in metrics.items() if v is None or isinstance(v, (int, float)))
+				self._known = set(self.fields)
+				self._open()
+			else:
+				added = [k for k, v in metrics.items() if k not in self._known and (v is None or isinstance(v, (int, float)))]
+				if added:
+					self._extend_fields(sorted(added), timestamp)
+			cols = self._metric_cols
+			cols[0].append(timestamp)
+			for col, name in zip(cols[1:], self.fields):
+				value = metrics.get(name)
+				# Eklentiler sayi yerine metin ("N/A") verebilir: kayitta deger yok sayilir
+				if isinstance(value, (int, float)) and not isinstance(value, bool):
+					col.append(float(value))
+				else:
+					col.append(math.nan)
+			if len(cols[0]) >= self.chunk_records:
+				self._flush_metrics()
+
+	def record_snapshot(self, snapshot: Any) -> None:
+		"""`SamplingEngine.subscribe` ile kullanilabilen geri cagirim."""
+		self.record_metrics(snapshot.timestamp, snapshot.metrics)
+
+	def record_frame(self, frame_ms: float, timestamp: Optional[float] = None) -> None:
+		"""PresentMon'dan gelen tek bir frame-time ekle."""
+		with self._lock:
+			if self.closed:
+				return
+			self._frame_cols[0].append(time.time() if timestamp is None else timestamp)
+			self._frame_cols[1].append(frame_ms)
+			if len(self._frame_cols[0]) >= self.chunk_records and self._file is not None:
+				self._flush_frames()
+
+	def _write_chunk(self, kind: int, columns: List[array]) -> None:
+		count = len(columns[0])
+		if not count:
+			return
+		raw = _pack_columns(columns)
+		data = zlib.compress(raw, self.compress_level)
+		offset = self._file.tell()
+		t_first, t_last = columns[0][0], columns[0][-1]
+		self._file.write(_CHUNK_HEADER.pack(kind, count, len(raw), len(data), t_first, t_last))
+		self._file.write(data)
+		self._index.append((offset, kind, count, t_first, t_last))
+
+	def _extend_fields(self, added: List[str], timestamp: float) -> None:
+		# Eski semadaki parcayi kapat; sonraki parcalar yeni listeyle okunur
+		self._flush_metrics()
+		self.fields = self.fields + added
+		self._known.update(added)
+		raw = json.dumps(self.fields).encode("utf-8")
+		data = zlib.compress(raw, self.compress_level)
+		offset = self._file.tell()
+		self._file.write(_CHUNK_HEADER.pack(KIND_SCHEMA, len(self.fields), len(raw), len(data), timestamp, timestamp))
+		self._file.write(data)
+		self._index.append((offset, KIND_SCHEMA, len(self.fields), timestamp, timestamp))
+		self._metric_cols = [array("d")] + [array("f") for _ in self.fields]
+
+	def _flush_metrics(self) -> None:
+		self._write_chunk(KIND_METRICS, self._metric_cols)
+		self._metric_cols = [array("d")] + [array("f") for _ in self.fields]
+
+	def _flush_frames(self) -> None:
+		self._write_chunk(KIND_FRAMES, self._frame_cols)
+		self._frame_cols = [array("d"), array("f")]
+
+	def close(self) -> None:
+		"""Kalan parcalari yaz, indeksi ve footer'i ekle."""
+		with self._lock:
+			if self.closed:
+				return
+			self.closed = True
+			if self._file is None:
+				if not self._frame_cols[0]:
+					return
+				self.fields = []
+				self._open()
+			self._flush_metrics()
+			self._flush_frames()
+			index_offset = self._file.tell()
+			for entry in self._index:
+				self._file.write(_INDEX_ENTRY.pack(*entry))
+			self._file.write(_FOOTER.pack(index_offset, len(self._index), FOOTER_MAGIC))
+			self._file.close()
+
+
+class SessionReader:
+	"""Kayit dosyasini `mmap` ile acar; parcalar sadece istendiginde acilir."""
+
+	def __init__(self, path: str) -> None:
+		self.path = path
+		self._fh = open(path, "rb")
+		self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+		magic, version, header_len = _HEADER_PREFIX.unpack_from(self._mm, 0)
+		if magic != MAGIC or version not in _READABLE_VERSIONS:
+			raise ValueError(f"Gecersiz kayit dosyasi: {path}")
+		header = json.loads(self._mm[_HEADER_PREFIX.size:_HEADER_PREFIX.size + header_len].decode("utf-8"))
+		fields: List[str] = header.get("fields", [])
+		self.created: float = header.get("created", 0.0)
+
+		index_offset, index_count, footer_magic = _FOOTER.unpack_from(self._mm, len(self._mm) - _FOOTER.size)
+		if footer_magic != FOOTER_MAGIC:
+			raise ValueError(f"Kayit dosyasi kapatilmamis (indeks yok): {path}")
+		self.index = [
+			_INDEX_ENTRY.unpack_from(self._mm, index_offset + i * _INDEX_ENTRY.size)
+			for i in range(index_count)
+		]
+		self._frame_chunks = [e for e in self.index if e[1] == KIND_FRAMES]
+		# Her metrik parcasi kendinden onceki son semayla yazilmistir
+		self._metric_chunks = []
+		self._chunk_fields: List[List[str]] = []
+		for entry in self.index:
+			if entry[1] == KIND_SCHEMA:
+				fields = json.loads(self._read_raw(entry).decode("utf-8"))
+			elif entry[1] == KIND_METRICS:
+				self._metric_chunks.append(entry)
+				self._chunk_fields.append(fields)
+		# Kayit boyunca gorulen tum alanlar (son sema)
+		self.fields: List[str] = fields
+
+	def close(self) -> None:
+		self._mm.close()
+		self._fh.close()
+
+	@property
+	def metric_count(self) -> int:
+		return sum(e[2] for e in self._metric_chunks)
+
+	@property
+	def frame_count(self) -> int:
+		return sum(e[2] for e in self._frame_chunks)
+
+	@property
+	def time_range(self) -> Tuple[float, float]:
+		if not self.index:
+			return (0.0, 0.0)
+		return (min(e[3] for e in self.index), max(e[4] for e in self.index))
+
+	def _read_raw(self, entry: Tuple[int, int, int, float, float]) -> bytes:
+		offset = entry[0]
+		comp_len = _CHUNK_HEADER.unpack_from(self._mm, offset)[3]
+		start = offset + _CHUNK_HEADER.size
+		return zlib.decompress(self._mm[start:start + comp_len])
+
+	def _read_chunk(self, entry: Tuple[int, int, int, float, float], typecodes: Sequence[str]) -> List[array]:
+		return _unpack_columns(self._read_raw(entry), entry[2], typecodes)
+
+	@staticmethod
+	def _first_chunk(chunks: List[Tuple[int, int, int, float, float]], start_t: Optional[float]) -> int:
+		if start_t is None:
+			return 0
+		# Indeks ile ilgili ilk parcaya atla
+		return bisect.bisect_left([e[4] for e in chunks], start_t)
+
+	def iter_metrics(self, start_t: Optional[float] = None, end_t: Optional[float] = None) -> Iterator[Tuple[float, Dict[str, Optional[float]]]]:
+		"""(zaman damgasi, metrik sozlugu) ciftlerini sirayla dondur."""
+		first = self._first_chunk(self._metric_chunks, start_t)
+		for entry, fields in zip(self._metric_chunks[first:], self._chunk_fields[first:]):
+			if end_t is not None and entry[3] > end_t:
+				return
+			cols = self._read_chunk(entry, ["d"] + ["f"] * len(fields))
+			for i, ts in enumerate(cols[0]):
+				if start_t is not None and ts < start_t:
+					continue
+				if end_t is not None and ts > end_t:
+					return
+				values: Dict[str, Optional[float]] = {}
+				for name, col in zip(fields, cols[1:]):
+					v = col[i]
+					# float32 kalintisini at (toplayici zaten 1-2 ondalik yuvarliyor)
+					values[name] = None if v != v else round(v, 3)
+				yield ts, values
+
+	def iter_frames(self, start_t: Optional[float] = None, end_t: Optional[float] = None) -> Iterator[Tuple[float, float]]:
+		"""(zaman damgasi, frame-time ms) ciftlerini sirayla dondur."""
+		for entry in self._frame_chunks[self._first_chunk(self._frame_chunks, start_t):]:
+			if end_t is not None and entry[3] > end_t:
+				return
+			ts_col, ms_col = self._read_chunk(entry, ("d", "f"))
+			for ts, ms in zip(ts_col, ms_col):
+				if start_t is not None and ts < start_t:
+					continue
+				if end_t is not None and ts > end_t:
+					return
+				yield ts, ms
+
+
+class _ReplayClock:
+	"""Kayit zamanini duvar saatine esler (speed > 1 hizli oynatma)."""
+
+	def __init__(self, origin: float, speed: float = 1.0) -> None:
+		self.origin = origin
+		self.speed = max(0.01, speed)
+		self.started = time.monotonic()
+
+	def now(self) -> float:
+		return self.origin + (time.monotonic() - self.started) * self.speed
+
+
+class ReplayCollector:
+	"""`SystemMetricsCollector` yerine gecen oynatma kaynagi.
+
+	`get_metrics` kayit saatinde o ana kadarki en son snapshot'i dondurur;
+	zaman damgalari kaydedildikleri araliklarla ilerler."""
+
+	def __init__(self, reader: SessionReader, speed: float = 1.0, loop: bool = False) -> None:
+		self.reader = reader
+		self.speed = speed
+		self.loop = loop
+		self._clock: Optional[_ReplayClock] = None
+		self._iter: Optional[Iterator[Tuple[float, Dict[str, Optional[float]]]]] = None
+		self._pending: Optional[Tuple[float, Dict[str, Optional[float]]]] = None
+		self._current: Dict[str, Optional[float]] = {}
+		self.finished = False
+
+	def _restart(self) -> None:
+		self._clock = _ReplayClock(self.reader.time_range[0], self.speed)
+		self._iter = self.reader.iter_metrics()
+		self._pending = next(self._iter, None)
+
+	def get_metrics(self) -> Dict[str, Optional[float]]:
+		if self._clock is None:
+			self._restart()
+		now = self._clock.now()
+		while self._pending is not None and self._pending[0] <= now:
+			self._current = self._pending[1]
+			self._pending = next(self._iter, None)
+		if self._pending is None and not self.finished:
+			if self.loop:
+				self._restart()
+			else:
+				self.finished = True
+		return dict(self._current)
+
+	def close(self) -> None:
+		self.reader.close()
+
+
+class ReplayPresentMonReader(PresentMonReader):
+	"""Kayittaki frame-time'lari, PresentMon'un canli akisi gibi tampona besler."""
+
+	def __init__(self, reader: SessionReader, speed: float = 1.0, **kwargs: Any) -> None:
+		super().__init__(process_name="replay", **kwargs)
+		self.reader = reader
+		self.speed = max(0.01, speed)
+		self._stop_event = threading.Event()
+
+	def start(self) -> None:
+		self._stop_event.clear()
+		self._thread = threading.Thread(target=self._replay, name="presentmon-replay", daemon=True)
+		self._thread.start()
+
+	def _replay(self) -> None:
+		clock = _ReplayClock(self.reader.time_range[0], self.speed)
+		for ts, frame_ms in self.reader.iter_frames():
+			delay = (ts - clock.now()) / self.speed
+			if delay > 0 and self._stop_event.wait(delay):
+				return
+			self.add_frame(frame_ms)
+
+	def stop(self) -> None:
+		self._stop_event.set()
+		super().stop()
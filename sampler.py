@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Deque, List, Mapping, Optional
+
+from tracing import NULL_TRACER, Tracer
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+	"""Tek bir örnekleme anının değişmez kopyası."""
+
+	seq: int
+	timestamp: float
+	metrics: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+	duration_s: float = 0.0
+
+
+class SamplingEngine:
+	"""Arka plan örnekleyici: toplayıcıları kendi thread'inde çalıştırır.
+
+	Son snapshot tek bir referans atamasıyla yayınlanır (kilitsiz), UI
+	thread'i sadece `latest()` okur ve hiçbir zaman sensör I/O'sunda beklemez.
+	Son `history` snapshot sınırlı bir halkada tutulur."""
+
+	def __init__(self, collector: Any, interval_s: float = 0.5, history: int = 120,
+				 tracer: Tracer = NULL_TRACER) -> None:
+		self.collector = collector
+		self.tracer = tracer
+		self.interval_s = max(0.01, float(interval_s))
+		self._latest: Optional[MetricsSnapshot] = None
+		self._ring: Deque[MetricsSnapshot] = deque(maxlen=max(1, int(history)))
+		self._seq = 0
+		self._stop_event = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+		self._subscribers: List[Callable[[MetricsSnapshot], None]] = []
+		self.error_count = 0
+
+	def start(self) -> None:
+		"""Örnekleme thread'ini başlat."""
+		if self._thread is not None and self._thread.is_alive():
+			return
+		self._stop_event.clear()
+		self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+		self._thread.start()
+
+	def stop(self) -> None:
+		"""Örnekleme thread'ini durdur."""
+		self._stop_event.set()
+		if self._thread is not None:
+			self._thread.join(timeout=max(1.0, self.interval_s * 2))
+			self._thread = None
+
+	def set_interval(self, interval_s: float) -> None:
+		"""Örnekleme aralığını değiştir (bir sonraki turda geçerli olur)."""
+		self.interval_s = max(0.01, float(interval_s))
+
+	def subscribe(self, callback: Callable[[MetricsSnapshot], None]) -> None:
+		"""Her yeni snapshot'ta örnekleyici thread'inden çağrılacak fonksiyon ekle."""
+		self._subscribers = self._subscribers + [callback]
+
+	def latest(self) -> Optional[MetricsSnapshot]:
+		"""En yeni snapshot'ı döndür (bloklamaz)."""
+		return self._latest
+
+	def recent(self, count: Optional[int] = None) -> List[MetricsSnapshot]:
+		"""Halkadaki son snapshot'ları eskiden yeniye döndür."""
+		# deque.copy() C tarafında GIL altında tek adımda çalışır
+		items = list(self._ring.copy())
+		if count is not None:
+			items = items[-count:] if count > 0 else []
+		return items
+
+	def sample_once(self) -> Optional[MetricsSnapshot]:
+		"""Toplayıcıyı bir kez çalıştır ve sonucu yayınla."""
+		start = time.perf_counter()
+		try:
+			with self.tracer.span("collect"):
+				metrics = self.collector.get_metrics()
+		except Exception as e:
+			self.error_count += 1
+			print(f"Örnekleme hatası: {e}")
+			return None
+		duration = time.perf_counter() - start
+
+		self._seq += 1
+		snapshot = MetricsSnapshot(
+			seq=self._seq,
+			timestamp=time.time(),
+			metrics=MappingProxyType(dict(metrics)),
+			duration_s=duration,
+		)
+		self._ring.append(snapshot)
+		self._latest = snapshot
+		for callback in self._subscribers:
+			try:
+				callback(snapshot)
+			except Exception as e:
+				print(f"Snapshot aboneliği hatası: {e}")
+		return snapshot
+
+	def _run(self) -> None:
+		next_deadline = time.perf_counter()
+		while not self._stop_event.is_set():
+			self.sample_once()
+
+			# Sabit kadans: kaçırılan turlar biriktirilmez
+			next_deadline += self.interval_s
+			now = time.perf_counter()
+			if next_deadline < now:
+				next_deadline = now + self.interval_s
+			self._stop_event.wait(next_deadline - now)
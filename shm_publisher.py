@@ -0,0 +1,345 @@
+import argparse
+import math
+import os
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# Sabit yerlesim (little-endian):
+#   0   4s  magic "OSDM" (baslik tamamlaninca en son yazilir)
+#   4   H   surum
+#   6   H   alan sayisi (N, yazim sirasinda artabilir)
+#   8   H   alan kapasitesi (C)
+#   10  6x  bos
+#   16  Q   seqlock sayaci (tek = yazim suruyor)
+#   24  C * 32s  alan adlari (ASCII, sifirla doldurulmus; sadece sona eklenir)
+#   D   q   snapshot seq, d zaman damgasi, N * d deger (None = NaN)
+MAGIC = b"OSDM"
+VERSION = 2
+NAME_SIZE = 32
+COUNT_OFFSET = 6
+SEQ_OFFSET = 16
+NAMES_OFFSET = 24
+DEFAULT_NAME = "osd_metrics"
+# Sonradan gelen alanlar (gec yuklenen eklentiler, ek GPU'lar) icin ayrilan yer
+DEFAULT_SPARE_FIELDS = 32
+
+_HEADER = struct.Struct("<4sHHH6x")
+_COUNT = struct.Struct("<H")
+_SEQ = struct.Struct("<Q")
+_NAME = struct.Struct(f"<{NAME_SIZE}s")
+
+
+def _data_struct(count: int) -> struct.Struct:
+	return struct.Struct("<qd" + "d" * count)
+
+
+def _data_offset(count: int) -> int:
+	return NAMES_OFFSET + count * NAME_SIZE
+
+
+def _tracker(action: str, shm: shared_memory.SharedMemory) -> None:
+	"""resource_tracker kaydini duzelt (sadece POSIX; Windows'ta segment son handle ile kapanir).
+
+	Okuyucular kaydini siler, aksi halde cikista segmenti yayinlayicinin altindan
+	silerler. Ayni tracker'i paylasan alt surecler yayinlayicinin kaydini da
+	silebilecegi icin yayinlayici unlink oncesi kaydi yeniler."""
+	if os.name != "posix":
+		return
+	try:
+		from multiprocessing import resource_tracker
+		getattr(resource_tracker, action)(shm._name, "shared_memory")  # type: ignore[attr-defined]
+	except Exception:
+		pass
+
+
+class SnapshotPublisher:
+	"""Her snapshot'i sabit yerlesimli bir shared_memory segmentine yazar.
+
+	Yazim seqlock ile korunur: sayac once tek sayiya, veri yazildiktan sonra
+	cift sayiya cekilir. Okuyucular kilit veya sistem cagrisi olmadan tek bir
+	`struct.unpack_from` ile tutarli degerleri alir. Alan listesi verilmezse
+	ilk snapshot'taki sayisal anahtarlardan cikarilir. Sonradan gelen
+	sayisal anahtarlar ayni yazim icinde ayrilan `spare_fields` yuvalarina
+	eklenir; okuyucular alan sayisi degisince listeyi yeniler."""
+
+	def __init__(self, name: str = DEFAULT_NAME, fields: Optional[Sequence[str]] = None,
+				 fps_source: Optional[Callable[[], Optional[float]]] = None,
+				 spare_fields: int = DEFAULT_SPARE_FIELDS) -> None:
+		self.name = name
+		self.fields: Optional[List[str]] = list(fields) if fields is not None else None
+		self.fps_source = fps_source
+		self.spare_fields = max(0, int(spare_fields))
+		self.capacity = 0
+		self._known: Set[str] = set()
+		self._shm: Optional[shared_memory.SharedMemory] = None
+		self._data: Optional[struct.Struct] = None
+		self._data_offset = 0
+		self._seq = 0
+		self.publish_count = 0
+		if self.fields is not None:
+			self._create()
+
+	def _create(self) -> None:
+		fields = self.fields or []
+		if self.fps_source is not None and "fps" not in fields:
+			fields.append("fps")
+		self.fields = fields
+		self._known = set(fields)
+		self.capacity = min(0xFFFF, len(fields) + self.spare_fields)
+		self._data = _data_struct(len(fields))
+		self._data_offset = _data_offset(self.capacity)
+		size = self._data_offset + _data_struct(self.capacity).size
+
+		try:
+			shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+		except FileExistsError:
+			# Onceki (cokmus) bir calismadan kalan segment
+			old = shared_memory.SharedMemory(name=self.name)
+			old.close()
+			old.unlink()
+			shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+
+		buf = shm.buf
+		_SEQ.pack_into(buf, SEQ_OFFSET, 0)
+		for index, field_name in enumerate(fields):
+			_NAME.pack_into(buf, NAMES_OFFSET + index * NAME_SIZE, field_name.encode("ascii", "replace")[:NAME_SIZE])
+		_HEADER.pack_into(buf, 0, MAGIC, VERSION, len(fields), self.capacity)
+		self._shm = shm
+
+	def _add_fields(self, added: List[str]) -> None:
+		# Seqlock tek sayidayken cagrilir: adlar sayac artmadan once yazilir
+		self._known.update(added)
+		room = self.capacity - len(self.fields)
+		if len(added) > room:
+			print(f"Paylasimli bellekte yer yok, alanlar atlandi: {', '.join(added[room:])}")
+			added = added[:room]
+		if not added:
+			return
+		buf = self._shm.buf
+		for index, field_name in enumerate(added, start=len(self.fields)):
+			_NAME.pack_into(buf, NAMES_OFFSET + index * NAME_SIZE, field_name.encode("ascii", "replace")[:NAME_SIZE])
+		self.fields.extend(added)
+		self._data = _data_struct(len(self.fields))
+		_COUNT.pack_into(buf, COUNT_OFFSET, len(self.fields))
+
+	def publish(self, snapshot: Any) -> None:
+		"""Snapshot'i segmente yaz (ornekleyici aboneligi olarak kullanilir)."""
+		metrics = snapshot.metrics
+		if self._shm is None:
+			if self.fields is None:
+				self.fields = sorted(k for k, v in metrics.items() if v is None or isinstance(v, (int, float)))
+			self._create()
+		added = [k for k, v in metrics.items() if k not in self._known and (v is None or isinstance(v, (int, float)))]
+
+		buf = self._shm.buf
+		seq = self._seq + 1
+		_SEQ.pack_into(buf, SEQ_OFFSET, seq)
+		if added:
+			self._add_fields(sorted(added))
+
+		values = []
+		for field_name in self.fields:
+			if field_name == "fps" and self.fps_source is not None:
+				value = self.fps_source()
+			else:
+				value = metrics.get(field_name)
+			values.append(float(value) if isinstance(value, (int, float)) else math.nan)
+
+		self._data.pack_into(buf, self._data_offset, snapshot.seq, snapshot.timestamp, *values)
+		_SEQ.pack_into(buf, SEQ_OFFSET, seq + 1)
+		self._seq = seq + 1
+		self.publish_count += 1
+
+	def close(self) -> None:
+		if self._shm is None:
+			return
+		try:
+			self._shm.close()
+			_tracker("register", self._shm)
+			self._shm.unlink()
+		except Exception:
+			pass
+		self._shm = None
+
+
+class SnapshotReader:
+	"""Yayinlanan segmenti okuyan istemci.
+
+	`read()` seqlock sayaci okuma boyunca degismediyse tutarli
+	(snapshot seq, zaman, {alan: deger}) dondurur; yazim suruyorsa tekrar dener.
+	Yayinci alan eklediyse `fields` bir sonraki tutarli okumada guncellenir."""
+
+	def __init__(self, name: str = DEFAULT_NAME) -> None:
+		self._shm = shared_memory.SharedMemory(name=name)
+		_tracker("unregister", self._shm)
+		buf = self._shm.buf
+		magic, version, count, capacity = _HEADER.unpack_from(buf, 0)
+		if magic != MAGIC or version != VERSION:
+			self._shm.close()
+			raise ValueError(f"Gecersiz segment: {name}")
+		self.capacity = capacity
+		self.fields: List[str] = []
+		self._data = _data_struct(0)
+		self._data_offset = _data_offset(capacity)
+		self.retries = 0
+		self._set_count(count)
+
+	def _set_count(self, count: int) -> None:
+		# Adlar sadece sona eklenir ve sayactan once yazilir; okunanlar degismez
+		buf = self._shm.buf
+		self.fields.extend(
+			_NAME.unpack_from(buf, NAMES_OFFSET + i * NAME_SIZE)[0].rstrip(b"\0").decode("ascii")
+			for i in range(len(self.fields), count)
+		)
+		self._data = _data_struct(count)
+
+	def read_raw(self, max_spins: int = 10000) -> Optional[Tuple[float, ...]]:
+		"""(snapshot seq, zaman, degerler...) demeti; hic yayin yoksa None."""
+		buf = self._shm.buf
+		for _ in range(max_spins):
+			before = _SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+			if before & 1:
+				self.retries += 1
+				continue
+			if before == 0:
+				return None
+			count = _COUNT.unpack_from(buf, COUNT_OFFSET)[0]
+			if count != len(self.fields):
+				if count > self.capacity:
+					self.retries += 1
+					continue
+				data = _data_struct(count).unpack_from(buf, self._data_offset)
+			else:
+				data = self._data.unpack_from(buf, self._data_offset)
+			if _SEQ.unpack_from(buf, SEQ_OFFSET)[0] == before:
+				if count != len(self.fields):
+					self._set_count(count)
+				return data
+			self.retries += 1
+		return None
+
+	def read(self) -> Optional[Tuple[int, float, Dict[str, Optional[float]]]]:
+		data = self.read_raw()
+		if data is None:
+			return None
+		values = {name: (None if math.isnan(value) else value) for name, value in zip(self.fields, data[2:])}
+		return int(data[0]), data[1], values
+
+	def close(self) -> None:
+		try:
+			self._shm.close()
+		except Exception:
+			pass
+
+
+def stress_consistent(data: Tuple[float, ...], field_count: int) -> bool:
+	"""Stres yazicisinin snapshot'i tutarli mi: tum alanlar snapshot seq'ine esit olmali."""
+	if len(data) != field_count + 2:
+		return False
+	first = data[2] if field_count else float(data[0])
+	return data[0] == int(first) and all(value == first for value in data[3:])
+
+
+def stress_reader(reader: SnapshotReader, duration_s: float) -> Tuple[int, int]:
+	"""`duration_s` boyunca oku; (okuma, yirtik okuma) sayisini dondur."""
+	reads = torn = 0
+	deadline = time.perf_counter() + duration_s
+	while time.perf_counter() < deadline:
+		data = reader.read_raw()
+		if data is None:
+			continue
+		reads += 1
+		if not stress_consistent(data, len(reader.fields)):
+			torn += 1
+	return reads, torn
+
+
+def stress_writer(publisher: SnapshotPublisher, fields: Sequence[str], duration_s: float, grow_at_s: float) -> int:
+	"""Her snapshot'ta tum alanlara seq'i yaz; `grow_at_s` sonra alanlarin tamamini yayinla.
+
+	Baslangicta sadece yayincinin bilinen alanlari yazilir. Yazim sayisini dondurur."""
+	from types import SimpleNamespace
+
+	initial = list(publisher.fields or fields)
+	writes = 0
+	start = time.perf_counter()
+	snapshot = SimpleNamespace(seq=0, timestamp=0.0, metrics={})
+	while True:
+		elapsed = time.perf_counter() - start
+		if elapsed >= duration_s:
+			return writes
+		writes += 1
+		snapshot.seq = writes
+		snapshot.timestamp = time.time()
+		snapshot.metrics = dict.fromkeys(fields if elapsed >= grow_at_s else initial, float(writes))
+		publisher.publish(snapshot)
+
+
+def _stress_reader(name: str, duration_s: float, result_queue: Any) -> None:
+	reader = SnapshotReader(name)
+	reads, torn = stress_reader(reader, duration_s)
+	reader.close()
+	result_queue.put((reads, torn, reader.retries, len(reader.fields)))
+
+
+def stress(readers: int = 4, duration_s: float = 3.0, field_count: int = 32, name: str = "osd_metrics_stress") -> bool:
+	"""Es zamanli okuyucu sureclerle seqlock stres testi; yirtik okuma yoksa True.
+
+	Alanlarin yarisi yolun ortasinda eklenir; okuyucularin hepsini gormesi beklenir."""
+	import multiprocessing
+
+	fields = [f"f{i}" for i in range(field_count)]
+	publisher = SnapshotPublisher(name, fields=fields[:field_count // 2], spare_fields=field_count)
+	queue: Any = multiprocessing.Queue()
+	procs = [multiprocessing.Process(target=_stress_reader, args=(name, duration_s, queue)) for _ in range(readers)]
+	for proc in procs:
+		proc.start()
+
+	writes = stress_writer(publisher, fields, duration_s + 0.5, duration_s / 2)
+
+	results = [queue.get(timeout=duration_s + 10) for _ in procs]
+	for proc in procs:
+		proc.join()
+	publisher.close()
+
+	total_reads = sum(r[0] for r in results)
+	total_torn = sum(r[1] for r in results)
+	total_retries = sum(r[2] for r in results)
+	grown = all(r[3] == field_count for r in results)
+	print(f"yazim: {writes}  okuma: {total_reads}  tekrar deneme: {total_retries}  yirtik: {total_torn}  alanlar: {[r[3] for r in results]}")
+	return total_torn == 0 and grown
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Paylasimli bellek snapshot okuyucu / stres testi")
+	parser.add_argument("--name", default=DEFAULT_NAME, help="Segment adi")
+	parser.add_argument("--stress", action="store_true", help="Es zamanli okuyucularla seqlock stres testi")
+	parser.add_argument("--readers", type=int, default=4)
+	parser.add_argument("--duration", type=float, default=3.0)
+	args = parser.parse_args(argv)
+
+	if args.stress:
+		return 0 if stress(args.readers, args.duration) else 1
+
+	try:
+		reader = SnapshotReader(args.name)
+	except FileNotFoundError:
+		print(f"Segment bulunamadi: {args.name}")
+		return 1
+	result = reader.read()
+	reader.close()
+	if result is None:
+		print("Henuz yayin yok")
+		return 1
+	seq, timestamp, values = result
+	print(f"seq {seq}  zaman {timestamp:.3f}")
+	for field_name, value in values.items():
+		print(f"  {field_name:24s} {'-' if value is None else f'{value:.2f}'}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,90 @@
+import importlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Surec baslangicina en yakin referans (app bu modulu ilk import eder)
+PROCESS_START = time.perf_counter()
+
+
+def lazy_import(module: str, *names: str) -> Tuple[Any, ...]:
+	"""Modulu ilk kullanimda yukle; basarisizsa isimler icin None dondur."""
+	try:
+		mod = importlib.import_module(module)
+		return tuple(getattr(mod, name) for name in names)
+	except Exception:
+		return tuple(None for _ in names)
+
+
+class StartupTimer:
+	"""Baslangic asamalarinin surec baslangicina gore zamanlarini toplar.
+
+	Beklenen tum asamalar tamamlaninca (veya `flush` cagrilinca) dokum bir
+	JSON satiri olarak log dosyasina eklenir."""
+
+	def __init__(self, log_path: Optional[str] = None, expected: Iterable[str] = ()) -> None:
+		self.log_path = log_path
+		self.expected = set(expected)
+		self.marks: Dict[str, float] = {}
+		self._order: List[str] = []
+		self._lock = threading.Lock()
+		self._flushed = False
+
+	def mark(self, stage: str) -> float:
+		"""Asamayi kaydet; surec baslangicindan bu yana gecen ms'yi dondur."""
+		elapsed_ms = (time.perf_counter() - PROCESS_START) * 1000.0
+		with self._lock:
+			if stage in self.marks:
+				return self.marks[stage]
+			self.marks[stage] = elapsed_ms
+			self._order.append(stage)
+			done = self.expected and self.expected.issubset(self.marks)
+		if done:
+			self.flush()
+		return elapsed_ms
+
+	def expect(self, *stages: str) -> None:
+		with self._lock:
+			self.expected.update(stages)
+
+	def run_async(self, stage: str, func: Callable[[], Any]) -> threading.Thread:
+		"""Bagimsiz bir alt sistemi kendi thread'inde baslat ve bitisini isaretle."""
+		self.expect(stage)
+
+		def target() -> None:
+			try:
+				func()
+			except Exception as e:
+				print(f"Baslangic asamasi hatasi ({stage}): {e}")
+			finally:
+				self.mark(stage)
+
+		thread = threading.Thread(target=target, name=f"startup-{stage}", daemon=True)
+		thread.start()
+		return thread
+
+	def report(self) -> Dict[str, Any]:
+		with self._lock:
+			return {
+				"time": time.strftime("%Y-%m-%d %H:%M:%S"),
+				"stages_ms": {stage: round(self.marks[stage], 1) for stage in self._order},
+				"pending": sorted(self.expected - set(self.marks)),
+			}
+
+	def flush(self) -> None:
+		"""Dokumu bir kez yaz."""
+		with self._lock:
+			if self._flushed:
+				return
+			self._flushed = True
+		line = json.dumps(self.report(), ensure_ascii=False)
+		print(f"Baslangic zamanlari: {line}")
+		if self.log_path:
+			try:
+				os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+				with open(self.log_path, "a", encoding="utf-8") as f:
+					f.write(line + "\n")
+			except Exception:
+				pass
@@ -0,0 +1,123 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auto_updater import AutoUpdater
+
+RELEASE = {
+	"tag_name": "v2.1.0",
+	"body": "notlar",
+	"published_at": "2024-01-01T00:00:00Z",
+	"assets": [],
+}
+ETAG = '"rel-1"'
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class ReleaseServer:
+	"""GitHub releases API yerine gecen yerel sunucu; yanitlar sirayla verilir."""
+
+	def __init__(self):
+		self.requests = []
+		self.replies = []
+		self.delay = 0.0
+		server = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				server.requests.append(dict(self.headers))
+				if server.delay:
+					time.sleep(server.delay)
+				status, headers = server.replies.pop(0) if server.replies else (200, {})
+				body = json.dumps(RELEASE).encode("utf-8") if status == 200 else b""
+				self.send_response(status)
+				for name, value in headers.items():
+					self.send_header(name, value)
+				self.send_header("Content-Length", str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, *args):
+				pass
+
+		self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+		self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/releases/latest"
+		self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+		self.thread.start()
+
+	def close(self):
+		self.httpd.shutdown()
+		self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+	srv = ReleaseServer()
+	yield srv
+	srv.close()
+
+
+def make_updater(server, tmp_path, **kwargs):
+	return AutoUpdater(
+		current_version="2.0.0", api_url=server.url,
+		cache_path=str(tmp_path / "update_meta.json"), timeout=5.0, **kwargs,
+	)
+
+
+def test_second_check_is_conditional(server, tmp_path):
+	server.replies = [(200, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED}), (304, {})]
+	updater = make_updater(server, tmp_path)
+	assert updater.check_for_updates(force=True)["version"] == "2.1.0"
+	assert "If-None-Match" not in server.requests[0]
+	updater.check_for_updates(force=True)
+	assert server.requests[1]["If-None-Match"] == ETAG
+	assert server.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_not_modified_reuses_cached_release(server, tmp_path):
+	server.replies = [(200, {"ETag": ETAG}), (304, {})]
+	make_updater(server, tmp_path).check_for_updates(force=True)
+	# Yeni surec: bilgi sadece disk onbelleginden gelebilir
+	updater = make_updater(server, tmp_path)
+	info = updater.check_for_updates(force=True)
+	assert updater.last_status == 304
+	assert info is not None and info["version"] == "2.1.0"
+	assert updater.failures == 0
+
+
+@pytest.mark.parametrize("status", [403, 500, 503])
+def test_errors_back_off(server, tmp_path, status):
+	server.replies = [(status, {})]
+	updater = make_updater(server, tmp_path)
+	before = time.time()
+	assert updater.check_for_updates() is None
+	assert updater.failures == 1
+	assert updater.next_check_at > before
+	# Geri cekilme suresince aga cikilmaz
+	updater.check_for_updates()
+	assert len(server.requests) == 1
+
+
+def test_retry_after_extends_backoff(server, tmp_path):
+	server.replies = [(403, {"Retry-After": "900"})]
+	updater = make_updater(server, tmp_path)
+	updater.check_for_updates()
+	assert updater.next_check_at >= time.time() + 800
+
+
+def test_check_async_does_not_block(server, tmp_path):
+	server.delay = 0.5
+	found = []
+	updater = make_updater(server, tmp_path, on_update_available=found.append)
+	start = time.monotonic()
+	thread = updater.check_async()
+	assert time.monotonic() - start < 0.2
+	thread.join(timeout=5)
+	assert [info["version"] for info in found] == ["2.1.0"]
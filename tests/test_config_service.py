@@ -0,0 +1,35 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_service import ConfigService, sanitize_config
+
+DEFAULTS = {
+	"refreshMs": 500,
+	"session": {"record": False, "dir": "sessions", "replaySpeed": 1.0},
+	"gpu": {"intervalsMs": {"utilization": 250, "temperature": 2000}},
+}
+
+
+def test_invalid_session_and_gpu_fields_are_dropped():
+	clean, errors = sanitize_config({
+		"session": {"record": "yes", "dir": "rec", "replaySpeed": "fast"},
+		"gpu": {"intervalsMs": {"utilization": 100, "temperature": -5, "fan": "slow"}},
+	})
+	assert clean == {"session": {"dir": "rec"}, "gpu": {"intervalsMs": {"utilization": 100}}}
+	assert len(errors) == 4
+
+
+def test_load_restores_defaults_for_invalid_fields(tmp_path):
+	path = tmp_path / "config.json"
+	path.write_text(json.dumps({
+		"session": {"replaySpeed": "fast", "dir": "rec"},
+		"gpu": {"intervalsMs": {"utilization": "x", "temperature": 1000}},
+	}), encoding="utf-8")
+	config = ConfigService(str(path), DEFAULTS).current
+	assert config["session"] == {"record": False, "dir": "rec", "replaySpeed": 1.0}
+	assert config["gpu"]["intervalsMs"] == {"utilization": 250, "temperature": 1000}
+	# main() bu degerleri dogrudan float()'a verir
+	float(config["session"]["replaySpeed"])
@@ -0,0 +1,125 @@
+import os
+import sys
+import types
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import GPU_KEYS, GpuSource, NvmlGpuCollector
+
+
+class NVMLError(Exception):
+	pass
+
+
+def make_fake_pynvml(devices):
+	"""Iki cihazli sahte `pynvml`; `calls` cihaz ve fonksiyon basina cagri sayar."""
+	nvml = types.ModuleType("pynvml")
+	nvml.NVMLError = NVMLError
+	nvml.NVML_CLOCK_GRAPHICS = 0
+	nvml.NVML_TEMPERATURE_GPU = 0
+	nvml.calls = Counter()
+	nvml.failing = set()
+
+	def device_call(name, build):
+		def call(handle, *args):
+			nvml.calls[(handle, name)] += 1
+			if handle in nvml.failing:
+				raise NVMLError("GPU is lost")
+			return build(devices[handle])
+		return call
+
+	nvml.nvmlInit = lambda: None
+	nvml.nvmlShutdown = lambda: None
+	nvml.nvmlDeviceGetCount = lambda: len(devices)
+	nvml.nvmlDeviceGetHandleByIndex = lambda index: index
+	nvml.nvmlDeviceGetUtilizationRates = device_call("util", lambda d: SimpleNamespace(gpu=d["util"]))
+	nvml.nvmlDeviceGetMemoryInfo = device_call("memory", lambda d: SimpleNamespace(used=d["used"], total=d["total"]))
+	nvml.nvmlDeviceGetClockInfo = device_call("clock", lambda d: d["clock"])
+	nvml.nvmlDeviceGetTemperature = device_call("temperature", lambda d: d["temp"])
+	nvml.nvmlDeviceGetFanSpeed = device_call("fan", lambda d: d["fan"])
+	return nvml
+
+
+DEVICES = [
+	{"util": 50, "used": 2 * 1024 ** 3, "total": 8 * 1024 ** 3, "clock": 1800, "temp": 60, "fan": 40},
+	{"util": 10, "used": 1 * 1024 ** 3, "total": 4 * 1024 ** 3, "clock": 1200, "temp": 45, "fan": 30},
+]
+
+
+@pytest.fixture
+def fake_nvml(monkeypatch):
+	nvml = make_fake_pynvml(DEVICES)
+	monkeypatch.setitem(sys.modules, "pynvml", nvml)
+	return nvml
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 100.0
+
+	def __call__(self):
+		return self.now
+
+	def advance(self, dt):
+		self.now += dt
+
+
+@pytest.fixture
+def clock():
+	return FakeClock()
+
+
+def test_loads_pynvml_and_opens_all_devices(fake_nvml, clock):
+	gpu = NvmlGpuCollector(clock=clock)
+	assert gpu.open()
+	assert gpu.nvml is fake_nvml
+	assert gpu.device_count == 2
+
+
+def test_each_field_keeps_its_own_interval(fake_nvml, clock):
+	gpu = NvmlGpuCollector(intervals={"utilization": 0.25, "temperature": 2.0}, clock=clock)
+	gpu.open()
+	gpu.sample()
+	for _ in range(8):
+		clock.advance(0.25)
+		gpu.sample()
+	# 2 sn icinde: kullanim her 0.25 sn, bellek/saat 0.5 sn, sicaklik/fan 2 sn
+	assert fake_nvml.calls[(0, "util")] == 9
+	assert fake_nvml.calls[(0, "memory")] == 5
+	assert fake_nvml.calls[(0, "clock")] == 5
+	assert fake_nvml.calls[(0, "temperature")] == 2
+	assert fake_nvml.calls[(1, "fan")] == 2
+
+
+def test_gpu_index_key_naming(fake_nvml, clock):
+	gpu = NvmlGpuCollector(clock=clock)
+	gpu.open()
+	metrics = GpuSource(gpu).sample()
+	assert metrics["gpu_count"] == 2.0
+	assert metrics["gpu_util_percent"] == 50.0
+	assert metrics["gpu_mem_total_gb"] == 8.0
+	assert metrics["gpu1_util_percent"] == 10.0
+	assert metrics["gpu1_temp_c"] == 45.0
+	assert set(GPU_KEYS) <= set(metrics)
+	assert {key.replace("gpu_", "gpu1_", 1) for key in GPU_KEYS} <= set(metrics)
+	assert not any(key.startswith("gpu0_") for key in metrics)
+
+
+def test_nvml_error_degrades_only_that_device(fake_nvml, clock):
+	gpu = NvmlGpuCollector(clock=clock)
+	gpu.open()
+	gpu.sample()
+	fake_nvml.failing.add(1)
+	clock.advance(5.0)
+	metrics = GpuSource(gpu).sample()
+	assert metrics["gpu_util_percent"] == 50.0
+	assert metrics["gpu_temp_c"] == 60.0
+	assert all(metrics[key.replace("gpu_", "gpu1_", 1)] is None for key in GPU_KEYS)
+	# Cihaz duzelince bir sonraki aralikta tekrar okunur
+	fake_nvml.failing.clear()
+	clock.advance(5.0)
+	assert GpuSource(gpu).sample()["gpu1_util_percent"] == 10.0
@@ -0,0 +1,156 @@
+import os
+import queue
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fps_presentmon import PresentMonReader
+
+
+class FakeStdout:
+	"""Satirlari kuyruktan veren stdout; None gelince EOF."""
+
+	def __init__(self):
+		self.lines = queue.Queue()
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+		line = self.lines.get()
+		if line is None:
+			raise StopIteration
+		return line
+
+
+class FakeProc:
+	def __init__(self, args, **kwargs):
+		self.args = args
+		self.kwargs = kwargs
+		self.pid = -1
+		self.stdout = FakeStdout()
+		self.terminated = False
+
+	def terminate(self):
+		# Kabuk sarmalayicisi gibi: akis kapanmaz
+		self.terminated = True
+
+	def wait(self, timeout=None):
+		return 0
+
+	def kill(self):
+		pass
+
+
+class FakePopen:
+	def __init__(self):
+		self.procs = []
+
+	def __call__(self, args, **kwargs):
+		proc = FakeProc(args, **kwargs)
+		self.procs.append(proc)
+		return proc
+
+
+def wait_for(predicate, timeout=2.0):
+	deadline = time.monotonic() + timeout
+	while time.monotonic() < deadline:
+		if predicate():
+			return True
+		time.sleep(0.005)
+	return False
+
+
+def test_launched_without_shell():
+	popen = FakePopen()
+	reader = PresentMonReader("game.exe", popen=popen)
+	reader.start()
+	assert popen.procs[0].args[0] == "presentmon"
+	assert not popen.procs[0].kwargs.get("shell")
+	popen.procs[0].stdout.lines.put(None)
+	reader.stop()
+
+
+def test_retarget_drops_old_stream():
+	popen = FakePopen()
+	frames = []
+	reader = PresentMonReader("old.exe", popen=popen)
+	reader.listeners.append(frames.append)
+	reader.start()
+	old = popen.procs[0]
+	old.stdout.lines.put("Application,MsBetweenPresents\n")
+	old.stdout.lines.put("old.exe,10.0\n")
+	assert wait_for(lambda: frames == [10.0])
+
+	reader.retarget("new.exe")
+	assert old.terminated
+	new = popen.procs[1]
+	# Eski akis hala veri uretir: bu satirlar yeni hedefe karismamali
+	old.stdout.lines.put("old.exe,10.0\n")
+	new.stdout.lines.put("Application,MsBetweenPresents\n")
+	new.stdout.lines.put("new.exe,20.0\n")
+	assert wait_for(lambda: frames == [10.0, 20.0])
+	time.sleep(0.05)
+	assert frames == [10.0, 20.0]
+	assert reader.pacing.stats()["frames"] == 1
+	new.stdout.lines.put(None)
+	old.stdout.lines.put(None)
+	reader.stop()
+
+
+# PresentMon 1.x "-output_stdout" ciktisindan kesit (baslik, bozuk satirlar dahil)
+RECORDED_STDOUT = [
+	"Capture started.\n",
+	"Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,AllowsTearing,PresentMode,Dropped,"
+	"TimeInSeconds,MsBetweenPresents,MsBetweenDisplayChange,MsInPresentAPI,MsUntilRenderComplete,MsUntilDisplayed\n",
+	"game.exe,1234,0x0000021F,DXGI,0,0,1,Hardware: Independent Flip,0,0.016,16.667,16.667,0.120,2.010,20.300\n",
+	"game.exe,1234,0x0000021F,DXGI,0,0,1,Hardware: Independent Flip,0,0.033,16.801,16.700,0.110,1.980,20.100\n",
+	"game.exe,1234,garbage\n",
+	"game.exe,1234,0x0000021F,DXGI,0,0,1,Hardware: Independent Flip,0,0.050,n/a,16.700,0.110,1.980,20.100\n",
+	"\n",
+	"game.exe,1234,0x0000021F,DXGI,0,0,1,Hardware: Independent Flip,0,0.083,33.333,33.400,0.130,2.200,21.000\n",
+	"Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,AllowsTearing,PresentMode,Dropped,"
+	"TimeInSeconds,MsBetweenPresents,MsBetweenDisplayChange,MsInPresentAPI,MsUntilRenderComplete,MsUntilDisplayed\n",
+	"game.exe,1234,0x0000021F,DXGI,0,0,1,Hardware: Independent Flip,0,0.100,16.500,16.600,0.100,1.900,19.800\n",
+]
+RECORDED_FRAMES = [16.667, 16.801, 33.333, 16.5]
+
+
+class RecordedProc(FakeProc):
+	def __init__(self, args, **kwargs):
+		super().__init__(args, **kwargs)
+		self.stdout = iter(RECORDED_STDOUT)
+
+
+def test_recorded_stdout_reaches_pacing_and_listeners():
+	frames = []
+	reader = PresentMonReader("game.exe", popen=RecordedProc)
+	reader.listeners.append(frames.append)
+	reader.start()
+	reader._thread.join(timeout=2)
+	assert frames == RECORDED_FRAMES
+	assert reader.lines_read == len(RECORDED_STDOUT)
+	stats = reader.get_stats()
+	assert stats["frames"] == len(RECORDED_FRAMES)
+	assert reader.read_fps() is not None
+	reader.stop()
+
+
+def test_failing_listener_does_not_stop_reader():
+	frames = []
+
+	def broken(frame_ms):
+		raise RuntimeError("dinleyici bozuk")
+
+	reader = PresentMonReader("game.exe", popen=RecordedProc)
+	reader.listeners.extend([broken, frames.append])
+	reader.start()
+	reader._thread.join(timeout=2)
+	assert not reader._thread.is_alive()
+	# Okuyucu tum satirlari isledi, saglam dinleyici her frame'i aldi
+	assert reader.lines_read == len(RECORDED_STDOUT)
+	assert frames == RECORDED_FRAMES
+	assert reader.listener_errors == len(RECORDED_FRAMES)
+	assert reader.pacing.stats()["frames"] == len(RECORDED_FRAMES)
+	reader.stop()
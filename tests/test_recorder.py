@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recorder import SessionReader, SessionRecorder
+
+
+def test_non_numeric_values_are_recorded_as_missing(tmp_path):
+	path = str(tmp_path / "a.osdrec")
+	recorder = SessionRecorder(path, fields=["cpu_percent", "plugin_temp"])
+	recorder.record_metrics(1.0, {"cpu_percent": 10, "plugin_temp": 40.5})
+	recorder.record_metrics(2.0, {"cpu_percent": 11, "plugin_temp": "N/A"})
+	recorder.record_metrics(3.0, {"cpu_percent": 12, "plugin_temp": True})
+	recorder.record_metrics(4.0, {"cpu_percent": 13, "plugin_temp": 41.0})
+	recorder.close()
+
+	reader = SessionReader(path)
+	rows = [values["plugin_temp"] for _, values in reader.iter_metrics()]
+	reader.close()
+	assert rows == [40.5, None, None, 41.0]
+
+
+def test_fields_added_later_get_a_schema_chunk(tmp_path):
+	path = str(tmp_path / "b.osdrec")
+	recorder = SessionRecorder(path, fields=["cpu_percent"], chunk_records=16)
+	for i in range(20):
+		recorder.record_metrics(float(i), {"cpu_percent": i})
+	for i in range(20, 40):
+		recorder.record_metrics(float(i), {"cpu_percent": i, "gpu1_temp_c": 50})
+	recorder.close()
+
+	reader = SessionReader(path)
+	rows = list(reader.iter_metrics())
+	assert reader.fields == ["cpu_percent", "gpu1_temp_c"]
+	assert rows[19][1] == {"cpu_percent": 19.0}
+	assert rows[20][1] == {"cpu_percent": 20.0, "gpu1_temp_c": 50.0}
+	assert [ts for ts, _ in reader.iter_metrics(start_t=35.0)] == [35.0, 36.0, 37.0, 38.0, 39.0]
+	reader.close()
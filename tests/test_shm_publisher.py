@@ -0,0 +1,29 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shm_publisher import SnapshotPublisher, SnapshotReader, stress_reader, stress_writer
+
+
+def test_seqlock_reads_are_consistent():
+	fields = [f"f{i}" for i in range(32)]
+	name = f"osd_test_{os.getpid()}"
+	publisher = SnapshotPublisher(name, fields=fields[:16], spare_fields=16)
+	reader = SnapshotReader(name)
+	writes = []
+	writer = threading.Thread(target=lambda: writes.append(stress_writer(publisher, fields, 0.6, 0.25)))
+	try:
+		writer.start()
+		reads, torn = stress_reader(reader, 0.5)
+		writer.join()
+	finally:
+		reader.close()
+		publisher.close()
+
+	assert writes and writes[0] > 0
+	assert reads > 0
+	assert torn == 0
+	# Yolun ortasinda eklenen alanlar okuyucuya ulasti
+	assert reader.fields == fields
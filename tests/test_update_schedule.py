@@ -0,0 +1,54 @@
+import ast
+import inspect
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from performance_optimizer import BackgroundTaskManager
+
+
+class FakeUpdater:
+	def __init__(self):
+		self.async_checks = 0
+
+	def check_and_update(self):
+		return False
+
+	def check_async(self):
+		self.async_checks += 1
+
+
+def test_update_check_task_registered():
+	manager = BackgroundTaskManager()
+	updater = FakeUpdater()
+	app.schedule_update_check(manager, updater, {"check": True})
+	assert "update_check" in manager.tasks
+	assert manager.tasks["update_check"]["func"] == updater.check_and_update
+
+
+def test_update_check_disabled_removes_task():
+	manager = BackgroundTaskManager()
+	updater = FakeUpdater()
+	app.schedule_update_check(manager, updater, {"check": True})
+	app.schedule_update_check(manager, updater, {"check": False})
+	assert "update_check" not in manager.tasks
+
+
+def test_update_check_without_task_manager_runs_async():
+	updater = FakeUpdater()
+	app.schedule_update_check(None, updater, {})
+	assert updater.async_checks == 1
+
+
+def test_main_starts_updater():
+	# main() Tk penceresi actigi icin calistirilmaz; guncelleyici asamasinin baslatildigi dogrulanir
+	tree = ast.parse(inspect.getsource(app.main))
+	stages = [
+		node.args[0].value
+		for node in ast.walk(tree)
+		if isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "run_async"
+		and node.args and isinstance(node.args[0], ast.Constant)
+	]
+	assert "update_ready" in stages
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from history import HistoryStore
+
+
+class _NullSpan:
+	"""Kapalı izleyicinin döndürdüğü tek, paylaşılan no-op span."""
+
+	__slots__ = ()
+
+	def __enter__(self) -> "_NullSpan":
+		return self
+
+	def __exit__(self, *exc: Any) -> None:
+		return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+	__slots__ = ("tracer", "name", "start_ns")
+
+	def __init__(self, tracer: "Tracer", name: str) -> None:
+		self.tracer = tracer
+		self.name = name
+		self.start_ns = 0
+
+	def __enter__(self) -> "_Span":
+		self.start_ns = time.perf_counter_ns()
+		return self
+
+	def __exit__(self, *exc: Any) -> None:
+		self.tracer._record(self.name, self.start_ns, time.perf_counter_ns() - self.start_ns)
+
+
+class Tracer:
+	"""Sıcak yollar için hafif span ölçümü.
+
+	Kapalıyken `span()` paylaşılan bir no-op nesne döndürür (tek bir bayrak
+	kontrolü). Açıkken her span'in süresi `span.<isim>` geçmişine (ms)
+	yazılır ve sınırlı bir halkada Chrome `trace_event` olayı olarak tutulur;
+	`export_chrome_trace()` ile chrome://tracing / Perfetto'da açılabilir."""
+
+	def __init__(self, enabled: bool = False, history: Optional[HistoryStore] = None,
+				 capacity: int = 1000, max_events: int = 100000) -> None:
+		self.enabled = enabled
+		self.history = history if history is not None else HistoryStore(capacity)
+		self.capacity = capacity
+		self._events: Deque[Tuple[str, int, int, int]] = deque(maxlen=max(1, int(max_events)))
+		self._series: Dict[str, Any] = {}
+		self._thread_names: Dict[int, str] = {}
+		self._origin_ns = time.perf_counter_ns()
+
+	def span(self, name: str) -> Any:
+		"""`with tracer.span("draw"):` biçiminde kullanılır."""
+		if not self.enabled:
+			return _NULL_SPAN
+		return _Span(self, name)
+
+	def _record(self, name: str, start_ns: int, duration_ns: int) -> None:
+		series = self._series.get(name)
+		if series is None:
+			series = self._series[name] = self.history.series(f"span.{name}", self.capacity)
+		series.append(duration_ns / 1e6)
+		ident = threading.get_ident()
+		if ident not in self._thread_names:
+			self._thread_names[ident] = threading.current_thread().name
+		# deque.append GIL altında atomik; kilit gerekmez
+		self._events.append((name, start_ns, duration_ns, ident))
+
+	def stats(self, percentiles: Iterable[float] = (50, 99)) -> Dict[str, Dict[str, Any]]:
+		"""Span başına sayı ve gecikme yüzdelikleri (ms)."""
+		pcts = tuple(percentiles)
+		result: Dict[str, Dict[str, Any]] = {}
+		for name, series in list(self._series.items()):
+			if not len(series):
+				continue
+			entry: Dict[str, Any] = {"count": series.total, "max_ms": series.max()}
+			for pct, value in series.percentiles(list(pcts)).items():
+				entry[f"p{pct:g}_ms"] = value
+			result[name] = entry
+		return result
+
+	def clear(self) -> None:
+		self._events.clear()
+		for series in self._series.values():
+			series.clear()
+
+	def export_chrome_trace(self, path: str) -> int:
+		"""Halkadaki olayları Chrome trace_event JSON olarak yaz; olay sayısını döndür."""
+		pid = os.getpid()
+		events = list(self._events.copy())
+		trace = [
+			{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+			for tid, name in list(self._thread_names.items())
+		]
+		for name, start_ns, duration_ns, tid in events:
+			trace.append({
+				"name": name,
+				"ph": "X",
+				"ts": (start_ns - self._origin_ns) / 1000.0,
+				"dur": duration_ns / 1000.0,
+				"pid": pid,
+				"tid": tid,
+			})
+
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		tmp_path = path + ".tmp"
+		with open(tmp_path, "w", encoding="utf-8") as f:
+			json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+		os.replace(tmp_path, path)
+		return len(events)
+
+
+# Varsayılan (kapalı) izleyici: tracer verilmeyen bileşenler bunu kullanır
+NULL_TRACER = Tracer(enabled=False)
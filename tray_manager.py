@@ -7,13 +7,19 @@ import json
 import os
 from typing import Callable, Optional
 
+from config_service import validate_config
+
 class TrayManager:
 	"""Sistem tray ikonu ve konfigürasyon yöneticisi."""
 
-	def __init__(self, on_show: Callable[[], None], on_hide: Callable[[], None], on_quit: Callable[[], None]):
+	def __init__(self, on_show: Callable[[], None], on_hide: Callable[[], None], on_quit: Callable[[], None],
+				 on_update: Optional[Callable[[], None]] = None):
 		self.on_show = on_show
 		self.on_hide = on_hide
 		self.on_quit = on_quit
+		self.on_update = on_update
+		# Kurulabilir sürüm varsa menüde "Güncelle" görünür
+		self.update_version: Optional[str] = None
 		self.icon = None
 		self.config_window = None
 
@@ -45,6 +51,11 @@ class TrayManager:
 				pystray.MenuItem("Özel", lambda: self.change_theme("custom")),
 			)),
 			pystray.Menu.SEPARATOR,
+			pystray.MenuItem(
+				lambda item: f"Güncelle (v{self.update_version})",
+				self._on_update_clicked,
+				visible=lambda item: self.update_version is not None and self.on_update is not None,
+			),
 			pystray.MenuItem("Çıkış", self.on_quit)
 		)
 
@@ -59,6 +70,28 @@ class TrayManager:
 		thread = threading.Thread(target=self.icon.run, daemon=True)
 		thread.start()
 
+	def notify(self, message: str, title: str = "OSD Overlay"):
+		"""Tray balon bildirimi göster (desteklenmiyorsa sessizce geç)."""
+		if not self.icon:
+			return
+		try:
+			self.icon.notify(message, title)
+		except Exception:
+			pass
+
+	def set_update_available(self, version: Optional[str]) -> None:
+		"""Menüdeki "Güncelle" öğesini göster/gizle."""
+		self.update_version = version
+		if self.icon:
+			try:
+				self.icon.update_menu()
+			except Exception:
+				pass
+
+	def _on_update_clicked(self, icon=None, item=None):
+		if self.on_update is not None:
+			self.on_update()
+
 	def stop(self):
 		"""Tray ikonunu durdur."""
 		if self.icon:
@@ -70,6 +103,19 @@ class TrayManager:
 			self.config_window.lift()
 			return
 
+		# Mevcut değerler (diğer anahtarlar kaydederken korunur)
+		config_path = os.path.join(os.path.dirname(__file__), "config.json")
+		try:
+			with open(config_path, "r", encoding="utf-8") as f:
+				current = json.load(f)
+			if not isinstance(current, dict):
+				current = {}
+		except Exception:
+			current = {}
+		current_pm = current.get("presentMon", {}) or {}
+		current_theme = current.get("theme", {}) or {}
+		current_colors = current_theme.get("colors", {}) or {}
+
 		self.config_window = tk.Toplevel()
 		self.config_window.title("OSD Overlay Ayarları")
 		self.config_window.geometry("400x300")
@@ -86,7 +132,7 @@ class TrayManager:
 
 		# Yenileme hızı
 		ttk.Label(general_frame, text="Yenileme Hızı (ms):").pack(anchor="w", pady=5)
-		refresh_var = tk.StringVar(value="500")
+		refresh_var = tk.StringVar(value=str(current.get("refreshMs", 500)))
 		refresh_spin = ttk.Spinbox(general_frame, from_=100, to=5000, textvariable=refresh_var, width=10)
 		refresh_spin.pack(anchor="w", pady=5)
 
@@ -94,18 +140,18 @@ class TrayManager:
 		fps_frame = ttk.LabelFrame(general_frame, text="FPS Ayarları")
 		fps_frame.pack(fill="x", pady=10)
 
-		fps_enabled = tk.BooleanVar()
+		fps_enabled = tk.BooleanVar(value=bool(current_pm.get("enabled", False)))
 		ttk.Checkbutton(fps_frame, text="FPS gösterimi aktif", variable=fps_enabled).pack(anchor="w")
 
 		ttk.Label(fps_frame, text="Oyun süreci adı:").pack(anchor="w", pady=5)
-		process_var = tk.StringVar()
+		process_var = tk.StringVar(value=str(current_pm.get("processName", "")))
 		ttk.Entry(fps_frame, textvariable=process_var, width=30).pack(anchor="w")
 
 		# Güncelleme ayarları
 		update_frame = ttk.LabelFrame(general_frame, text="Güncelleme")
 		update_frame.pack(fill="x", pady=10)
 
-		update_enabled = tk.BooleanVar(value=True)
+		update_enabled = tk.BooleanVar(value=bool((current.get("update", {}) or {}).get("check", True)))
 		ttk.Checkbutton(update_frame, text="Güncelleme kontrolü", variable=update_enabled).pack(anchor="w")
 
 		# Tema ayarları
@@ -113,7 +159,7 @@ class TrayManager:
 		notebook.add(theme_frame, text="Tema")
 
 		ttk.Label(theme_frame, text="Tema Seçimi:").pack(anchor="w", pady=5)
-		theme_var = tk.StringVar(value="dark")
+		theme_var = tk.StringVar(value=str(current_theme.get("name", "dark")))
 		theme_combo = ttk.Combobox(theme_frame, textvariable=theme_var, values=["dark", "light", "custom"], state="readonly")
 		theme_combo.pack(anchor="w", pady=5)
 
@@ -131,30 +177,43 @@ class TrayManager:
 			row.pack(fill="x", pady=2)
 			
 			ttk.Label(row, text=f"{name}:", width=8).pack(side="left")
-			color_vars[key] = tk.StringVar(value=default)
+			color_vars[key] = tk.StringVar(value=str(current_colors.get(key, default)))
 			ttk.Entry(row, textvariable=color_vars[key], width=10).pack(side="left", padx=5)
 
 		# Kaydet butonu
 		def save_config():
-			config = {
-				"refreshMs": int(refresh_var.get()),
-				"presentMon": {
-					"enabled": fps_enabled.get(),
-					"processName": process_var.get()
-				},
-				"update": {
-					"check": update_enabled.get(),
-					"url": "https://github.com/Gear2Head/Fps-Display/releases/latest"
-				},
-				"theme": {
-					"name": theme_var.get(),
-					"colors": {k: v.get() for k, v in color_vars.items()}
-				}
+			try:
+				refresh_ms = int(refresh_var.get())
+			except ValueError:
+				messagebox.showerror("Hata", "Yenileme hızı sayı olmalı.")
+				return
+
+			# Sadece bu pencerenin alanları değişir; diğer ayarlar korunur
+			config = dict(current)
+			config["refreshMs"] = refresh_ms
+			config["presentMon"] = {**current_pm, "enabled": fps_enabled.get(), "processName": process_var.get()}
+			config["update"] = {
+				**(current.get("update", {}) or {}),
+				"check": update_enabled.get(),
+				"url": "https://github.com/Gear2Head/Fps-Display/releases/latest",
 			}
-			
-			config_path = os.path.join(os.path.dirname(__file__), "config.json")
-			with open(config_path, "w", encoding="utf-8") as f:
+			config["theme"] = {
+				**current_theme,
+				"name": theme_var.get(),
+				"colors": {**current_colors, **{k: v.get() for k, v in color_vars.items()}},
+			}
+
+			# Geçersiz alan dosyaya yazılmaz (açılışta varsayılana dönerdi)
+			errors = validate_config(config)
+			if errors:
+				messagebox.showerror("Hata", "Geçersiz ayarlar:\n" + "\n".join(errors))
+				return
+
+			# Atomik yazım: çalışan uygulama yarım dosya görmez, değişiklik canlı uygulanır
+			tmp_path = config_path + ".tmp"
+			with open(tmp_path, "w", encoding="utf-8") as f:
 				json.dump(config, f, indent=2, ensure_ascii=False)
+			os.replace(tmp_path, config_path)
 			
 			messagebox.showinfo("Başarılı", "Ayarlar kaydedildi!")
 			self.config_window.destroy()
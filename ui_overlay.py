@@ -1,20 +1,57 @@
 import tkinter as tk
-from tkinter import ttk
-import math
 import time
-from typing import Callable, Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List, Sequence
+
+from graph import DecimatedGraph
+from history import HistoryStore
+from tracing import NULL_TRACER
 
 class ModernOverlayWindow:
 	"""Modern, animasyonlu, tema destekli overlay."""
 
-	def __init__(self, on_close: Optional[Callable[[], None]] = None) -> None:
+	def __init__(self, on_close: Optional[Callable[[], None]] = None, history: Optional[HistoryStore] = None) -> None:
+		self._init_state(on_close, history)
+
 		self.root = tk.Tk()
 		self.root.title("OSD Overlay")
 		self.root.attributes("-topmost", True)
 		self.root.overrideredirect(True)
 		self.root.attributes("-alpha", 0.95)
 
+		self.root.geometry(f"{self.width}x{self.height}")
+		self.root.configure(bg=self.theme["bg"])
+
+		# Ana canvas
+		self.canvas = tk.Canvas(
+			self.root, 
+			width=self.width, 
+			height=self.height,
+			bg=self.theme["bg"], 
+			highlightthickness=0,
+			relief="flat"
+		)
+		self.canvas.pack()
+
+		# Başlık çubuğu
+		self._create_titlebar()
+
+		# Drag ve event binding
+		self._setup_events()
+
+	@classmethod
+	def headless(cls, canvas: Any, history: Optional[HistoryStore] = None) -> "ModernOverlayWindow":
+		"""Tk penceresi olmadan, verilen canvas benzeri nesneye çizen örnek (benchmark için)."""
+		self = cls.__new__(cls)
+		self._init_state(None, history)
+		self.root = None
+		self.canvas = canvas
+		return self
+
+	def _init_state(self, on_close: Optional[Callable[[], None]], history: Optional[HistoryStore]) -> None:
+		"""Tk'dan bağımsız durum: tema, boyutlar, geçmiş ve sahne önbellekleri."""
 		self.on_close = on_close
+		self._closed = False
+		self.tracer = NULL_TRACER
 		self.is_locked = False
 		self.is_minimized = False
 		self.animation_frame = 0
@@ -39,30 +76,39 @@ class ModernOverlayWindow:
 		# Pencere boyutları
 		self.width = 420
 		self.height = 180
+		self.base_height = self.height  # eklenti alanları sığmazsa pencere uzar, bunun altına inmez
 		self.minimized_height = 40
-
-		self.root.geometry(f"{self.width}x{self.height}")
-		self.root.configure(bg=self.theme["bg"])
-
-		# Ana canvas
-		self.canvas = tk.Canvas(
-			self.root, 
-			width=self.width, 
-			height=self.height,
-			bg=self.theme["bg"], 
-			highlightthickness=0,
-			relief="flat"
-		)
-		self.canvas.pack()
-
-		# Başlık çubuğu
-		self._create_titlebar()
-
-		# Drag ve event binding
-		self._setup_events()
+		self.fields_per_row = 3
 
 		self._last_metrics = None
-		self._animation_data = {"cpu": [], "gpu": [], "ram": []}
+		self.history = history if history is not None else HistoryStore()
+		# Decimated grafikler: CPU (son 30 sn) ve frame-time (son 5 sn, her frame eklenir);
+		# çizilen tek kopya bunlardır, ayrıca geçmiş serisine yazılmaz
+		self.chart_size = (60, 25)
+		self.frame_graph_size = (120, 16)
+		self._graphs = {
+			"cpu": DecimatedGraph(self.chart_size[0], 30.0, fixed_max=100.0),
+			"frame_time": DecimatedGraph(self.frame_graph_size[0], 5.0),
+		}
+
+		# Çekirdek ısı haritası: renk seviyesi sayısı ve (tema değişince sıfırlanan) palet
+		self.core_heat_levels = 8
+		self._core_palette: List[str] = []
+		self._core_geometry: tuple = ()
+		self._core_colors: List[Optional[str]] = []  # hücre başına son gönderilen renk
+		self._core_visible = False
+
+		# Retained-mode sahne: öğe ID'leri ve son gönderilen değerler
+		self._scene: Dict[str, Any] = {}
+		self._panel_rect = (0, 0, 0, 0)
+		self._coords_cache: Dict[int, tuple] = {}
+		self._option_cache: Dict[int, Dict[str, Any]] = {}
+
+		# Frame başına Tk çağrı sayacı
+		self._frame_tk_calls = 0
+		self.tk_calls_last_frame = 0
+		self.tk_calls_total = 0
+		self.frames_drawn = 0
 
 	def _create_titlebar(self):
 		"""Modern başlık çubuğu oluştur."""
@@ -181,8 +227,13 @@ class ModernOverlayWindow:
 	def set_metrics(self, *, cpu: float, ram_used: float, ram_total: float,
 				  gpu_util: Optional[float] = None, gpu_temp: Optional[float] = None,
 				  gpu_mem_used: Optional[float] = None, gpu_mem_total: Optional[float] = None,
-				  fps: Optional[float] = None, banner: Optional[str] = None) -> None:
-		"""Modern metrik gösterimi."""
+				  fps: Optional[float] = None, banner: Optional[str] = None,
+				  process: Optional[str] = None, cores: Optional[Sequence[float]] = None,
+				  io: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> None:
+		"""Modern metrik gösterimi.
+
+		`fields`, eklenti kaynaklarının hazır biçimlenmiş alanlarıdır
+		("etiket değer birim"); satır başına `fields_per_row` hücre çizilir."""
 		self._last_metrics = {
 			"cpu": cpu,
 			"ram_used": ram_used,
@@ -193,107 +244,364 @@ class ModernOverlayWindow:
 			"gpu_mem_total": gpu_mem_total,
 			"fps": fps,
 			"banner": banner or "",
+			"process": process or "",
+			"cores": cores,
+			"io": io or "",
+			"fields": fields or (),
 		}
 		
 		# Animasyon verilerini güncelle
 		self._update_animation_data()
-		self._draw()
+		with self.tracer.span("draw"):
+			self._draw()
 
 	def _update_animation_data(self):
 		"""Animasyon için veri güncelle."""
 		if not self._last_metrics:
 			return
 		
-		m = self._last_metrics
-		self._animation_data["cpu"].append(m["cpu"])
-		self._animation_data["gpu"].append(m.get("gpu_util", 0))
-		self._animation_data["ram"].append((m["ram_used"] / max(0.1, m["ram_total"])) * 100)
-		
-		# Son 20 değeri tut
-		for key in self._animation_data:
-			if len(self._animation_data[key]) > 20:
-				self._animation_data[key] = self._animation_data[key][-20:]
+		self._graphs["cpu"].add(self._last_metrics["cpu"])
+
+	def set_theme_colors(self, colors: Dict[str, str]) -> None:
+		"""Tema renklerini değiştir; mevcut sahne öğeleri yerinde güncellenir."""
+		self.theme.update({key: value for key, value in colors.items() if key in self.theme})
+		if not self._scene:
+			return
+		scene = self._scene
+		targets = [
+			("panel", scene["panel"], "fill"), ("border", scene["panel"], "outline"),
+			("fps", scene["banner"], "fill"), ("fps", scene["fps"], "fill"),
+			("fps", scene["frame_chart"], "fill"), ("cpu", scene["chart"], "fill"),
+			("text", scene["process"], "fill"), ("text", scene["io"], "fill"),
+			("text", scene["fallback"], "fill"),
+		]
+		for key in ("cpu", "ram", "gpu"):
+			bar = scene[key]
+			targets += [
+				(key, bar["fill"], "fill"), ("panel", bar["bg"], "fill"),
+				("border", bar["bg"], "outline"), ("text", bar["label"], "fill"),
+			]
+		for key, item, option in targets:
+			self._set_options(item, **{option: self.theme[key]})
+		# Isı haritası hücreleri bir sonraki çizimde yeni paletle boyanır
+		self._core_palette = []
+		self._core_colors = []
+
+	def add_frame_time(self, frame_ms: float) -> None:
+		"""Frame-time ekle (PresentMon okuyucu thread'inden, frame başına çağrılır)."""
+		self._graphs["frame_time"].add(frame_ms)
+
+	def _create_item(self, kind: str, *coords: float, **options: Any) -> int:
+		"""Canvas öğesi oluştur ve ID'sini önbelleğe al (sahne kurulumunda bir kez)."""
+		item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+		self._frame_tk_calls += 1
+		self._coords_cache[item] = tuple(coords)
+		self._option_cache[item] = dict(options)
+		return item
+
+	def _set_coords(self, item: int, *coords: float) -> None:
+		"""Koordinatlar değiştiyse öğeyi taşı."""
+		if self._coords_cache.get(item) == coords:
+			return
+		self.canvas.coords(item, *coords)
+		self._coords_cache[item] = coords
+		self._frame_tk_calls += 1
+
+	def _set_options(self, item: int, **options: Any) -> None:
+		"""Sadece değişen seçenekleri (text/fill/state) Tk'ya gönder."""
+		cache = self._option_cache.setdefault(item, {})
+		changed = {k: v for k, v in options.items() if cache.get(k) != v}
+		if not changed:
+			return
+		self.canvas.itemconfigure(item, **changed)
+		cache.update(changed)
+		self._frame_tk_calls += 1
 
-	def _draw_gradient_bar(self, x: int, y: int, w: int, h: int, ratio: float, color: str, label: str, icon: str = "") -> None:
-		"""Gradient efektli modern bar."""
+	def _build_scene(self) -> None:
+		"""Panel, bar, etiket ve grafik öğelerini bir kez oluştur."""
+		if self._scene:
+			return
+
+		panel_margin = 8
+		panel_y = 35
+		self._panel_rect = (
+			panel_margin,
+			panel_y,
+			self.width - panel_margin,
+			self.height - panel_margin,
+		)
+		x0, y0, x1, y1 = self._panel_rect
+
+		scene: Dict[str, Any] = {}
+		scene["panel"] = self._create_item(
+			"rectangle", x0, y0, x1, y1,
+			fill=self.theme["panel"], outline=self.theme["border"], width=1, state="hidden"
+		)
+		scene["banner"] = self._create_item(
+			"text", x0 + 10, y0 + 15,
+			text="", fill=self.theme["fps"], anchor="w", font=("Segoe UI", 9, "bold"), state="hidden"
+		)
+		for key, icon in (("cpu", "🖥️"), ("ram", "💾"), ("gpu", "🎮")):
+			scene[key] = self._create_bar(self.theme[key], icon)
+		scene["fps"] = self._create_item(
+			"text", x0 + 10, y0 + 15,
+			text="", fill=self.theme["fps"], anchor="w", font=("Segoe UI", 11, "bold"), state="hidden"
+		)
+		scene["process"] = self._create_item(
+			"text", x0 + 10, y0 + 15,
+			text="", fill=self.theme["text"], anchor="w", font=("Segoe UI", 9), state="hidden"
+		)
+		scene["io"] = self._create_item(
+			"text", x0 + 10, y0 + 15,
+			text="", fill=self.theme["text"], anchor="w", font=("Segoe UI", 9), state="hidden"
+		)
+		scene["chart"] = self._create_item(
+			"line", 0, 0, 0, 0,
+			fill=self.theme["cpu"], width=1, state="hidden"
+		)
+		scene["frame_chart"] = self._create_item(
+			"line", 0, 0, 0, 0,
+			fill=self.theme["fps"], width=1, state="hidden"
+		)
+		scene["fallback"] = self._create_item(
+			"text", self.width // 2, self.height // 2,
+			text="", fill=self.theme["text"], anchor="center", font=("Segoe UI", 12, "bold"), state="hidden"
+		)
+		self._scene = scene
+
+	def _create_bar(self, color: str, icon: str) -> Dict[str, int]:
+		"""Bir bar için arka plan, dolgu ve metin öğelerini oluştur."""
+		return {
+			"bg": self._create_item(
+				"rectangle", 0, 0, 0, 0,
+				fill=self.theme["panel"], outline=self.theme["border"], width=1, state="hidden"
+			),
+			"fill": self._create_item("rectangle", 0, 0, 0, 0, fill=color, outline="", state="hidden"),
+			"icon": self._create_item(
+				"text", 0, 0,
+				text=icon, fill=self.theme["text_secondary"], anchor="w", font=("Segoe UI", 10), state="hidden"
+			),
+			"label": self._create_item(
+				"text", 0, 0,
+				text="", fill=self.theme["text"], anchor="w", font=("Segoe UI", 10, "bold"), state="hidden"
+			),
+			"percent": self._create_item(
+				"text", 0, 0,
+				text="", fill=self.theme["text_secondary"], anchor="e", font=("Segoe UI", 9), state="hidden"
+			),
+		}
+
+	def _update_gradient_bar(self, bar: Dict[str, int], x: int, y: int, w: int, h: int, ratio: float, label: str) -> None:
+		"""Gradient efektli modern bar'ı yerinde güncelle."""
 		ratio = max(0.0, min(1.0, ratio))
-		
+
 		# Arka plan
-		self.canvas.create_rectangle(x, y, x + w, y + h, fill=self.theme["panel"], outline=self.theme["border"], width=1)
-		
+		self._set_coords(bar["bg"], x, y, x + w, y + h)
+		self._set_options(bar["bg"], state="normal")
+
 		# Gradient bar (basit)
 		bar_width = int(w * ratio)
 		if bar_width > 0:
-			self.canvas.create_rectangle(x + 2, y + 2, x + bar_width - 2, y + h - 2, fill=color, outline="")
-		
-		# Metin
-		text_x = x + 8
+			self._set_coords(bar["fill"], x + 2, y + 2, x + bar_width - 2, y + h - 2)
+			self._set_options(bar["fill"], state="normal")
+		else:
+			self._set_options(bar["fill"], state="hidden")
+
+		# İkon ve ana metin
 		text_y = y + h // 2
-		
-		# İkon varsa
-		if icon:
-			self.canvas.create_text(text_x, text_y, text=icon, fill=self.theme["text_secondary"], anchor="w", font=("Segoe UI", 10))
-			text_x += 20
-		
-		# Ana metin
-		self.canvas.create_text(text_x, text_y, text=label, fill=self.theme["text"], anchor="w", font=("Segoe UI", 10, "bold"))
-		
+		self._set_coords(bar["icon"], x + 8, text_y)
+		self._set_options(bar["icon"], state="normal")
+		self._set_coords(bar["label"], x + 28, text_y)
+		self._set_options(bar["label"], text=label, state="normal")
+
 		# Yüzde değeri (sağda)
-		percent_text = f"{ratio*100:.0f}%"
-		self.canvas.create_text(x + w - 8, text_y, text=percent_text, fill=self.theme["text_secondary"], anchor="e", font=("Segoe UI", 9))
+		self._set_coords(bar["percent"], x + w - 8, text_y)
+		self._set_options(bar["percent"], text=f"{ratio*100:.0f}%", state="normal")
+
+	def _hide_bar(self, bar: Dict[str, int]) -> None:
+		for item in bar.values():
+			self._set_options(item, state="hidden")
+
+	def _update_graph(self, item: int, graph: DecimatedGraph, x: int, y: int, w: int, h: int) -> None:
+		"""Grafik çizgisini sütun başına min/max zarfıyla güncelle (maliyet sütun sayısıyla sınırlı)."""
+		points = graph.points(x, y, w, h)
+		if not points:
+			self._set_options(item, state="hidden")
+			return
+		self._set_coords(item, *points)
+		self._set_options(item, state="normal")
+
+	def _heat_palette(self) -> List[str]:
+		"""Panel renginden CPU rengine `core_heat_levels` adımlık renk paleti."""
+		if not self._core_palette:
+			start = self.theme["accent"].lstrip("#")
+			end = self.theme["cpu"].lstrip("#")
+			if len(start) == 3:
+				start = "".join(c * 2 for c in start)
+			if len(end) == 3:
+				end = "".join(c * 2 for c in end)
+			a = [int(start[i:i + 2], 16) for i in (0, 2, 4)]
+			b = [int(end[i:i + 2], 16) for i in (0, 2, 4)]
+			last = max(1, self.core_heat_levels - 1)
+			self._core_palette = [
+				"#%02x%02x%02x" % tuple(round(a[c] + (b[c] - a[c]) * level / last) for c in range(3))
+				for level in range(self.core_heat_levels)
+			]
+		return self._core_palette
+
+	def _update_core_heatmap(self, x: float, y: float, w: float, h: float, cores: Sequence[float]) -> None:
+		"""Çekirdek başına ısı haritası satırı.
+
+		Hücreler bir kez oluşturulur; yüzdeler birkaç renk seviyesine
+		indirgendiği için çoğu frame'de sadece seviyesi değişen hücreler Tk'ya
+		gider. Konumlar yalnızca geometri veya çekirdek sayısı değişince
+		güncellenir."""
+		cells: List[int] = self._scene.get("cores") or []
+		count = len(cores)
+		if len(cells) != count:
+			# İlk veri veya çekirdek sayısı değişti (nadiren): hücreleri yeniden kur
+			for item in cells:
+				self.canvas.delete(item)
+				self._frame_tk_calls += 1
+				self._coords_cache.pop(item, None)
+				self._option_cache.pop(item, None)
+			palette = self._heat_palette()
+			cells = [
+				self._create_item("rectangle", 0, 0, 0, 0, fill=palette[0], outline="", state="hidden")
+				for _ in range(count)
+			]
+			self._scene["cores"] = cells
+			self._core_geometry = ()
+			self._core_visible = False
+		if not count:
+			return
 
-	def _draw_mini_chart(self, x: int, y: int, w: int, h: int, data: list, color: str) -> None:
-		"""Mini grafik çiz."""
-		if len(data) < 2:
+		geometry = (x, y, w, h, count)
+		if geometry != self._core_geometry:
+			self._core_geometry = geometry
+			step = w / count
+			gap = 1 if step >= 3 else 0
+			for index, item in enumerate(cells):
+				left = x + index * step
+				self._set_coords(item, left, y, left + step - gap, y + h)
+
+		# Çekirdek başına iş sadece seviye hesabı ve bir karşılaştırma
+		palette = self._heat_palette()
+		scale = self.core_heat_levels / 100.0
+		top = self.core_heat_levels - 1
+		colors = self._core_colors
+		if len(colors) != count:
+			colors = self._core_colors = [None] * count
+		for index, value in enumerate(cores):
+			level = int(value * scale)
+			color = palette[top if level > top else (level if level > 0 else 0)]
+			if colors[index] != color:
+				colors[index] = color
+				self._set_options(cells[index], fill=color)
+
+		if not self._core_visible:
+			self._core_visible = True
+			for item in cells:
+				self._set_options(item, state="normal")
+
+	def _hide_core_heatmap(self) -> None:
+		if not self._core_visible:
 			return
-		
-		# Veriyi normalize et
-		max_val = max(data) if data else 1
-		points = []
-		
-		for i, val in enumerate(data):
-			px = x + int((i / (len(data) - 1)) * w)
-			py = y + h - int((val / max_val) * h)
-			points.extend([px, py])
-		
-		if len(points) >= 4:
-			self.canvas.create_line(points, fill=color, width=2, smooth=True)
+		self._core_visible = False
+		for item in self._scene.get("cores") or ():
+			self._set_options(item, state="hidden")
+
+	def _update_fields(self, x: float, y: float, w: float, fields: Sequence[str]) -> float:
+		"""Eklenti alanlarını ızgara halinde çiz; son satırın altındaki y'yi döndür."""
+		items: List[int] = self._scene.setdefault("fields", [])
+		while len(items) < len(fields):
+			items.append(self._create_item(
+				"text", 0, 0,
+				text="", fill=self.theme["text_secondary"], anchor="w", font=("Segoe UI", 9), state="hidden"
+			))
+		per_row = max(1, self.fields_per_row)
+		cell_w = w / per_row
+		for index, item in enumerate(items):
+			if index < len(fields):
+				row, column = divmod(index, per_row)
+				self._set_coords(item, x + column * cell_w, y + row * 16)
+				self._set_options(item, text=fields[index], state="normal")
+			else:
+				self._set_options(item, state="hidden")
+		rows = (len(fields) + per_row - 1) // per_row
+		return y + rows * 16
+
+	def _set_height(self, height: int) -> None:
+		"""Pencere ve panel yüksekliğini değiştir (sadece alan sayısı değişince)."""
+		if height == self.height:
+			return
+		self.height = height
+		x0, y0, x1, _ = self._panel_rect
+		self._panel_rect = (x0, y0, x1, height - 8)
+		self._set_coords(self._scene["panel"], *self._panel_rect)
+		if self.root is not None and not self.is_minimized:
+			self.root.geometry(f"{self.width}x{height}")
+			self.canvas.configure(height=height)
+			self._frame_tk_calls += 2
 
 	def _draw_fallback(self, content: str) -> None:
 		"""Fallback metin gösterimi."""
-		self.canvas.delete("all")
-		self.canvas.create_text(
-			self.width // 2, self.height // 2, 
-			text=content, 
-			fill=self.theme["text"], 
-			anchor="center", 
-			font=("Segoe UI", 12, "bold")
-		)
+		self._frame_tk_calls = 0
+		self._build_scene()
+		self._show_fallback(content)
+		self._finish_frame()
+
+	def _show_fallback(self, content: str) -> None:
+		for key, item in self._scene.items():
+			if key == "fallback":
+				continue
+			if isinstance(item, dict):
+				self._hide_bar(item)
+			elif isinstance(item, list):
+				for sub_item in item:
+					self._set_options(sub_item, state="hidden")
+			else:
+				self._set_options(item, state="hidden")
+		self._set_options(self._scene["fallback"], text=content, state="normal")
+		self._core_visible = False
+
+	def _finish_frame(self) -> None:
+		self.tk_calls_last_frame = self._frame_tk_calls
+		self.tk_calls_total += self._frame_tk_calls
+		self.frames_drawn += 1
+
+	def get_render_stats(self) -> Dict[str, Any]:
+		"""Tk çağrı sayaçlarını döndür."""
+		return {
+			"frames": self.frames_drawn,
+			"tk_calls_last_frame": self.tk_calls_last_frame,
+			"tk_calls_total": self.tk_calls_total,
+			"avg_tk_calls": self.tk_calls_total / self.frames_drawn if self.frames_drawn else 0.0,
+			"canvas_items": sum(len(v) if isinstance(v, (dict, list)) else 1 for v in self._scene.values()),
+		}
 
 	def _draw(self) -> None:
-		"""Ana çizim fonksiyonu."""
+		"""Ana çizim fonksiyonu (retained mode: öğeler bir kez oluşturulur, sadece değişenler güncellenir)."""
 		if self.is_minimized:
 			return
-			
-		self.canvas.delete("all")
-		
-		# Ana panel
-		panel_margin = 8
-		panel_x = panel_margin
-		panel_y = 35
-		panel_w = self.width - (panel_margin * 2)
-		panel_h = self.height - panel_y - panel_margin
-		
-		# Panel arka planı
-		self.canvas.create_rectangle(
-			panel_x, panel_y, panel_x + panel_w, panel_y + panel_h,
-			fill=self.theme["panel"], outline=self.theme["border"], width=1
-		)
-		
+
+		self._frame_tk_calls = 0
+		self._build_scene()
+
 		if not self._last_metrics:
-			self._draw_fallback("Yükleniyor...")
+			self._show_fallback("Yükleniyor...")
+			self._finish_frame()
 			return
 
+		scene = self._scene
+		self._set_options(scene["fallback"], state="hidden")
+
+		# Ana panel
+		panel_x, panel_y, panel_x1, panel_y1 = self._panel_rect
+		panel_w = panel_x1 - panel_x
+		panel_h = panel_y1 - panel_y
+		self._set_options(scene["panel"], state="normal")
+
 		m = self._last_metrics
 		content_y = panel_y + 15
 		bar_height = 20
@@ -302,31 +610,31 @@ class ModernOverlayWindow:
 
 		# Banner
 		if m.get("banner"):
-			self.canvas.create_text(
-				panel_x + 10, content_y, 
-				text=m["banner"], 
-				fill=self.theme["fps"], 
-				anchor="w", 
-				font=("Segoe UI", 9, "bold")
-			)
+			self._set_coords(scene["banner"], panel_x + 10, content_y)
+			self._set_options(scene["banner"], text=m["banner"], state="normal")
 			content_y += 20
+		else:
+			self._set_options(scene["banner"], state="hidden")
 
 		# CPU
 		cpu_ratio = float(m["cpu"]) / 100.0
-		self._draw_gradient_bar(
-			panel_x + 10, content_y, bar_width, bar_height,
-			cpu_ratio, self.theme["cpu"], 
-			f"CPU {m['cpu']:.0f}%", "🖥️"
+		self._update_gradient_bar(
+			scene["cpu"], panel_x + 10, content_y, bar_width, bar_height,
+			cpu_ratio, f"CPU {m['cpu']:.0f}%"
 		)
+		# Çekirdek ısı haritası (CPU barının hemen altında, bar aralığının içinde)
+		if m.get("cores"):
+			self._update_core_heatmap(panel_x + 10, content_y + bar_height + 2, bar_width, 5, m["cores"])
+		else:
+			self._hide_core_heatmap()
 		content_y += bar_spacing
 
 		# RAM
 		ram_total = max(0.1, float(m["ram_total"]))
 		ram_ratio = float(m["ram_used"]) / ram_total
-		self._draw_gradient_bar(
-			panel_x + 10, content_y, bar_width, bar_height,
-			ram_ratio, self.theme["ram"], 
-			f"RAM {m['ram_used']:.1f}/{m['ram_total']:.1f} GB", "💾"
+		self._update_gradient_bar(
+			scene["ram"], panel_x + 10, content_y, bar_width, bar_height,
+			ram_ratio, f"RAM {m['ram_used']:.1f}/{m['ram_total']:.1f} GB"
 		)
 		content_y += bar_spacing
 
@@ -341,36 +649,63 @@ class ModernOverlayWindow:
 			gpu_mem_total = m.get("gpu_mem_total")
 			if gpu_mem_used is not None and gpu_mem_total is not None and gpu_mem_total > 0:
 				gpu_label += f" | {gpu_mem_used:.1f}/{gpu_mem_total:.1f} GB"
-			
-			self._draw_gradient_bar(
-				panel_x + 10, content_y, bar_width, bar_height,
-				float(gpu_util) / 100.0, self.theme["gpu"], 
-				gpu_label, "🎮"
+
+			self._update_gradient_bar(
+				scene["gpu"], panel_x + 10, content_y, bar_width, bar_height,
+				float(gpu_util) / 100.0, gpu_label
 			)
 			content_y += bar_spacing
+		else:
+			self._hide_bar(scene["gpu"])
 
 		# FPS
 		fps = m.get("fps")
 		if fps is not None:
-			self.canvas.create_text(
-				panel_x + 10, content_y, 
-				text=f"🎯 FPS {fps:.0f}", 
-				fill=self.theme["fps"], 
-				anchor="w", 
-				font=("Segoe UI", 11, "bold")
+			self._set_coords(scene["fps"], panel_x + 10, content_y)
+			self._set_options(scene["fps"], text=f"🎯 FPS {fps:.0f}", state="normal")
+			# Frame-time grafiği FPS satırında
+			graph_w, graph_h = self.frame_graph_size
+			self._update_graph(
+				scene["frame_chart"], self._graphs["frame_time"],
+				panel_x + 110, content_y - graph_h // 2, graph_w, graph_h
 			)
+			content_y += 20
+		else:
+			self._set_options(scene["fps"], state="hidden")
+			self._set_options(scene["frame_chart"], state="hidden")
+
+		# Takip edilen oyun süreci
+		if m.get("process"):
+			self._set_coords(scene["process"], panel_x + 10, content_y)
+			self._set_options(scene["process"], text=m["process"], state="normal")
+			content_y += 20
+		else:
+			self._set_options(scene["process"], state="hidden")
+
+		# Disk/ağ hızları
+		if m.get("io"):
+			self._set_coords(scene["io"], panel_x + 10, content_y)
+			self._set_options(scene["io"], text=m["io"], state="normal")
+			content_y += 20
+		else:
+			self._set_options(scene["io"], state="hidden")
+
+		# Eklenti kaynaklarının alanları (sağ alttaki mini grafiğin solunda); sığmazsa pencere uzar
+		bottom = self._update_fields(panel_x + 10, content_y, bar_width - 80, m["fields"])
+		self._set_height(max(self.base_height, int(bottom) + 4 if m["fields"] else int(content_y)))
+		panel_y1 = self._panel_rect[3]
+		panel_h = panel_y1 - panel_y
 
 		# Mini grafikler (sağ alt)
 		chart_x = panel_x + panel_w - 80
 		chart_y = panel_y + panel_h - 40
-		chart_w = 60
-		chart_h = 25
-		
-		if len(self._animation_data["cpu"]) > 1:
-			self._draw_mini_chart(chart_x, chart_y, chart_w, chart_h, self._animation_data["cpu"], self.theme["cpu"])
+		chart_w, chart_h = self.chart_size
+		self._update_graph(scene["chart"], self._graphs["cpu"], chart_x, chart_y, chart_w, chart_h)
+
+		self._finish_frame()
 
 	def loop_once(self) -> None:
-		"""Ana döngü."""
+		"""Tek adımlık döngü (eski API; uygulama `FramePacer` + `mainloop` kullanır)."""
 		# Animasyon güncellemesi
 		current_time = time.time()
 		if current_time - self.last_animation_time > 0.1:  # 10 FPS animasyon
@@ -381,7 +716,10 @@ class ModernOverlayWindow:
 		self.root.update()
 
 	def close(self) -> None:
-		"""Pencereyi kapat."""
+		"""Pencereyi kapat (birden fazla çağrılabilir)."""
+		if self._closed:
+			return
+		self._closed = True
 		if self.on_close:
 			self.on_close()
 		self.root.destroy()